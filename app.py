@@ -1,6 +1,9 @@
+import os
+
 from taskmanager import create_app
 
-app = create_app()
+# The configuration is chosen by FLASK_ENV (set to production in the Dockerfile)
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,6 @@
+import os
+
+from taskmanager.asgi import create_asgi_app
+
+# The configuration is chosen by FLASK_ENV, like app.py
+app = create_asgi_app(os.environ.get('FLASK_ENV', 'development'))
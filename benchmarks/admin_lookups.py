@@ -0,0 +1,108 @@
+"""
+Benchmark of the data the admin task listing needs for its filters and owner names.
+
+Seeds many users with one category and one task each, then builds the filter options
+and owner names of a page of tasks first the former way (every user and category
+loaded as ORM objects) and then with utils.get_lookup_choices and get_user_names.
+
+Usage:
+    python benchmarks/admin_lookups.py [--users 100000] [--repeat 20]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=100000, help="Users seeded")
+    parser.add_argument('--repeat', type=int, default=20, help="Page views measured")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Personne, Categorie, Tache, users: int) -> None:
+    """Insert the users, one category and one task each, with bulk inserts."""
+    db.session.execute(Personne.__table__.insert(), [
+        {'id': i, 'nom': f'user{i:06d}', 'password': 'x' * 100, 'role': 'user', 'bio': 'b' * 500}
+        for i in range(1, users + 1)
+    ])
+    db.session.execute(Categorie.__table__.insert(), [
+        {'id': i, 'nom': f'cat{i:06d}', 'couleur': '#007bff', 'personne_id': i}
+        for i in range(1, users + 1)
+    ])
+    db.session.execute(Tache.__table__.insert(), [
+        {'titre': f'Tâche {i}', 'status': 'pending', 'priority': 'medium', 'is_deleted': False,
+         'personne_id': i, 'categorie_id': i}
+        for i in range(1, users + 1)
+    ])
+    db.session.commit()
+
+
+def legacy_lookups(db, taches) -> tuple:
+    """Build the filters and names the way admin_liste did before."""
+    from taskmanager.models import Categorie, Personne
+
+    users = Personne.query.all()
+    user_names = {user.id: user.nom for user in users}
+    categories = Categorie.query.all()
+    db.session.expunge_all()
+    return users, user_names, categories
+
+
+def lookups(db, taches) -> tuple:
+    """Build the filters and names with the cached lookups."""
+    from taskmanager.utils import get_lookup_choices, get_user_names
+
+    return (get_lookup_choices('personne'), get_user_names(t.personne_id for t in taches),
+            get_lookup_choices('categorie'))
+
+
+def main() -> None:
+    """Run the benchmark and print the results before and after."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Categorie, Tache
+    from taskmanager.utils import get_admin_tasks_optimized
+
+    app = create_app('testing')
+    results = []
+    with app.test_request_context():
+        db.drop_all()
+        db.create_all()
+        seed(db, Personne, Categorie, Tache, args.users)
+        taches, _, _ = get_admin_tasks_optimized(per_page=10, count_strategy='probe')
+        for name, func in [('before', legacy_lookups), ('after', lookups)]:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                func(db, taches)
+            results.append((name, (time.perf_counter() - start) / args.repeat))
+        db.drop_all()
+
+    print(f"Admin filter data with {args.users} users, mean of {args.repeat} page views")
+    for name, elapsed in results:
+        print(f"{name:<10}{elapsed * 1000:>10.1f} ms")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""
+Load test of the WSGI and ASGI entry points at a latency SLO.
+
+Seeds a database, then starts one worker of each server on it: gunicorn serving
+app:app with the gthread worker, and uvicorn serving asgi:app. An asyncio client keeps
+N keep-alive connections busy requesting the task listing of the API, for increasing N.
+Prints the throughput and latency percentiles of each level, and the most concurrent
+requests each worker serves with a p95 latency within the SLO.
+
+The async routes only pay off when requests wait on the database, run it against
+PostgreSQL (--database-url) to see the difference; SQLite answers from the page cache.
+
+Usage:
+    python benchmarks/async_load.py [--tasks 20000] [--slo-ms 100] [--duration 5]
+        [--concurrency 1,2,4,8,16,32,64] [--threads 8] [--database-url postgresql://...]
+
+Requires gunicorn, uvicorn, asgiref, greenlet and the asyncio driver of the database.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATH = '/api/v1/tasks?per_page=50&sort_by=created_at'
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=20000, help="Tasks seeded")
+    parser.add_argument('--slo-ms', type=float, default=100, help="p95 latency objective")
+    parser.add_argument('--duration', type=float, default=5, help="Seconds per concurrency level")
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32,64',
+                        help="Comma-separated numbers of concurrent connections")
+    parser.add_argument('--threads', type=int, default=8, help="Threads of the gthread worker")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(tasks: int) -> str:
+    """Create the schema, insert a user with many tasks and return its session cookie."""
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Tache
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(Personne.__table__.insert(), [
+            {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user'},
+        ])
+        db.session.execute(Tache.__table__.insert(), [
+            {'titre': f'Tâche {i}', 'description': 'x' * 200, 'status': 'pending',
+             'priority': 'medium', 'is_deleted': False, 'personne_id': 1}
+            for i in range(tasks)
+        ])
+        db.session.commit()
+    serializer = app.session_interface.get_signing_serializer(app)
+    # The load test runs longer than a session lasts without this
+    return serializer.dumps({'personne_id': 1, 'login_time': datetime.utcnow().timestamp() + 86400})
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: list, port: int) -> subprocess.Popen:
+    """Start a server and wait until it accepts connections."""
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.kill()
+    sys.exit(f"Server did not start: {' '.join(command)}")
+
+
+async def request(reader, writer, port: int, cookie: str) -> tuple:
+    """Send a GET request on a keep-alive connection, return (status, keep the connection)."""
+    writer.write((
+        f"GET {PATH} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Cookie: session={cookie}\r\n\r\n"
+    ).encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+        elif name.lower() == 'connection' and value.strip().lower() == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def run_level(port: int, cookie: str, concurrency: int, duration: float) -> tuple:
+    """Keep concurrent connections busy for a duration, return the latencies and errors."""
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def client() -> None:
+        nonlocal errors
+        connection = None
+        while time.monotonic() < deadline:
+            if connection is None:
+                connection = await asyncio.open_connection('127.0.0.1', port)
+            start = time.perf_counter()
+            try:
+                status, keep_alive = await request(*connection, port, cookie)
+            except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+                errors += 1
+                connection[1].close()
+                connection = None
+                continue
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return latencies, errors
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Get a percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    """Run the load test and print the results of each server."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['DEV_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['DEV_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ['RATELIMIT_ENABLED'] = 'False'
+    cookie = seed(args.tasks)
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    servers = [
+        ('wsgi', lambda port: ['gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+                               '--workers', '1', '--worker-class', 'gthread',
+                               '--threads', str(args.threads)]),
+        ('asgi', lambda port: [sys.executable, '-m', 'uvicorn', 'asgi:app',
+                               '--port', str(port), '--workers', '1', '--no-access-log']),
+    ]
+    best = {}
+    print(f"GET {PATH}, p95 objective {args.slo_ms:.0f} ms")
+    print(f"{'server':<7}{'conc.':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}")
+    for name, command in servers:
+        port = free_port()
+        process = start_server(command(port), port)
+        try:
+            for concurrency in levels:
+                latencies, errors = asyncio.run(run_level(port, cookie, concurrency, args.duration))
+                if not latencies:
+                    print(f"{name:<7}{concurrency:>6}{'no response':>26}")
+                    break
+                p95 = percentile(latencies, 0.95) * 1000
+                print(f"{name:<7}{concurrency:>6}{len(latencies) / args.duration:>9.0f}"
+                      f"{percentile(latencies, 0.5) * 1000:>9.1f}{p95:>9.1f}"
+                      f"{percentile(latencies, 0.99) * 1000:>9.1f}{errors:>8}")
+                if p95 <= args.slo_ms and not errors:
+                    best[name] = concurrency
+        finally:
+            process.terminate()
+            process.wait()
+
+    for name, _ in servers:
+        print(f"{name}: {best.get(name, 0)} concurrent requests per worker within the SLO")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
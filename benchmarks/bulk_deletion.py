@@ -0,0 +1,129 @@
+"""
+Benchmark of category and user deletion on large data sets.
+
+Seeds a category and a user with many tasks, then deletes them first the former way
+(loading every task into the session and flushing one statement per row) and then
+with the set-based utils.delete_category and utils.delete_user. Prints the elapsed
+time and the number of statements of each run.
+
+Usage:
+    python benchmarks/bulk_deletion.py [--tasks 20000] [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=20000,
+                        help="Tasks in the deleted category/user")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Personne, Categorie, Tache, tasks: int) -> None:
+    """Insert a user with one category holding every task, with bulk inserts."""
+    db.session.execute(Personne.__table__.insert(), [
+        {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user'},
+    ])
+    db.session.execute(Categorie.__table__.insert(), [
+        {'id': 1, 'nom': 'large', 'couleur': '#007bff', 'personne_id': 1},
+    ])
+    db.session.execute(Tache.__table__.insert(), [
+        {'titre': f'Tâche {i}', 'status': 'pending', 'priority': 'medium', 'is_deleted': False,
+         'personne_id': 1, 'categorie_id': 1}
+        for i in range(tasks)
+    ])
+    db.session.commit()
+
+
+def legacy_delete_category(db, categorie) -> None:
+    """Delete a category the way the routes did before the set-based version."""
+    for tache in categorie.taches:
+        tache.categorie_id = None
+    db.session.delete(categorie)
+    db.session.commit()
+
+
+def legacy_delete_user(db, user) -> None:
+    """Delete a user by letting the ORM cascade load and delete every task."""
+    from taskmanager.models import Categorie
+
+    user.taches  # The delete-orphan cascade loads the collection before deleting
+    for categorie in Categorie.query.filter_by(personne_id=user.id):
+        db.session.delete(categorie)
+    db.session.delete(user)
+    db.session.commit()
+
+
+def measure(db, func, *args) -> tuple:
+    """Run a deletion and return its elapsed time in seconds and its statement count."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(len(parameters) if executemany else 1)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    db.session.remove()
+    return elapsed, sum(statements)
+
+
+def main() -> None:
+    """Run the benchmark and print the results before and after."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Categorie, Tache
+    from taskmanager.utils import delete_category, delete_user
+
+    app = create_app('testing')
+    results = []
+    with app.app_context():
+        for name, legacy, set_based, model in [
+            ('category', legacy_delete_category, delete_category, Categorie),
+            ('user', legacy_delete_user, delete_user, Personne),
+        ]:
+            row = [name]
+            for func in (lambda obj: legacy(db, obj), set_based):
+                db.drop_all()
+                db.create_all()
+                seed(db, Personne, Categorie, Tache, args.tasks)
+                row.append(measure(db, func, db.session.get(model, 1)))
+            results.append(row)
+        db.drop_all()
+
+    print(f"Deleting with {args.tasks} tasks")
+    print(f"{'target':<10}{'before':>22}{'after':>22}")
+    for name, (before, before_n), (after, after_n) in results:
+        print(f"{name:<10}{before:>9.3f} s {before_n:>6} stmt{after:>9.3f} s {after_n:>6} stmt")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
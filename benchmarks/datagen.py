@@ -0,0 +1,205 @@
+"""
+Seeded generator of synthetic users, categories and tasks for the benchmarks.
+
+The data is skewed like real usage: the number of tasks of each user follows a Zipf
+law (a few heavy users own most of the tasks), categories are used unevenly, and the
+statuses, priorities, due dates and soft deletions follow fixed proportions. The same
+seed always generates the same data. Rows are loaded with bulk table inserts, then
+the task statistics are rebuilt, as the inserts bypass the ORM flush that keeps them.
+
+User 1 is an administrator named admin; the others are user2, user3... All passwords
+are PASSWORD.
+
+Usage:
+    python benchmarks/datagen.py --database-url sqlite:////tmp/bench.db [--users 100]
+        [--categories 5] [--tasks 200] [--skew 1.1] [--seed 42]
+
+Other benchmarks import generate() to seed their own database.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PASSWORD = 'password'
+ADMIN_ID = 1
+
+STATUSES = (('pending', 0.5), ('in_progress', 0.2), ('completed', 0.3))
+PRIORITIES = (('low', 0.3), ('medium', 0.5), ('high', 0.2))
+NO_DUE_DATE = 0.3
+UNCATEGORIZED = 0.15
+DELETED = 0.05
+COLORS = ('#007bff', '#28a745', '#dc3545', '#ffc107', '#17a2b8', '#6f42c1')
+
+# Words of the titles and descriptions, so that searches find a realistic share of tasks
+WORDS = (
+    'rapport', 'réunion', 'client', 'facture', 'projet', 'documentation', 'livraison',
+    'budget', 'planning', 'revue', 'contrat', 'formation', 'présentation', 'audit',
+    'migration', 'serveur', 'recrutement', 'inventaire', 'commande', 'maintenance',
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--database-url', required=True, help="Database to seed, emptied first")
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the generated data to a command line parser."""
+    parser.add_argument('--users', type=int, default=100, help="Users, besides the admin")
+    parser.add_argument('--categories', type=int, default=5, help="Categories per user")
+    parser.add_argument('--tasks', type=int, default=200, help="Mean tasks per user")
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help="Zipf exponent of the tasks per user, 0 for uniform")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+
+
+def zipf_split(total: int, parts: int, skew: float, rng: random.Random) -> List[int]:
+    """
+    Split a total into parts following a Zipf law, in a random order.
+
+    Args:
+        total: The sum of the parts
+        parts: The number of parts
+        skew: The exponent, the k-th largest part is proportional to 1 / k ** skew
+        rng: The random generator
+
+    Returns:
+        The parts
+    """
+    weights = [1 / rank ** skew for rank in range(1, parts + 1)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Give the rounding remainder to the largest parts
+    for index in range(total - sum(counts)):
+        counts[index % parts] += 1
+    rng.shuffle(counts)
+    return counts
+
+
+def pick(choices: tuple, rng: random.Random) -> str:
+    """Pick a value of ((value, weight), ...) choices."""
+    return rng.choices([value for value, _ in choices], [weight for _, weight in choices])[0]
+
+
+def insert(db, table, rows: List[Dict[str, Any]], batch_size: int) -> None:
+    """Insert rows into a table in batches."""
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(table.insert(), rows[start:start + batch_size])
+
+
+def generate(db, users: int = 100, categories: int = 5, tasks: int = 200, skew: float = 1.1,
+             seed: int = 42, batch_size: int = 5000) -> Dict[str, Any]:
+    """
+    Insert synthetic data into the empty tables of the application's database.
+
+    Must run within an application context.
+
+    Args:
+        db: The SQLAlchemy instance
+        users: The number of users, besides the admin
+        categories: The number of categories of each user
+        tasks: The mean number of tasks per user
+        skew: The Zipf exponent of the tasks per user, 0 for the same number for all
+        seed: The random seed
+        batch_size: The rows per insert statement
+
+    Returns:
+        Dictionary with the user IDs, the ID of the user with the most tasks and the
+        numbers of categories and tasks inserted
+    """
+    from werkzeug.security import generate_password_hash
+    from taskmanager.models import Categorie, Personne, Tache
+    from taskmanager.stats import rebuild_task_stats
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password = generate_password_hash(PASSWORD)
+    user_ids = list(range(ADMIN_ID + 1, ADMIN_ID + 1 + users))
+
+    insert(db, Personne.__table__, [
+        {'id': ADMIN_ID, 'nom': 'admin', 'password': password, 'role': 'admin',
+         'created_at': now, 'updated_at': now}
+    ] + [
+        {'id': user_id, 'nom': f'user{user_id}', 'password': password, 'role': 'user',
+         'email': f'user{user_id}@example.com', 'created_at': now, 'updated_at': now}
+        for user_id in user_ids
+    ], batch_size)
+
+    category_ids: Dict[int, List[int]] = {}
+    category_rows = []
+    for user_id in user_ids:
+        category_ids[user_id] = []
+        for index in range(categories):
+            category_id = len(category_rows) + 1
+            category_ids[user_id].append(category_id)
+            category_rows.append({
+                'id': category_id, 'nom': f'{rng.choice(WORDS).capitalize()} {index + 1}',
+                'couleur': rng.choice(COLORS), 'personne_id': user_id,
+                'created_at': now, 'updated_at': now,
+            })
+    insert(db, Categorie.__table__, category_rows, batch_size)
+
+    task_counts = zipf_split(tasks * users, users, skew, rng)
+    # Categories of a user are used unevenly too
+    category_weights = [1 / rank for rank in range(1, categories + 1)]
+    task_rows = []
+    for user_id, count in zip(user_ids, task_counts):
+        for _ in range(count):
+            created_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+            due_date = None
+            if rng.random() >= NO_DUE_DATE:
+                due_date = now + timedelta(days=rng.randint(-30, 90))
+            categorie_id = None
+            if categories and rng.random() >= UNCATEGORIZED:
+                categorie_id = rng.choices(category_ids[user_id], category_weights)[0]
+            task_rows.append({
+                'titre': ' '.join(rng.sample(WORDS, 3)).capitalize(),
+                'description': ' '.join(rng.choices(WORDS, k=rng.randint(0, 30))) or None,
+                'status': pick(STATUSES, rng),
+                'priority': pick(PRIORITIES, rng),
+                'due_date': due_date,
+                'created_at': created_at,
+                'updated_at': created_at,
+                'is_deleted': rng.random() < DELETED,
+                'personne_id': user_id,
+                'categorie_id': categorie_id,
+            })
+    insert(db, Tache.__table__, task_rows, batch_size)
+
+    rebuild_task_stats(db.session)
+    db.session.commit()
+    heaviest = max(zip(task_counts, user_ids))[1] if user_ids else None
+    return {'user_ids': user_ids, 'heaviest_user_id': heaviest,
+            'categories': len(category_rows), 'tasks': len(task_rows)}
+
+
+def main() -> None:
+    """Empty a database and seed it."""
+    args = parse_args()
+    os.environ['TEST_DATABASE_URL'] = args.database_url
+
+    from taskmanager import create_app, db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        summary = generate(db, args.users, args.categories, args.tasks, args.skew, args.seed)
+    print(f"{len(summary['user_ids'])} users, {summary['categories']} categories, "
+          f"{summary['tasks']} tasks in {time.perf_counter() - start:.1f} s; "
+          f"user{summary['heaviest_user_id']} has the most tasks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Memory benchmark for the streaming task export.
+
+Seeds tasks in three steps, exporting them all through export_tasks after each step,
+and reports the throughput and the peak Python memory (tracemalloc) of each run. The
+peak should stay flat while the number of rows grows.
+
+Usage:
+    python benchmarks/export_memory.py [--tasks 200000] [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=200000, help="Tasks seeded")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Tache, start: int, stop: int) -> None:
+    """Insert tasks start..stop for ten users with bulk inserts."""
+    now = datetime.utcnow()
+    rows = []
+    for i in range(start, stop):
+        rows.append({
+            'titre': f'Tâche {i}', 'description': 'x' * 200, 'status': 'pending',
+            'priority': 'medium', 'is_deleted': False, 'personne_id': i % 10 + 1,
+            'created_at': now - timedelta(minutes=i), 'updated_at': now,
+        })
+        if len(rows) >= 10000:
+            db.session.execute(Tache.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(Tache.__table__.insert(), rows)
+    db.session.commit()
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Tache
+    from taskmanager.export import export_tasks
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(Personne.__table__.insert(), [
+            {'id': u, 'nom': f'user{u}', 'password': 'x', 'role': 'user'} for u in range(1, 11)
+        ])
+        db.session.commit()
+
+        print(f"{'format':<8}{'rows':>10}{'rows/s':>12}{'peak MiB':>10}")
+        seeded = 0
+        for step in (args.tasks // 4, args.tasks // 2, args.tasks):
+            seed(db, Tache, seeded, step)
+            seeded = step
+            for export_format in ('csv', 'ndjson'):
+                tracemalloc.start()
+                start = time.perf_counter()
+                chunks = 0
+                with open(os.devnull, 'w', encoding='utf-8') as output:
+                    for chunk in export_tasks(export_format, app.config['EXPORT_BATCH_SIZE']):
+                        output.write(chunk)
+                        chunks += 1
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                db.session.remove()
+                rows = chunks - 1 if export_format == 'csv' else chunks
+                print(f"{export_format:<8}{rows:>10}{rows / elapsed:>12.0f}{peak / 2 ** 20:>10.2f}")
+
+        db.drop_all()
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
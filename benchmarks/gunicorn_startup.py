@@ -0,0 +1,107 @@
+"""
+Benchmark of the gunicorn startup time and worker memory, with and without preloading.
+
+Starts gunicorn with gunicorn.conf.py, once with GUNICORN_PRELOAD=false and once with
+GUNICORN_PRELOAD=true, and measures the time until every worker has loaded the
+application (its "Worker ready" log line). After a few requests, it prints the memory
+of each worker: RSS counts the pages shared with the master, USS only the pages of the
+worker itself, PSS splits the shared pages between the processes using them.
+
+Usage:
+    python benchmarks/gunicorn_startup.py [--workers 4] [--worker-class gthread] [--requests 50]
+
+Requires gunicorn and psutil (PSS and USS are read from /proc on Linux).
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes")
+    parser.add_argument('--worker-class', default='gthread', help="gthread, gevent or sync")
+    parser.add_argument('--requests', type=int, default=50, help="Requests sent before measuring")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run(preload: bool, args: argparse.Namespace, database_url: str) -> tuple:
+    """Start gunicorn, return the startup time and the memory of each worker in bytes."""
+    import psutil
+
+    port = free_port()
+    env = dict(os.environ, GUNICORN_BIND=f'127.0.0.1:{port}', WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_WORKER_CLASS=args.worker_class, GUNICORN_PRELOAD=str(preload),
+               GUNICORN_MAX_REQUESTS='0', DEV_DATABASE_URL=database_url,
+               RATELIMIT_ENABLED='False')
+    start = time.perf_counter()
+    process = subprocess.Popen(['gunicorn', '--config', 'gunicorn.conf.py', 'app:app'],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, text=True)
+    ready = threading.Event()
+    startup = []
+
+    def read_log() -> None:
+        workers = 0
+        for line in process.stderr:
+            if 'Worker ready' in line:
+                workers += 1
+                if workers == args.workers:
+                    startup.append(time.perf_counter() - start)
+                    ready.set()
+
+    threading.Thread(target=read_log, daemon=True).start()
+    try:
+        if not ready.wait(60):
+            sys.exit("The workers did not start within 60 seconds")
+        for _ in range(args.requests):
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/auth/connexion').read()
+        memory = [child.memory_full_info() for child in psutil.Process(process.pid).children()]
+        return startup[0], memory
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    """Run the benchmark and print the results of each mode."""
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    print(f"{args.workers} {args.worker_class} workers, {args.requests} requests")
+    print(f"{'preload':<9}{'startup s':>10}{'RSS MiB':>10}{'USS MiB':>10}{'PSS MiB':>10}")
+    for preload in (False, True):
+        startup, memory = run(preload, args, database_url)
+
+        def mean(field: str) -> float:
+            return sum(getattr(m, field, 0) for m in memory) / len(memory) / 2 ** 20
+
+        print(f"{str(preload).lower():<9}{startup:>10.2f}{mean('rss'):>10.1f}"
+              f"{mean('uss'):>10.1f}{mean('pss'):>10.1f}")
+    print("Memory columns are means per worker")
+
+    if os.path.exists(os.path.join(tmpdir, 'bench.db')):
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+    os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+HTTP load test of the full stack under gunicorn with mixed user traffic.
+
+Seeds a database with the synthetic data of datagen.py, then starts gunicorn with
+gunicorn.conf.py and the production configuration on localhost, so every request
+goes through Talisman, CSRF protection, the session checks and the rate limiter like
+in production. The requests carry X-Forwarded-Proto: https, as from a TLS proxy, and
+the form posts a same-origin Referer, as from a browser.
+
+An asyncio client runs many concurrent sessions, each logged in as its own user over
+a keep-alive connection with its own cookies. Each session repeatedly picks an action:
+list its tasks with random filters, create a task (form, then POST with its CSRF
+token), edit a task, change the status of a task, or log out and in again. Prints the
+throughput, latency percentiles and error rate of each endpoint.
+
+Every session connects from 127.0.0.1, so the per-address rate limits (5 logins per
+minute, 50 requests per hour) would reject nearly all requests: the limiter is
+disabled unless --rate-limits is given, then rejections count as errors.
+
+Usage:
+    python benchmarks/http_load.py [--sessions 50] [--duration 30] [--workers 2]
+        [--threads 4] [--worker-class gthread] [--users 100] [--tasks 200]
+        [--think-ms 0] [--rate-limits] [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used; its single writer makes
+the create, edit and status requests queue behind each other, use PostgreSQL to
+measure concurrent writes. Requires gunicorn.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import datagen  # noqa: E402
+from async_load import free_port, percentile  # noqa: E402
+
+# Actions of a session and their weights
+ACTIONS = (('list', 0.45), ('status', 0.2), ('create', 0.15), ('edit', 0.15), ('login', 0.05))
+
+LIST_QUERIES = (
+    '', '', '?status=pending', '?status=in_progress&sort_by=priority',
+    '?priority=high&sort_by=created_at&sort_dir=desc', '?page=2', '?page=3&sort_by=title',
+    '?search=rapport',
+)
+STATUSES = ('pending', 'in_progress', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+
+# Seconds a session waits after an error, so rejections do not turn into a busy loop
+ERROR_BACKOFF = 0.5
+
+CSRF_PATTERN = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sessions', type=int, default=50, help="Concurrent user sessions")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of traffic")
+    parser.add_argument('--think-ms', type=float, default=0,
+                        help="Pause of a session between two actions")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument('--threads', type=int, default=4, help="Threads per gthread worker")
+    parser.add_argument('--worker-class', default='gthread', help="gthread, gevent or sync")
+    parser.add_argument('--rate-limits', action='store_true', help="Keep the rate limiter on")
+    parser.add_argument('--database-url',
+                        help="Database to seed and serve (default: temporary SQLite)")
+    datagen.add_arguments(parser)
+    return parser.parse_args()
+
+
+class HTTPError(Exception):
+    """A request that failed or got an unexpected status."""
+
+
+class Session:
+    """A user session: one keep-alive connection and its cookies."""
+
+    def __init__(self, port: int, rng: random.Random):
+        self.port = port
+        self.rng = rng
+        self.cookies: Dict[str, str] = {}
+        self.connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+
+    def close(self) -> None:
+        """Close the connection, the next request opens a new one."""
+        if self.connection is not None:
+            self.connection[1].close()
+            self.connection = None
+
+    async def request(self, method: str, path: str,
+                      form: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """Send a request, store the cookies set and return the status and body."""
+        if self.connection is None:
+            self.connection = await asyncio.open_connection('127.0.0.1', self.port)
+        reader, writer = self.connection
+        body = urlencode(form).encode() if form is not None else b''
+        headers = [f"{method} {path} HTTP/1.1", f"Host: 127.0.0.1:{self.port}",
+                   "X-Forwarded-Proto: https"]
+        if self.cookies:
+            headers.append("Cookie: " + '; '.join(f'{k}={v}' for k, v in self.cookies.items()))
+        if form is not None:
+            # The forms post to their own page; CSRF protection checks the referrer over HTTPS
+            headers += ["Content-Type: application/x-www-form-urlencoded",
+                        f"Content-Length: {len(body)}",
+                        f"Referer: https://127.0.0.1:{self.port}{path}"]
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        length, chunked, keep_alive = 0, False, True
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.lower(), value.strip()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding':
+                chunked = value.lower() == 'chunked'
+            elif name == 'connection':
+                keep_alive = value.lower() != 'close'
+            elif name == 'set-cookie':
+                cookie_name, _, cookie_value = value.split(';', 1)[0].partition('=')
+                if cookie_value and 'expires=thu, 01 jan 1970' not in value.lower():
+                    self.cookies[cookie_name] = cookie_value
+                else:
+                    self.cookies.pop(cookie_name, None)
+        if chunked:
+            content = b''
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                content += await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            content = await reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return status, content
+
+
+class Stats:
+    """Latencies and errors of each endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+
+async def call(session: Session, stats: Stats, endpoint: str, expected: int, method: str,
+               path: str, form: Optional[Dict[str, str]] = None) -> bytes:
+    """Send a request, record it under an endpoint, raise HTTPError if it failed."""
+    start = time.perf_counter()
+    try:
+        status, body = await session.request(method, path, form)
+    except (OSError, asyncio.IncompleteReadError, IndexError, ValueError) as e:
+        session.close()
+        stats.errors[endpoint] += 1
+        stats.statuses[endpoint][0] += 1
+        raise HTTPError(f"{endpoint}: {type(e).__name__}")
+    stats.latencies[endpoint].append(time.perf_counter() - start)
+    stats.statuses[endpoint][status] += 1
+    if status != expected:
+        stats.errors[endpoint] += 1
+        raise HTTPError(f"{endpoint}: {status}")
+    return body
+
+
+def csrf_token(body: bytes) -> str:
+    """Get the CSRF token of a form page."""
+    match = CSRF_PATTERN.search(body.decode('utf-8', 'replace'))
+    if match is None:
+        raise HTTPError("no CSRF token in the form")
+    return match.group(1)
+
+
+def task_form(session: Session, token: str, title: str) -> Dict[str, str]:
+    """Build the fields of a task form."""
+    return {
+        'csrf_token': token,
+        'titre': title,
+        'description': 'Créée par le test de charge',
+        'status': session.rng.choice(STATUSES),
+        'priority': session.rng.choice(PRIORITIES),
+        'categorie_id': '0',
+        'due_date': '',
+    }
+
+
+async def login(session: Session, stats: Stats, name: str) -> None:
+    """Log in through the login form."""
+    token = csrf_token(await call(session, stats, 'GET /auth/connexion', 200,
+                                  'GET', '/auth/connexion'))
+    await call(session, stats, 'POST /auth/connexion', 302, 'POST', '/auth/connexion', {
+        'csrf_token': token, 'nom': name, 'password': datagen.PASSWORD,
+    })
+
+
+async def act(session: Session, stats: Stats, action: str, name: str, task_ids: List[int]) -> None:
+    """Run one action of a session."""
+    rng = session.rng
+    if action == 'list':
+        await call(session, stats, 'GET /tasks/', 200, 'GET', '/tasks/' + rng.choice(LIST_QUERIES))
+    elif action == 'status':
+        await call(session, stats, 'GET /tasks/changer-statut', 302, 'GET',
+                   f'/tasks/changer-statut/{rng.choice(task_ids)}/{rng.choice(STATUSES)}')
+    elif action == 'create':
+        token = csrf_token(await call(session, stats, 'GET /tasks/nouvelle', 200,
+                                      'GET', '/tasks/nouvelle'))
+        await call(session, stats, 'POST /tasks/nouvelle', 302, 'POST', '/tasks/nouvelle',
+                   task_form(session, token, f'Tâche de charge {rng.randrange(10 ** 6)}'))
+    elif action == 'edit':
+        task_id = rng.choice(task_ids)
+        token = csrf_token(await call(session, stats, 'GET /tasks/editer', 200,
+                                      'GET', f'/tasks/editer/{task_id}'))
+        await call(session, stats, 'POST /tasks/editer', 302, 'POST', f'/tasks/editer/{task_id}',
+                   task_form(session, token, f'Tâche modifiée {rng.randrange(10 ** 6)}'))
+    else:
+        await call(session, stats, 'GET /auth/deconnecter', 302, 'GET', '/auth/deconnecter')
+        await login(session, stats, name)
+
+
+async def run_session(port: int, stats: Stats, name: str, task_ids: List[int], seed: int,
+                      deadline: float, think: float) -> None:
+    """Log a session in, then run random actions until the deadline."""
+    session = Session(port, random.Random(seed))
+    actions, weights = zip(*ACTIONS)
+    logged_in = False
+    while time.monotonic() < deadline:
+        try:
+            if not logged_in:
+                await login(session, stats, name)
+                logged_in = True
+            await act(session, stats, session.rng.choices(actions, weights)[0], name, task_ids)
+        except HTTPError:
+            # Start over from the login page, the session may have been lost
+            logged_in = False
+            await asyncio.sleep(ERROR_BACKOFF)
+        if think:
+            await asyncio.sleep(think)
+    session.close()
+
+
+def seed_database(args: argparse.Namespace, database_url: str) -> Dict[str, List[int]]:
+    """Seed the database, return the IDs of the active tasks of each user by name."""
+    os.environ['TEST_DATABASE_URL'] = database_url
+    from taskmanager import create_app, db
+    from taskmanager.models import Tache
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        summary = datagen.generate(db, args.users, args.categories, args.tasks, args.skew,
+                                   args.seed)
+        task_ids = defaultdict(list)
+        for task_id, user_id in db.session.query(Tache.id, Tache.personne_id) \
+                .filter_by(is_deleted=False):
+            task_ids[f'user{user_id}'].append(task_id)
+        db.session.remove()
+        db.engine.dispose()
+    print(f"{len(summary['user_ids'])} users, {summary['categories']} categories, "
+          f"{summary['tasks']} tasks")
+    return {name: ids for name, ids in task_ids.items() if ids}
+
+
+def start_gunicorn(args: argparse.Namespace, port: int, database_url: str,
+                   workdir: str) -> subprocess.Popen:
+    """Start gunicorn on the database and wait until it accepts connections."""
+    env = dict(os.environ, FLASK_ENV='production', DATABASE_URL=database_url,
+               GUNICORN_BIND=f'127.0.0.1:{port}', WEB_CONCURRENCY=str(args.workers),
+               GUNICORN_THREADS=str(args.threads), GUNICORN_WORKER_CLASS=args.worker_class,
+               RATELIMIT_ENABLED=str(args.rate_limits), SLOW_REQUEST_THRESHOLD_MS='100000',
+               PYTHONPATH=ROOT)
+    # The production configuration logs to logs/ in the working directory
+    process = subprocess.Popen(
+        ['gunicorn', '--config', os.path.join(ROOT, 'gunicorn.conf.py'), 'app:app'],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.kill()
+    sys.exit("gunicorn did not start")
+
+
+def report(stats: Stats, duration: float) -> None:
+    """Print the throughput, latency percentiles and errors of each endpoint."""
+    print(f"{'endpoint':<28}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>8}  statuses")
+    endpoints = sorted(set(stats.latencies) | set(stats.errors))
+    total = sum(len(latencies) for latencies in stats.latencies.values())
+    for endpoint in endpoints:
+        latencies = [latency * 1000 for latency in stats.latencies[endpoint]]
+        sent = sum(stats.statuses[endpoint].values())
+        statuses = ' '.join(f'{status or "fail"}:{count}'
+                            for status, count in sorted(stats.statuses[endpoint].items()))
+        row = f"{endpoint:<28}{len(latencies) / duration:>8.1f}"
+        if latencies:
+            row += (f"{percentile(latencies, 0.5):>9.1f}{percentile(latencies, 0.95):>9.1f}"
+                    f"{percentile(latencies, 0.99):>9.1f}")
+        else:
+            row += f"{'-':>9}{'-':>9}{'-':>9}"
+        print(f"{row}{stats.errors[endpoint] / sent:>8.1%}  {statuses}")
+    errors = sum(stats.errors.values())
+    sent = sum(sum(statuses.values()) for statuses in stats.statuses.values())
+    print(f"Total: {total / duration:.1f} requests/s, "
+          f"{errors} errors ({errors / max(1, sent):.1%})")
+
+
+async def run(args: argparse.Namespace, port: int, task_ids: Dict[str, List[int]]) -> Stats:
+    """Run the concurrent sessions until the end of the test."""
+    stats = Stats()
+    names = sorted(task_ids)
+    deadline = time.monotonic() + args.duration
+    # Each session logs in as its own user while there are enough of them
+    await asyncio.gather(*[
+        run_session(port, stats, name, task_ids[name], args.seed + index, deadline,
+                    args.think_ms / 1000)
+        for index, name in ((index, names[index % len(names)]) for index in range(args.sessions))
+    ])
+    return stats
+
+
+def main() -> None:
+    """Seed the database, start gunicorn, run the traffic and print the results."""
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    task_ids = seed_database(args, database_url)
+
+    port = free_port()
+    process = start_gunicorn(args, port, database_url, workdir)
+    try:
+        print(f"{args.sessions} sessions for {args.duration:g} s against {args.workers} "
+              f"{args.worker_class} workers, rate limits {'on' if args.rate_limits else 'off'}")
+        start = time.monotonic()
+        stats = asyncio.run(run(args, port, task_ids))
+        report(stats, time.monotonic() - start)
+    finally:
+        process.terminate()
+        process.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
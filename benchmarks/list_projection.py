@@ -0,0 +1,125 @@
+"""
+Benchmark of the column projection of the task listings.
+
+Seeds tasks with long descriptions, then fetches listing pages with the full and the
+list load modes of get_tasks_optimized and get_admin_tasks_optimized. Prints the mean
+time per page, the bytes of column values fetched from the database and the peak
+Python memory (tracemalloc) of each mode.
+
+Usage:
+    python benchmarks/list_projection.py [--tasks 5000] [--per-page 100] [--description 4000]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=5000, help="Tasks seeded")
+    parser.add_argument('--per-page', type=int, default=100, help="Tasks per page")
+    parser.add_argument('--description', type=int, default=4000, help="Description length")
+    parser.add_argument('--pages', type=int, default=20, help="Pages fetched per mode")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Personne, Categorie, Tache, tasks: int, description: int) -> None:
+    """Insert a user with a category and many tasks, with bulk inserts."""
+    db.session.execute(Personne.__table__.insert(), [
+        {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user', 'bio': 'b' * description},
+    ])
+    db.session.execute(Categorie.__table__.insert(), [
+        {'id': 1, 'nom': 'bench', 'description': 'd' * 200, 'couleur': '#007bff', 'personne_id': 1},
+    ])
+    db.session.execute(Tache.__table__.insert(), [
+        {'titre': f'Tâche {i}', 'description': 'x' * description, 'status': 'pending',
+         'priority': 'medium', 'is_deleted': False, 'personne_id': 1, 'categorie_id': 1}
+        for i in range(tasks)
+    ])
+    db.session.commit()
+
+
+def measure(db, fetch, pages: int) -> tuple:
+    """Fetch pages and return the mean time, the bytes fetched and the peak memory per page."""
+    from sqlalchemy.engine.cursor import CursorResult
+
+    # Wrap the result fetching to count the size of the values read from the database
+    fetched = []
+    original = CursorResult._fetchall_impl
+
+    def fetchall_impl(self):
+        rows = original(self)
+        fetched.append(sum(len(v) if isinstance(v, (str, bytes)) else 8
+                           for row in rows for v in row))
+        return rows
+
+    CursorResult._fetchall_impl = fetchall_impl
+    elapsed = peak = 0.0
+    try:
+        for _ in range(pages):
+            tracemalloc.start()
+            start = time.perf_counter()
+            fetch()
+            elapsed += time.perf_counter() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            db.session.remove()
+    finally:
+        CursorResult._fetchall_impl = original
+    return elapsed / pages, sum(fetched) / pages, peak
+
+
+def main() -> None:
+    """Run the benchmark and print the results of each mode."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Categorie, Tache
+    from taskmanager.utils import get_tasks_optimized, get_admin_tasks_optimized
+
+    app = create_app('testing')
+    results = []
+    with app.test_request_context():
+        db.drop_all()
+        db.create_all()
+        seed(db, Personne, Categorie, Tache, args.tasks, args.description)
+        for listing, fetch in [
+            ('user', lambda load: get_tasks_optimized(1, per_page=args.per_page, load=load,
+                                                      count_strategy='probe')),
+            ('admin', lambda load: get_admin_tasks_optimized(per_page=args.per_page, load=load,
+                                                             count_strategy='probe')),
+        ]:
+            for load in ('full', 'list'):
+                results.append((listing, load) + measure(db, lambda: fetch(load), args.pages))
+        db.drop_all()
+
+    print(f"{args.per_page} tasks per page, descriptions of {args.description} characters")
+    print(f"{'listing':<8}{'mode':<6}{'ms/page':>10}{'KiB fetched':>14}{'peak KiB':>10}")
+    for listing, load, elapsed, fetched, peak in results:
+        print(f"{listing:<8}{load:<6}{elapsed * 1000:>10.2f}{fetched / 1024:>14.1f}"
+              f"{peak / 1024:>10.1f}")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
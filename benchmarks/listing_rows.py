@@ -0,0 +1,115 @@
+"""
+Benchmark of the ORM and row-tuple read paths of the task listings.
+
+Seeds tasks, then fetches large listing pages with the full, list and rows load modes
+of get_tasks_optimized and get_admin_tasks_optimized. Prints the rows read per second
+of each mode: the full and list modes build Tache instances tracked by the session,
+the rows mode builds immutable TaskRow tuples without touching the unit of work.
+
+Usage:
+    python benchmarks/listing_rows.py [--tasks 20000] [--per-page 1000] [--pages 20]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LOAD_MODES = ('full', 'list', 'rows')
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=20000, help="Tasks seeded")
+    parser.add_argument('--per-page', type=int, default=1000, help="Tasks per page")
+    parser.add_argument('--pages', type=int, default=20, help="Pages fetched per mode")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Personne, Categorie, Tache, tasks: int) -> None:
+    """Insert a user with a few categories and many tasks, with bulk inserts."""
+    db.session.execute(Personne.__table__.insert(), [
+        {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user'},
+    ])
+    db.session.execute(Categorie.__table__.insert(), [
+        {'id': i, 'nom': f'Catégorie {i}', 'couleur': '#007bff', 'personne_id': 1}
+        for i in range(1, 11)
+    ])
+    db.session.execute(Tache.__table__.insert(), [
+        {'titre': f'Tâche {i}', 'description': 'x' * 200, 'status': 'pending',
+         'priority': 'medium', 'is_deleted': False, 'personne_id': 1,
+         'categorie_id': i % 11 or None}
+        for i in range(tasks)
+    ])
+    db.session.commit()
+
+
+def measure(db, fetch, pages: int, per_page: int) -> float:
+    """Fetch pages with a fresh session each and return the rows read per second."""
+    fetch()  # Warm up the statement caches
+    db.session.remove()
+    elapsed = 0.0
+    for page in range(1, pages + 1):
+        start = time.perf_counter()
+        rows, _, _ = fetch(page)
+        elapsed += time.perf_counter() - start
+        assert len(rows) == per_page
+        db.session.remove()
+    return pages * per_page / elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print the results of each mode."""
+    args = parse_args()
+    if args.pages * args.per_page > args.tasks:
+        sys.exit("--tasks must cover --pages pages of --per-page tasks")
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Categorie, Tache
+    from taskmanager.utils import get_tasks_optimized, get_admin_tasks_optimized
+
+    app = create_app('testing')
+    results = []
+    with app.test_request_context():
+        db.drop_all()
+        db.create_all()
+        seed(db, Personne, Categorie, Tache, args.tasks)
+        for listing, fetch in [
+            ('user', lambda load, page=1: get_tasks_optimized(
+                1, page=page, per_page=args.per_page, load=load, count_strategy='probe')),
+            ('admin', lambda load, page=1: get_admin_tasks_optimized(
+                page=page, per_page=args.per_page, load=load, count_strategy='probe')),
+        ]:
+            for load in LOAD_MODES:
+                rate = measure(db, lambda page=1: fetch(load, page), args.pages, args.per_page)
+                results.append((listing, load, rate))
+        db.drop_all()
+
+    print(f"{args.pages} pages of {args.per_page} tasks")
+    print(f"{'listing':<8}{'mode':<6}{'rows/s':>12}{'vs full':>10}")
+    baseline = {}
+    for listing, load, rate in results:
+        baseline.setdefault(listing, rate)
+        print(f"{listing:<8}{load:<6}{rate:>12,.0f}{rate / baseline[listing]:>9.1f}x")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of the overhead of the Prometheus metrics.
+
+Seeds a user with tasks, then requests the task list through the Flask test client
+with METRICS_ENABLED off and on, and prints the mean time per request of each,
+interleaving the two in a random order so machine noise affects both alike.
+
+Set PROMETHEUS_MULTIPROC_DIR to an empty directory to measure the multiprocess mode.
+
+Usage:
+    python benchmarks/metrics_overhead.py [--tasks 200] [--requests 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=200, help="Tasks seeded")
+    parser.add_argument('--requests', type=int, default=500, help="Requests timed per mode")
+    return parser.parse_args()
+
+
+def make_client(enabled: bool):
+    """Create an application with the metrics on or off and a logged-in client."""
+    from taskmanager import create_app
+    from taskmanager.config import TestingConfig
+
+    TestingConfig.METRICS_ENABLED = enabled
+    app = create_app('testing')
+    app.config['RATELIMIT_ENABLED'] = False
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['personne_id'] = 1
+        session['login_time'] = time.time()
+    return client
+
+
+def main() -> None:
+    """Run the benchmark and print the results of each mode."""
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp()
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ['RATELIMIT_ENABLED'] = 'False'
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Tache
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        db.session.execute(Personne.__table__.insert(), [
+            {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user'},
+        ])
+        db.session.execute(Tache.__table__.insert(), [
+            {'titre': f'Tâche {i}', 'status': 'pending', 'priority': 'medium',
+             'is_deleted': False, 'personne_id': 1}
+            for i in range(args.tasks)
+        ])
+        db.session.commit()
+
+    clients = {'off': make_client(False), 'on': make_client(True)}
+    elapsed = dict.fromkeys(clients, 0.0)
+    for client in clients.values():
+        client.get('/tasks/')  # Warm up
+    modes = list(clients)
+    for _ in range(args.requests):
+        random.shuffle(modes)
+        for mode in modes:
+            client = clients[mode]
+            start = time.perf_counter()
+            client.get('/tasks/')
+            elapsed[mode] += time.perf_counter() - start
+
+    print(f"GET /tasks/ with {args.tasks} tasks, {args.requests} requests per mode")
+    for mode in clients:
+        print(f"metrics {mode:<4}{elapsed[mode] / args.requests * 1000:>8.3f} ms/request")
+    overhead = (elapsed['on'] - elapsed['off']) / args.requests * 1e6
+    print(f"overhead {overhead:.0f} us/request")
+
+    os.remove(os.path.join(tmpdir, 'bench.db'))
+    os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Query plan benchmark for the task listing indexes.
+
+Seeds a database, captures the SQL issued by get_tasks_optimized and
+get_admin_tasks_optimized for each listing query shape, then prints the query plan
+and the median execution time of every statement, first without the secondary
+indexes and then with them.
+
+Usage:
+    python benchmarks/query_plans.py [--users 50] [--tasks-per-user 2000]
+                                     [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tasks-per-user', type=int, default=2000)
+    parser.add_argument('--categories-per-user', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20, help="Executions timed per statement")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def seed(db, Personne, Categorie, Tache, args: argparse.Namespace) -> None:
+    """Insert users, categories and tasks with bulk inserts."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    db.session.execute(Personne.__table__.insert(), [
+        {'id': u, 'nom': f'user{u}', 'password': 'x', 'role': 'user'}
+        for u in range(1, args.users + 1)
+    ])
+    db.session.execute(Categorie.__table__.insert(), [
+        {'id': (u - 1) * args.categories_per_user + c, 'nom': f'cat{c}', 'couleur': '#007bff',
+         'personne_id': u}
+        for u in range(1, args.users + 1) for c in range(1, args.categories_per_user + 1)
+    ])
+
+    rows = []
+    for u in range(1, args.users + 1):
+        for _ in range(args.tasks_per_user):
+            rows.append({
+                'titre': f'Tâche {rng.randint(1, 10 ** 6)}',
+                'status': rng.choice(['pending', 'in_progress', 'completed']),
+                'priority': rng.choice(['low', 'medium', 'high']),
+                'due_date': (None if rng.random() < 0.2
+                             else now + timedelta(days=rng.randint(-30, 90))),
+                'created_at': now - timedelta(minutes=rng.randint(0, 500000)),
+                'is_deleted': rng.random() < 0.1,
+                'personne_id': u,
+                'categorie_id': ((u - 1) * args.categories_per_user
+                                 + rng.randint(1, args.categories_per_user)),
+            })
+            if len(rows) >= 10000:
+                db.session.execute(Tache.__table__.insert(), rows)
+                rows = []
+    if rows:
+        db.session.execute(Tache.__table__.insert(), rows)
+    db.session.commit()
+
+
+def capture_statements(engine, func, kwargs):
+    """Run a listing function and return the (statement, parameters) pairs it executed."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        func(**kwargs)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def explain(connection, statement: str, parameters) -> list:
+    """Return the query plan of a statement as a list of lines."""
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [row[-1] for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+    return [row[0] for row in rows]
+
+
+def time_statement(connection, statement: str, parameters, repeat: int) -> float:
+    """Return the median execution time of a statement in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        connection.exec_driver_sql(statement, parameters).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_scenarios(db, scenarios, repeat: int) -> dict:
+    """Capture, explain and time every statement of every scenario."""
+    results = {}
+    with db.engine.connect() as connection:
+        for name, func, kwargs in scenarios:
+            results[name] = []
+            for statement, parameters in capture_statements(db.engine, func, kwargs):
+                results[name].append({
+                    'statement': statement,
+                    'plan': explain(connection, statement, parameters),
+                    'ms': time_statement(connection, statement, parameters, repeat),
+                })
+            db.session.remove()
+    return results
+
+
+def analyze(db) -> None:
+    """Refresh the planner statistics."""
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql('ANALYZE')
+
+
+def main() -> None:
+    """Run the benchmark and print the plans before and after indexing."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne, Categorie, Tache
+    from taskmanager.utils import get_tasks_optimized, get_admin_tasks_optimized
+
+    scenarios = [
+        ('user: default sort', get_tasks_optimized, {'user_id': 1}),
+        ('user: status filter', get_tasks_optimized, {'user_id': 1, 'status': 'pending'}),
+        ('user: priority filter', get_tasks_optimized, {'user_id': 1, 'priority': 'high'}),
+        ('user: category filter', get_tasks_optimized, {'user_id': 1, 'category_id': 1}),
+        ('user: created_at desc', get_tasks_optimized,
+         {'user_id': 1, 'sort_by': 'created_at', 'sort_dir': 'desc'}),
+        ('admin: default sort', get_admin_tasks_optimized, {}),
+        ('admin: created_at desc', get_admin_tasks_optimized,
+         {'sort_by': 'created_at', 'sort_dir': 'desc'}),
+        ('admin: user filter', get_admin_tasks_optimized, {'user_id': 2}),
+    ]
+    for _, _, kwargs in scenarios:
+        kwargs['count_strategy'] = 'exact'
+
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        print(f"Seeding {args.users * args.tasks_per_user} tasks on {db.engine.dialect.name}...")
+        seed(db, Personne, Categorie, Tache, args)
+
+        indexes = [index for table in (Tache.__table__, Categorie.__table__)
+                   for index in table.indexes]
+        for index in indexes:
+            index.drop(bind=db.engine)
+        analyze(db)
+        before = run_scenarios(db, scenarios, args.repeat)
+
+        for index in indexes:
+            index.create(bind=db.engine)
+        analyze(db)
+        after = run_scenarios(db, scenarios, args.repeat)
+
+        db.drop_all()
+
+    for name, _, _ in scenarios:
+        print(f"\n=== {name} ===")
+        for old, new in zip(before[name], after[name]):
+            print(f"  {' '.join(old['statement'].split())[:110]}...")
+            print(f"    before: {old['ms']:8.3f} ms")
+            for line in old['plan']:
+                print(f"      {line}")
+            print(f"    after:  {new['ms']:8.3f} ms")
+            for line in new['plan']:
+                print(f"      {line}")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+Benchmark suite of the routes and listing functions, with regression checks.
+
+Seeds a database with the synthetic data of datagen.py, then runs each scenario a
+number of times: pages and API routes through the Flask test client, logged in as the
+user with the most tasks or as the admin, and the listing functions of
+taskmanager.utils called directly. Prints the p50, p95 and p99 latency and the SQL
+queries per run of each scenario.
+
+--save-baseline writes the results to a JSON file; --baseline compares them with a
+saved file and exits with status 1 when a scenario runs more queries than its
+baseline, or got slower than its baseline p95 by more than both --tolerance and
+--min-slowdown-ms. Timings only compare on the same machine with the same data options.
+
+Usage:
+    python benchmarks/suite.py [--users 100] [--categories 5] [--tasks 200] [--skew 1.1]
+        [--iterations 50] [--scenarios tasks_list,get_task_stats]
+        [--save-baseline benchmarks/baseline.json | --baseline benchmarks/baseline.json]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datagen  # noqa: E402
+
+# Paths requested by the client scenarios: (name, login as, path)
+ROUTE_SCENARIOS = (
+    ('tasks_list', 'user', '/tasks/'),
+    ('tasks_filtered', 'user', '/tasks/?status=pending&priority=high&sort_by=priority'),
+    ('tasks_search', 'user', '/tasks/?search=rapport'),
+    ('tasks_deep_page', 'user', '/tasks/?page=20'),
+    ('task_edit_form', 'user', '/tasks/editer/{task_id}'),
+    ('categories', 'user', '/categories/'),
+    ('api_tasks', 'user', '/api/v1/tasks?per_page=50'),
+    ('api_stats', 'user', '/api/v1/stats'),
+    ('admin_tasks', 'admin', '/tasks/admin/all'),
+    ('admin_tasks_by_user', 'admin', '/tasks/admin/all?sort_by=user'),
+    ('admin_tasks_filtered', 'admin', '/tasks/admin/all?status=in_progress&sort_by=priority'),
+)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    datagen.add_arguments(parser)
+    parser.add_argument('--iterations', type=int, default=50, help="Timed runs per scenario")
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed runs per scenario")
+    parser.add_argument('--scenarios', help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument('--baseline', help="JSON file of results to compare with")
+    parser.add_argument('--save-baseline', help="JSON file to write the results to")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Slowdown of the p95 over the baseline flagged as a regression")
+    parser.add_argument('--min-slowdown-ms', type=float, default=1.0,
+                        help="Smallest p95 slowdown flagged, so noise on fast scenarios is not")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Get a percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def logged_in_client(app, user_id: int):
+    """Create a test client with the session of a user."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['personne_id'] = user_id
+        # The suite runs longer than a session lasts without this
+        session['login_time'] = time.time() + 86400
+    return client
+
+
+def build_scenarios(app, summary: Dict[str, Any]) -> List[Tuple[str, Callable[[], None]]]:
+    """Build the (name, run once) scenarios on the seeded data."""
+    from taskmanager import db
+    from taskmanager.models import Tache
+    from taskmanager.utils import get_admin_tasks_optimized, get_categories_optimized, \
+        get_task_stats, get_tasks_optimized
+
+    user_id = summary['heaviest_user_id']
+    with app.app_context():
+        task_id = db.session.query(Tache.id).filter_by(personne_id=user_id, is_deleted=False) \
+            .limit(1).scalar()
+    clients = {'user': logged_in_client(app, user_id),
+               'admin': logged_in_client(app, datagen.ADMIN_ID)}
+
+    def route(login: str, path: str) -> Callable[[], None]:
+        def run() -> None:
+            response = clients[login].get(path)
+            if response.status_code != 200:
+                sys.exit(f"GET {path} answered {response.status_code}")
+        return run
+
+    def function(func: Callable, *args, **kwargs) -> Callable[[], None]:
+        def run() -> None:
+            # Each run gets a fresh session, like a request
+            with app.app_context():
+                func(*args, **kwargs)
+                db.session.remove()
+        return run
+
+    scenarios = [
+        (name, route(login, path.format(task_id=task_id)))
+        for name, login, path in ROUTE_SCENARIOS
+    ]
+    scenarios += [
+        ('get_tasks_optimized', function(get_tasks_optimized, user_id, load='rows')),
+        ('get_tasks_optimized_filtered', function(
+            get_tasks_optimized, user_id, status='pending', priority='high',
+            sort_by='priority', load='rows')),
+        ('get_tasks_optimized_full', function(get_tasks_optimized, user_id, per_page=50)),
+        ('get_admin_tasks_optimized', function(get_admin_tasks_optimized, load='rows')),
+        ('get_admin_tasks_by_user', function(
+            get_admin_tasks_optimized, sort_by='user', load='rows')),
+        ('get_task_stats', function(get_task_stats, user_id)),
+        ('get_categories_optimized', function(get_categories_optimized, user_id)),
+    ]
+    return scenarios
+
+
+def measure(engine, run: Callable[[], None], iterations: int, warmup: int) -> Dict[str, float]:
+    """Run a scenario, return its latency percentiles in milliseconds and queries per run."""
+    from sqlalchemy import event
+
+    for _ in range(warmup):
+        run()
+    queries = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        nonlocal queries
+        queries += 1
+
+    latencies = []
+    event.listen(engine, 'after_cursor_execute', count)
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            run()
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, 'after_cursor_execute', count)
+    return {
+        'p50': percentile(latencies, 0.5),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'queries': queries / iterations,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_slowdown: float) -> Dict[str, str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: The measures of each scenario
+        baseline: The saved measures of each scenario
+        tolerance: The relative p95 slowdown allowed
+        min_slowdown: The p95 slowdown in milliseconds always allowed
+
+    Returns:
+        Dictionary mapping the regressed scenarios to a description of the regression
+    """
+    regressions = {}
+    for name, result in results.items():
+        saved = baseline.get(name)
+        if saved is None:
+            continue
+        problems = []
+        if result['p95'] > max(saved['p95'] * (1 + tolerance), saved['p95'] + min_slowdown):
+            problems.append(f"p95 {saved['p95']:.2f} -> {result['p95']:.2f} ms")
+        if result['queries'] > saved['queries']:
+            problems.append(f"queries {saved['queries']:g} -> {result['queries']:g}")
+        if problems:
+            regressions[name] = ', '.join(problems)
+    return regressions
+
+
+def main() -> None:
+    """Seed the database, run the scenarios, print and compare the results."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ['RATELIMIT_ENABLED'] = 'False'
+
+    from taskmanager import create_app, db
+
+    app = create_app('testing')
+    data = {'users': args.users, 'categories': args.categories, 'tasks': args.tasks,
+            'skew': args.skew, 'seed': args.seed}
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        summary = datagen.generate(db, **data)
+        engine = db.engine
+    print(f"{len(summary['user_ids'])} users, {summary['categories']} categories, "
+          f"{summary['tasks']} tasks, {args.iterations} runs per scenario")
+
+    scenarios = build_scenarios(app, summary)
+    if args.scenarios:
+        selected = set(args.scenarios.split(','))
+        scenarios = [(name, run) for name, run in scenarios if name in selected]
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        if saved['data'] != data:
+            print(f"Warning: the baseline was measured on other data: {saved['data']}")
+        baseline = saved['results']
+
+    results = {}
+    print(f"{'scenario':<30}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+    for name, run in scenarios:
+        result = results[name] = measure(engine, run, args.iterations, args.warmup)
+        print(f"{name:<30}{result['p50']:>9.2f}{result['p95']:>9.2f}{result['p99']:>9.2f}"
+              f"{result['queries']:>9g}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'data': data, 'python': platform.python_version(),
+                       'machine': platform.node(), 'results': results}, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+    regressions = compare(results, baseline, args.tolerance, args.min_slowdown_ms)
+    for name, problem in regressions.items():
+        print(f"REGRESSION {name}: {problem}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
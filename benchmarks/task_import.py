@@ -0,0 +1,128 @@
+"""
+Benchmark of the bulk task import.
+
+Generates a CSV file of tasks spread over a few categories, then imports it first
+the way tasks.nouvelle creates tasks (one ORM object, one category lookup and one
+commit per row) on a sample, and then with importer.import_tasks on the whole file.
+Prints the throughput and the number of statements of each run.
+
+Usage:
+    python benchmarks/task_import.py [--tasks 100000] [--sample 2000]
+        [--database-url postgresql://...]
+
+Without --database-url a temporary SQLite database is used.
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, default=100000, help="Rows in the imported file")
+    parser.add_argument('--sample', type=int, default=2000, help="Rows imported the per-row way")
+    parser.add_argument('--database-url', help="Database to benchmark (default: temporary SQLite)")
+    return parser.parse_args()
+
+
+def generate_csv(tasks: int) -> str:
+    """Build a CSV file with the import columns."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['titre', 'description', 'status', 'priority', 'due_date', 'categorie'])
+    statuses = ('pending', 'in_progress', 'completed')
+    priorities = ('low', 'medium', 'high')
+    for i in range(tasks):
+        writer.writerow([f'Tâche {i}', 'Description de la tâche importée', statuses[i % 3],
+                         priorities[i % 3], '2999-01-01' if i % 2 else '', f'Catégorie {i % 20}'])
+    return output.getvalue()
+
+
+def legacy_import(db, data: str, user_id: int) -> None:
+    """Create the tasks one by one, like successive tasks.nouvelle form posts."""
+    from taskmanager.models import Categorie, Tache
+    from taskmanager.utils import save_task
+
+    for record in csv.DictReader(io.StringIO(data)):
+        categorie = Categorie.query.filter_by(personne_id=user_id, nom=record['categorie']).first()
+        if categorie is None:
+            categorie = Categorie(nom=record['categorie'], personne_id=user_id)
+            db.session.add(categorie)
+            db.session.commit()
+        tache = Tache(titre=record['titre'], description=record['description'],
+                      status=record['status'], priority=record['priority'],
+                      personne_id=user_id, categorie_id=categorie.id)
+        save_task(tache, is_new=True)
+
+
+def measure(db, func, *args) -> tuple:
+    """Run an import and return its elapsed time in seconds and its statement count."""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(1)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    db.session.remove()
+    return elapsed, len(statements)
+
+
+def main() -> None:
+    """Run the benchmark and print the results before and after."""
+    args = parse_args()
+    tmpdir = None
+    if args.database_url:
+        os.environ['TEST_DATABASE_URL'] = args.database_url
+    else:
+        tmpdir = tempfile.mkdtemp()
+        os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne
+    from taskmanager.importer import import_tasks
+
+    app = create_app('testing')
+    results = []
+    with app.app_context():
+        for name, rows, func in [
+            ('per row', args.sample, lambda data: legacy_import(db, data, 1)),
+            ('bulk', args.tasks, lambda data: import_tasks(
+                io.StringIO(data), 'csv', 1, batch_size=app.config['IMPORT_BATCH_SIZE'])),
+        ]:
+            db.drop_all()
+            db.create_all()
+            db.session.execute(Personne.__table__.insert(), [
+                {'id': 1, 'nom': 'bench', 'password': 'x', 'role': 'user'},
+            ])
+            db.session.commit()
+            elapsed, statements = measure(db, func, generate_csv(rows))
+            results.append((name, rows, elapsed, statements))
+        db.drop_all()
+
+    print(f"{'import':<10}{'rows':>10}{'seconds':>10}{'rows/s':>10}{'stmt':>10}")
+    for name, rows, elapsed, statements in results:
+        print(f"{name:<10}{rows:>10}{elapsed:>10.2f}{rows / elapsed:>10.0f}{statements:>10}")
+
+    if tmpdir:
+        os.remove(os.path.join(tmpdir, 'bench.db'))
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
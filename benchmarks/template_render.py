@@ -0,0 +1,122 @@
+"""
+Template render benchmark for the current_user context processor.
+
+Renders templates in fresh request contexts, first with the former eager context
+processor that loaded the user on every render_template call, then with the lazy
+current_user proxy, and prints the renders per second and the queries per render.
+
+Usage:
+    python benchmarks/template_render.py [--renders 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--renders', type=int, default=2000, help="Renders timed per scenario")
+    return parser.parse_args()
+
+
+def eager_current_user():
+    """The context processor as it was before the lazy proxy, for comparison."""
+    from taskmanager.user_cache import get_current_user
+
+    class UserWrapper:
+        """Wrapper class to provide Flask-Login like interface."""
+        def __init__(self, user=None):
+            self.user = user
+            self.is_authenticated = user is not None
+
+        def __getattr__(self, name):
+            if self.user is None:
+                return None
+            return getattr(self.user, name)
+
+    user = get_current_user()
+    if user:
+        return {'current_user': UserWrapper(user)}
+    return {'current_user': UserWrapper()}
+
+
+def run(app, db, render, user_id, renders: int):
+    """Return the renders per second and the queries per render of a scenario."""
+    from flask import session
+    from sqlalchemy import event
+
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        start = time.perf_counter()
+        for _ in range(renders):
+            with app.test_request_context():
+                if user_id is not None:
+                    session['personne_id'] = user_id
+                render()
+            db.session.remove()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return renders / elapsed, len(queries) / renders
+
+
+def main() -> None:
+    """Run the benchmark and print the results before and after."""
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp()
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+
+    from flask import render_template, render_template_string
+    from taskmanager import create_app, db
+    from taskmanager.models import Personne
+
+    app = create_app('testing')
+    scenarios = [
+        ('anonymous error page', lambda: render_template('errors/404.html'), False),
+        ('logged-in error page', lambda: render_template('errors/404.html'), True),
+        ('logged-in, user unused', lambda: render_template_string('{{ titre }}', titre='x'), True),
+    ]
+
+    with app.app_context():
+        db.create_all()
+        user = Personne(nom='bench', password='x')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        db.session.remove()
+
+        processors = app.template_context_processors[None]
+        index = next(i for i, p in enumerate(processors) if p.__name__ == 'inject_current_user')
+        lazy = processors[index]
+
+        print(f"{'scenario':<26}{'before':>14}{'after':>14}{'queries':>12}")
+        for name, render, logged_in in scenarios:
+            results = []
+            for processor in (eager_current_user, lazy):
+                processors[index] = processor
+                run(app, db, render, user_id if logged_in else None, 50)
+                results.append(run(app, db, render, user_id if logged_in else None, args.renders))
+            (before, before_q), (after, after_q) = results
+            print(f"{name:<26}{before:>10.0f} r/s{after:>10.0f} r/s"
+                  f"{before_q:>6.1f} -> {after_q:.1f}")
+        processors[index] = lazy
+
+        db.drop_all()
+
+    os.remove(os.path.join(tmpdir, 'bench.db'))
+    os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
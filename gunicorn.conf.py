@@ -0,0 +1,101 @@
+"""
+Gunicorn configuration of the application.
+
+Every setting can be overridden from the environment:
+    GUNICORN_BIND           Address to listen on (default 0.0.0.0:$PORT, PORT defaults to 5000)
+    GUNICORN_WORKER_CLASS   gthread (default), gevent or sync
+    WEB_CONCURRENCY         Worker processes (default 2 x CPU + 1, CPU count with gthread)
+    GUNICORN_THREADS        Threads per gthread worker (default 4)
+    GUNICORN_CONNECTIONS    Concurrent connections per gevent worker (default 1000)
+    GUNICORN_PRELOAD        Load the application before forking the workers (default true)
+    GUNICORN_TIMEOUT        Seconds before a silent worker is restarted (default 30)
+    GUNICORN_GRACEFUL_TIMEOUT  Seconds given to workers to finish on restart (default 30)
+    GUNICORN_KEEPALIVE      Seconds a keep-alive connection waits for a request (default 5)
+    GUNICORN_MAX_REQUESTS   Requests before a worker is recycled, 0 to disable (default 1000)
+    GUNICORN_MAX_REQUESTS_JITTER  Random extra requests, so workers do not all restart at once
+        (default 10% of GUNICORN_MAX_REQUESTS)
+    PROMETHEUS_MULTIPROC_DIR  Directory of the metrics files shared by the workers, emptied
+        at startup (default taskmanager-metrics in the temporary directory)
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+WORKER_CLASSES = ('gthread', 'gevent', 'sync')
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class not in WORKER_CLASSES:
+    raise RuntimeError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}")
+
+if worker_class == 'gevent':
+    # Patch before the preloaded application creates its locks and sockets, the gevent
+    # worker only patches after the fork
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Threads serve the concurrency of a gthread worker, so fewer processes are needed
+cpu_count = multiprocessing.cpu_count()
+default_workers = cpu_count if worker_class == 'gthread' else cpu_count * 2 + 1
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+threads = int(os.environ.get('GUNICORN_THREADS', 4)) if worker_class == 'gthread' else 1
+worker_connections = int(os.environ.get('GUNICORN_CONNECTIONS', 1000))
+
+# Workers forked from a preloaded master share its memory pages copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+# Each worker writes its Prometheus metrics to mmap files in this directory, so a scrape
+# answered by any worker sums them all. Set before the application imports
+# prometheus_client; files of a previous run would be counted again
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'taskmanager-metrics'))
+shutil.rmtree(metrics_dir, ignore_errors=True)
+os.makedirs(metrics_dir, exist_ok=True)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    Drop the database connections inherited from the master.
+
+    A preloaded application may have opened connections (migrations checks, CLI
+    imports); sharing their sockets between processes corrupts the protocol streams.
+    close=False leaves them open for the master and only forgets them in the worker.
+    """
+    if not server.cfg.preload_app:
+        return
+    from taskmanager import db
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Log when a worker has loaded the application and starts accepting requests."""
+    worker.log.info("Worker ready (pid: %s)", worker.pid)
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of an exited worker from the metrics."""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
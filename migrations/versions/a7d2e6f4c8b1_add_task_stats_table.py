@@ -0,0 +1,51 @@
+"""Add the materialized per-user task statistics table
+
+Revision ID: a7d2e6f4c8b1
+Revises: f1c3a8e5b2d4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e6f4c8b1'
+down_revision = 'f1c3a8e5b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_stats',
+        sa.Column('personne_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('pending', sa.Integer(), nullable=False),
+        sa.Column('in_progress', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Integer(), nullable=False),
+        sa.Column('overdue', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['personne_id'], ['personne.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('personne_id')
+    )
+
+    # Populate from the existing tasks, afterwards the rows are maintained on flush
+    op.execute(
+        "INSERT INTO task_stats "
+        "(personne_id, total, pending, in_progress, completed, overdue, updated_at) "
+        "SELECT personne.id, count(tache.id), "
+        "coalesce(sum(CASE WHEN tache.status = 'pending' THEN 1 ELSE 0 END), 0), "
+        "coalesce(sum(CASE WHEN tache.status = 'in_progress' THEN 1 ELSE 0 END), 0), "
+        "coalesce(sum(CASE WHEN tache.status = 'completed' THEN 1 ELSE 0 END), 0), "
+        "coalesce(sum(CASE WHEN tache.status != 'completed' "
+        "AND tache.due_date < CURRENT_DATE THEN 1 ELSE 0 END), 0), "
+        "CURRENT_TIMESTAMP "
+        "FROM personne LEFT OUTER JOIN tache "
+        "ON tache.personne_id = personne.id AND tache.is_deleted = false "
+        "GROUP BY personne.id"
+    )
+
+
+def downgrade():
+    op.drop_table('task_stats')
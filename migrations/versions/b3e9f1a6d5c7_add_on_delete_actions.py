@@ -0,0 +1,45 @@
+"""Add ON DELETE actions to the task and category foreign keys
+
+Revision ID: b3e9f1a6d5c7
+Revises: a7d2e6f4c8b1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9f1a6d5c7'
+down_revision = 'a7d2e6f4c8b1'
+branch_labels = None
+depends_on = None
+
+
+# (constraint, table, referred table, local column, ON DELETE action)
+FOREIGN_KEYS = [
+    ('tache_personne_id_fkey', 'tache', 'personne', 'personne_id', 'CASCADE'),
+    ('tache_categorie_id_fkey', 'tache', 'categorie', 'categorie_id', 'SET NULL'),
+    ('categorie_personne_id_fkey', 'categorie', 'personne', 'personne_id', 'CASCADE'),
+]
+
+
+def upgrade():
+    # SQLite only enforces foreign keys with PRAGMA foreign_keys, which the application
+    # does not enable, and rewriting them would mean recreating the tache table along
+    # with its expression indexes and search triggers. utils.delete_category and
+    # utils.delete_user issue the equivalent statements explicitly.
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+
+    for name, table, referred, column, ondelete in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        return
+
+    for name, table, referred, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'])
@@ -0,0 +1,31 @@
+"""Add the index for the incremental task sync
+
+Revision ID: c5f8a2d7e1b9
+Revises: b3e9f1a6d5c7
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f8a2d7e1b9'
+down_revision = 'b3e9f1a6d5c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows without updated_at would never be returned by a sync
+    op.execute(
+        "UPDATE tache SET updated_at = coalesce(created_at, CURRENT_TIMESTAMP) "
+        "WHERE updated_at IS NULL"
+    )
+
+    # Not partial: soft-deleted tasks are sent to syncing clients as tombstones
+    op.create_index('ix_tache_personne_updated_at', 'tache',
+                    ['personne_id', 'updated_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_tache_personne_updated_at', table_name='tache')
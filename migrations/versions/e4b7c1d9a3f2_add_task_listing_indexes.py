@@ -0,0 +1,61 @@
+"""Add indexes for the task listing queries
+
+Revision ID: e4b7c1d9a3f2
+Revises: d2a5f7b8e9c0
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7c1d9a3f2'
+down_revision = 'd2a5f7b8e9c0'
+branch_labels = None
+depends_on = None
+
+
+# Partial index predicate: listing queries only ever read tasks that are not soft-deleted
+ACTIVE_TASKS = {
+    'sqlite_where': sa.text('is_deleted = 0'),
+    'postgresql_where': sa.text('is_deleted = false'),
+}
+
+
+def upgrade():
+    # User task listing (get_tasks_optimized), sorted by due date with NULLs last
+    op.create_index('ix_tache_personne_due_date', 'tache',
+                    ['personne_id', sa.text('(due_date IS NULL)'), 'due_date', 'id'],
+                    **ACTIVE_TASKS)
+    op.create_index('ix_tache_personne_created_at', 'tache',
+                    ['personne_id', 'created_at', 'id'], **ACTIVE_TASKS)
+
+    # Status/priority filters and per-status statistics
+    op.create_index('ix_tache_personne_status', 'tache',
+                    ['personne_id', 'status'], **ACTIVE_TASKS)
+    op.create_index('ix_tache_personne_priority', 'tache',
+                    ['personne_id', 'priority'], **ACTIVE_TASKS)
+
+    # Admin task listing (get_admin_tasks_optimized) across all users
+    op.create_index('ix_tache_due_date', 'tache',
+                    [sa.text('(due_date IS NULL)'), 'due_date', 'id'], **ACTIVE_TASKS)
+    op.create_index('ix_tache_created_at', 'tache',
+                    ['created_at', 'id'], **ACTIVE_TASKS)
+
+    # Category filter and category deletion
+    op.create_index('ix_tache_categorie_id', 'tache', ['categorie_id'])
+
+    # Categories are always listed per user, ordered by name
+    op.create_index('ix_categorie_personne_nom', 'categorie', ['personne_id', 'nom'])
+
+
+def downgrade():
+    op.drop_index('ix_categorie_personne_nom', table_name='categorie')
+    op.drop_index('ix_tache_categorie_id', table_name='tache')
+    op.drop_index('ix_tache_created_at', table_name='tache')
+    op.drop_index('ix_tache_due_date', table_name='tache')
+    op.drop_index('ix_tache_personne_priority', table_name='tache')
+    op.drop_index('ix_tache_personne_status', table_name='tache')
+    op.drop_index('ix_tache_personne_created_at', table_name='tache')
+    op.drop_index('ix_tache_personne_due_date', table_name='tache')
@@ -0,0 +1,80 @@
+"""Add full-text search on task title and description
+
+Revision ID: f1c3a8e5b2d4
+Revises: e4b7c1d9a3f2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3a8e5b2d4'
+down_revision = 'e4b7c1d9a3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # FTS5 index over tasks that are not soft-deleted, kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE tache_fts USING fts5("
+            "titre, description, content='tache', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER tache_fts_ai AFTER INSERT ON tache "
+            "WHEN coalesce(new.is_deleted, 0) = 0 BEGIN "
+            "INSERT INTO tache_fts(rowid, titre, description) "
+            "VALUES (new.id, new.titre, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER tache_fts_ad AFTER DELETE ON tache "
+            "WHEN coalesce(old.is_deleted, 0) = 0 BEGIN "
+            "INSERT INTO tache_fts(tache_fts, rowid, titre, description) "
+            "VALUES ('delete', old.id, old.titre, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER tache_fts_au AFTER UPDATE OF titre, description, is_deleted "
+            "ON tache BEGIN "
+            "INSERT INTO tache_fts(tache_fts, rowid, titre, description) "
+            "SELECT 'delete', old.id, old.titre, old.description "
+            "WHERE coalesce(old.is_deleted, 0) = 0; "
+            "INSERT INTO tache_fts(rowid, titre, description) "
+            "SELECT new.id, new.titre, new.description "
+            "WHERE coalesce(new.is_deleted, 0) = 0; END"
+        )
+        op.execute(
+            "INSERT INTO tache_fts(rowid, titre, description) "
+            "SELECT id, titre, description FROM tache WHERE coalesce(is_deleted, 0) = 0"
+        )
+
+    elif dialect == 'postgresql':
+        # Generated tsvector column with French stemming and a partial GIN index
+        op.execute(
+            "ALTER TABLE tache ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('french', coalesce(titre, '')), 'A') || "
+            "setweight(to_tsvector('french', coalesce(description, '')), 'B')) STORED"
+        )
+        op.create_index('ix_tache_search_vector', 'tache', ['search_vector'],
+                        postgresql_using='gin',
+                        postgresql_where=sa.text('is_deleted = false'))
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS tache_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS tache_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS tache_fts_ai")
+        op.execute("DROP TABLE IF EXISTS tache_fts")
+
+    elif dialect == 'postgresql':
+        op.drop_index('ix_tache_search_vector', table_name='tache')
+        op.drop_column('tache', 'search_vector')
@@ -12,13 +12,16 @@ import os
 import time
 from datetime import datetime, timedelta
 
+# Rate limits of the routes without their own limit
+DEFAULT_LIMITS = ["200 per day", "50 per hour"]
+
 # Initialize extensions
 db = SQLAlchemy()
 csrf = CSRFProtect()
 migrate = Migrate()
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["200 per day", "50 per hour"]
+    default_limits=DEFAULT_LIMITS
 )
 talisman = Talisman()
 
@@ -131,34 +134,49 @@ def create_app(config_name='development'):
     from taskmanager.categories import categories_bp
     from taskmanager.users import users_bp
     from taskmanager.health import health_bp
-    from taskmanager.models import Personne
+    from taskmanager.api import api_bp
+    from taskmanager.user_cache import current_user_proxy
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(tasks_bp)
     app.register_blueprint(categories_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(health_bp)
+    app.register_blueprint(api_bp)
+
+    # Set up the current user cache
+    from taskmanager.user_cache import init_user_cache
+    init_user_cache(app)
+
+    # Set up the shared cache
+    from taskmanager.cache import init_cache
+    init_cache(app)
+
+    # Measure the queries, templates and total time of each request
+    from taskmanager.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    # Report the relationships lazy loaded over and over in a request
+    from taskmanager.lazy_loads import init_lazy_load_detection
+    init_lazy_load_detection(app)
+
+    # Record the Prometheus metrics and serve them before the request handling
+    from taskmanager.metrics import init_metrics
+    init_metrics(app)
+
+    # Answer the health probes before the request handling
+    from taskmanager.health import init_health
+    init_health(app)
+
+    # Register CLI commands
+    from taskmanager.commands import register_commands
+    register_commands(app)
 
     # Add context processor to make current_user available in templates
     @app.context_processor
     def inject_current_user():
-        """Make current_user available in templates."""
-        class UserWrapper:
-            """Wrapper class to provide Flask-Login like interface."""
-            def __init__(self, user=None):
-                self.user = user
-                self.is_authenticated = user is not None
-
-            def __getattr__(self, name):
-                if self.user is None:
-                    return None
-                return getattr(self.user, name)
-
-        if 'personne_id' in session:
-            user = Personne.query.get(session['personne_id'])
-            if user:
-                return {'current_user': UserWrapper(user)}
-        return {'current_user': UserWrapper()}
+        """Make current_user available in templates, loaded on first use."""
+        return {'current_user': current_user_proxy}
 
     # Import custom exceptions
     from taskmanager.exceptions import (
@@ -0,0 +1,5 @@
+from flask import Blueprint
+
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+from taskmanager.api import routes
@@ -0,0 +1,345 @@
+from flask import request, session, current_app, jsonify, url_for, stream_with_context
+from flask_wtf.csrf import generate_csrf
+from werkzeug.datastructures import MultiDict
+from taskmanager import db
+from taskmanager.models import Tache
+from taskmanager.forms import TacheForm
+from taskmanager.api import api_bp
+from taskmanager.utils import (
+    get_task_by_id,
+    verify_task_ownership,
+    populate_task_from_form,
+    save_task,
+    get_tasks_optimized,
+    get_tasks_version,
+    get_page_cursors,
+    get_changed_tasks,
+    encode_sync_watermark,
+    decode_sync_watermark,
+    serialize_task,
+    get_task_stats,
+    bulk_update_tasks,
+    count_bulk_outcomes
+)
+from taskmanager.exceptions import (
+    TaskManagerException,
+    AuthenticationError,
+    AuthorizationError,
+    ResourceNotFoundError,
+    ValidationError,
+    DatabaseError
+)
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+from datetime import datetime, timedelta
+import hashlib
+import json
+
+# Largest page size served by the API
+MAX_PER_PAGE = 100
+
+# HTTP status of each exception raised by the API views
+ERROR_STATUS = {
+    AuthenticationError: 401,
+    AuthorizationError: 403,
+    ResourceNotFoundError: 404,
+    ValidationError: 422,
+    DatabaseError: 500,
+}
+
+def api_login_required(f: Callable) -> Callable:
+    """
+    Decorator to ensure an API route is only accessible to logged-in users.
+
+    Unlike login_required, anonymous requests get a JSON 401 response instead of a
+    redirect to the login page.
+
+    Args:
+        f: The function to decorate
+
+    Returns:
+        The decorated function
+    """
+    @wraps(f)
+    def decorated_function(*args: Any, **kwargs: Any) -> Any:
+        if 'personne_id' not in session:
+            return jsonify({'error': "Authentification requise"}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+@api_bp.errorhandler(TaskManagerException)
+def handle_api_exception(e: TaskManagerException):
+    """Return API errors as JSON instead of rendering the HTML error pages."""
+    status = next((code for cls, code in ERROR_STATUS.items() if isinstance(e, cls)), 400)
+    current_app.logger.info(f"API Error ({status}): {e.message}")
+    return jsonify({'error': e.message}), status
+
+def make_etag(*parts: Any) -> str:
+    """
+    Derive an ETag value from the parts identifying a representation.
+
+    Args:
+        *parts: Values that change whenever the representation changes
+
+    Returns:
+        The ETag value (without quotes or weak prefix)
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def conditional_json(etag: str, build: Callable[[], Any]):
+    """
+    Build a JSON response validated by a weak ETag.
+
+    When the request's If-None-Match matches, a 304 is returned and build is never
+    called, so no row is loaded or serialized.
+
+    Args:
+        etag: The ETag value of the representation
+        build: Function returning the JSON-serializable body
+
+    Returns:
+        The 200 or 304 response
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag, weak=True)
+    # Clients must revalidate, the ETag makes that cheap
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _read_task_payload(task: Optional[Tache] = None) -> Dict[str, Any]:
+    """
+    Validate a JSON task payload with TacheForm.
+
+    For updates, the fields missing from the payload keep the task's current values.
+
+    Args:
+        task: The task being updated, or None for a creation
+
+    Returns:
+        The validated task data, ready for populate_task_from_form
+
+    Raises:
+        ValidationError: If the body is not a JSON object or the data is invalid
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        raise ValidationError("Le corps de la requête doit être un objet JSON")
+
+    if task is None:
+        data = {'status': 'pending', 'priority': 'medium'}
+    else:
+        data = {
+            'titre': task.titre,
+            'description': task.description,
+            'status': task.status,
+            'priority': task.priority,
+            'categorie_id': task.categorie_id or 0,
+        }
+    data.update(payload)
+    if data.get('categorie_id') is None:
+        data['categorie_id'] = 0
+
+    formdata = MultiDict({key: str(value) for key, value in data.items() if value is not None})
+    form = TacheForm(formdata=formdata, meta={'csrf': False})
+    if not form.validate():
+        raise ValidationError('; '.join(
+            f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+        ))
+
+    # An unchanged due date is not re-validated, it may be in the past by now
+    due_date = form.due_date.data
+    if task is not None and 'due_date' not in payload:
+        due_date = task.due_date
+    return {
+        'titre': form.titre.data,
+        'description': form.description.data,
+        'status': form.status.data,
+        'priority': form.priority.data,
+        'due_date': due_date,
+        'categorie_id': form.categorie_id.data
+    }
+
+def _get_own_task(tache_id: int) -> Tache:
+    """Get a task of the current user, soft-deleted tasks are not found."""
+    tache = get_task_by_id(tache_id)
+    if tache.is_deleted:
+        raise ResourceNotFoundError("Tâche", tache_id)
+    verify_task_ownership(tache)
+    return tache
+
+@api_bp.route('/csrf-token')
+@api_login_required
+def csrf_token():
+    """API route returning the CSRF token to send in the X-CSRFToken header."""
+    return jsonify({'csrf_token': generate_csrf()})
+
+@api_bp.route('/tasks')
+@api_login_required
+def list_tasks():
+    """API route listing the current user's tasks, with the same filters as tasks.liste."""
+    personne_id = session['personne_id']
+
+    # Get pagination parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = max(1, min(request.args.get('per_page', 10, type=int), MAX_PER_PAGE))
+    cursor = request.args.get('cursor')
+
+    # Get filter parameters
+    filters = {
+        'status': request.args.get('status'),
+        'priority': request.args.get('priority'),
+        'category_id': request.args.get('category_id', type=int),
+        'search_term': request.args.get('search', '').strip() or None
+    }
+
+    # Get sort parameters
+    sort_by = request.args.get('sort_by', 'due_date')
+    sort_dir = request.args.get('sort_dir', 'asc')
+
+    latest, count = get_tasks_version(user_id=personne_id, **filters)
+    etag = make_etag(personne_id, sorted(request.args.items(multi=True)), latest, count)
+
+    def build() -> Dict[str, Any]:
+        taches, total_count, total_pages = get_tasks_optimized(
+            user_id=personne_id,
+            page=page,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            cursor=cursor,
+            count_strategy=current_app.config['TASK_COUNT_STRATEGY'],
+            **filters
+        )
+        prev_cursor, next_cursor = get_page_cursors(taches, sort_by, sort_dir)
+        return {
+            'tasks': [serialize_task(tache) for tache in taches],
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'prev_cursor': prev_cursor,
+                'next_cursor': next_cursor
+            }
+        }
+
+    return conditional_json(etag, build)
+
+@api_bp.route('/stats')
+@api_login_required
+def task_stats():
+    """API route returning the task statistics of the current user."""
+    return jsonify(get_task_stats(session['personne_id']))
+
+@api_bp.route('/tasks/<int:tache_id>')
+@api_login_required
+def get_task(tache_id: int):
+    """API route returning one task of the current user."""
+    tache = _get_own_task(tache_id)
+    etag = make_etag(tache.id, tache.updated_at)
+    return conditional_json(etag, lambda: serialize_task(tache))
+
+@api_bp.route('/tasks', methods=['POST'])
+@api_login_required
+def create_task():
+    """API route creating a task for the current user."""
+    tache = Tache(personne_id=session['personne_id'])
+    populate_task_from_form(tache, _read_task_payload())
+    save_task(tache, is_new=True)
+    current_app.logger.info(f"Nouvelle tâche créée via l'API: {tache.titre}")
+
+    response = jsonify(serialize_task(tache))
+    response.status_code = 201
+    response.headers['Location'] = url_for('api.get_task', tache_id=tache.id)
+    response.set_etag(make_etag(tache.id, tache.updated_at), weak=True)
+    return response
+
+@api_bp.route('/tasks/<int:tache_id>', methods=['PUT', 'PATCH'])
+@api_login_required
+def update_task(tache_id: int):
+    """API route updating a task of the current user, missing fields are left unchanged."""
+    tache = _get_own_task(tache_id)
+    populate_task_from_form(tache, _read_task_payload(tache))
+    tache.updated_at = datetime.utcnow()
+    save_task(tache)
+    current_app.logger.info(f"Tâche mise à jour via l'API: {tache.titre}")
+
+    response = jsonify(serialize_task(tache))
+    response.set_etag(make_etag(tache.id, tache.updated_at), weak=True)
+    return response
+
+@api_bp.route('/tasks/bulk', methods=['POST'])
+@api_login_required
+def bulk_tasks():
+    """API route changing the status, deleting or re-categorizing many tasks at once."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValidationError("Le corps de la requête doit être un objet JSON")
+    try:
+        task_ids = [int(task_id) for task_id in data.get('ids') or []]
+    except (TypeError, ValueError):
+        raise ValidationError("Identifiants de tâches invalides")
+
+    outcomes = bulk_update_tasks(task_ids, data.get('action'), data.get('value'),
+                                 user_id=session['personne_id'])
+    return jsonify({
+        'action': data.get('action'),
+        'results': {str(task_id): outcome for task_id, outcome in outcomes.items()},
+        **count_bulk_outcomes(outcomes)
+    })
+
+@api_bp.route('/tasks/sync')
+@api_login_required
+def sync_tasks():
+    """
+    API route streaming the tasks changed since a watermark.
+
+    The response lists the tasks created, updated or soft-deleted (is_deleted true)
+    after the `since` watermark, fetched in batches of SYNC_BATCH_SIZE and written as
+    they are read. The returned watermark is sent as `since` on the next call;
+    has_more is true when SYNC_MAX_ROWS was reached and the client should call again
+    right away.
+    """
+    personne_id = session['personne_id']
+    since = request.args.get('since')
+    watermark = decode_sync_watermark(since) if since else None
+
+    batch_size = current_app.config['SYNC_BATCH_SIZE']
+    max_rows = current_app.config['SYNC_MAX_ROWS']
+    # Changes younger than the lag may belong to transactions that have not committed
+    # yet with an earlier updated_at, they are sent on the next call
+    until = datetime.utcnow() - timedelta(seconds=current_app.config['SYNC_SAFETY_LAG'])
+
+    def generate() -> Iterator[str]:
+        position = watermark
+        next_watermark = since
+        sent = 0
+        separator = ''
+        yield '{"tasks":['
+        while sent < max_rows:
+            taches = get_changed_tasks(personne_id, position,
+                                       min(batch_size, max_rows - sent), until)
+            for tache in taches:
+                yield separator + json.dumps(serialize_task(tache), separators=(',', ':'))
+                separator = ','
+            if not taches:
+                break
+            sent += len(taches)
+            position = (taches[-1].updated_at, taches[-1].id)
+            next_watermark = encode_sync_watermark(taches[-1])
+            # Drop the batch from the session so memory stays flat
+            for tache in taches:
+                db.session.expunge(tache)
+            if len(taches) < batch_size:
+                break
+        has_more = sent >= max_rows
+        yield '],"watermark":{},"has_more":{}}}'.format(json.dumps(next_watermark),
+                                                        json.dumps(has_more))
+
+    response = current_app.response_class(stream_with_context(generate()),
+                                          mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
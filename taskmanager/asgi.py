@@ -0,0 +1,265 @@
+"""
+ASGI entry point of the application.
+
+The read-heavy JSON API routes (task listing, one task, statistics) are served by
+coroutines on AsyncTaskService, so a worker keeps serving requests while their queries
+wait on the database. Every other request is passed to the Flask application through
+asgiref's WSGI adapter, which runs it in a thread.
+
+The async routes count against the same Flask-Limiter budget as the Flask routes they
+replace: the same storage, key and endpoint scope. They answer without the Flask
+response pipeline though: no Talisman headers besides X-Content-Type-Options (they
+only serve JSON), no Server-Timing header and no Prometheus request metrics.
+
+Run it with an ASGI server, e.g.:
+    uvicorn asgi:app --workers 4
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi
+from flask import Flask
+from itsdangerous import BadSignature
+from limits import parse
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.http import parse_cookie, parse_etags
+from taskmanager import create_app, limiter, DEFAULT_LIMITS
+from taskmanager.api.routes import ERROR_STATUS, MAX_PER_PAGE, make_etag
+from taskmanager.async_service import AsyncTaskService
+from taskmanager.exceptions import TaskManagerException
+from taskmanager.utils import get_page_cursors, serialize_task
+
+# The result of a route: status, JSON body (None for a 304) and ETag value (or None)
+RouteResult = Tuple[int, Any, Optional[str]]
+
+
+class TaskManagerASGI:
+    """
+    ASGI application serving the async API routes and delegating the rest to Flask.
+
+    The async routes answer like their Flask counterparts in taskmanager.api.routes,
+    ETags included. They read the Flask session cookie but never write it: the
+    periodic session regeneration of validate_session happens on the next request
+    served by Flask.
+    """
+
+    def __init__(self, app: Flask, service: Optional[AsyncTaskService] = None):
+        self.app = app
+        self.service = service or AsyncTaskService.from_app(app)
+        self.wsgi = WsgiToAsgi(app)
+        # Checked in the order of Flask-Limiter, which stops at the first breached limit
+        self.limits = sorted(parse(limit) for limit in DEFAULT_LIMITS)
+        # (path, Flask endpoint the route replaces, coroutine)
+        self.routes: List[Tuple[re.Pattern, str, Callable[..., Awaitable[RouteResult]]]] = [
+            (re.compile(r'/api/v1/tasks'), 'api.list_tasks', self.list_tasks),
+            (re.compile(r'/api/v1/tasks/(\d+)'), 'api.get_task', self.get_task),
+            (re.compile(r'/api/v1/stats'), 'api.task_stats', self.task_stats),
+        ]
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """Dispatch an ASGI connection."""
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            for pattern, endpoint, route in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    await self.handle(scope, send, endpoint, route, *map(int, match.groups()))
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive: Callable, send: Callable) -> None:
+        """Close the async connection pool when the server shuts down."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.service.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def get_user_id(self, headers: Headers) -> Optional[int]:
+        """
+        Get the logged-in user of a request from the Flask session cookie.
+
+        Args:
+            headers: The request headers
+
+        Returns:
+            The user ID, or None if the session is missing, invalid or expired
+        """
+        cookies = parse_cookie(headers.get('Cookie', ''))
+        cookie = cookies.get(self.app.config['SESSION_COOKIE_NAME'])
+        if not cookie:
+            return None
+        serializer = self.app.session_interface.get_signing_serializer(self.app)
+        lifetime = int(self.app.permanent_session_lifetime.total_seconds())
+        try:
+            data = serializer.loads(cookie, max_age=lifetime)
+        except BadSignature:
+            return None
+
+        login_time = data.get('login_time')
+        if login_time and datetime.utcnow().timestamp() - login_time > \
+                self.app.config.get('PERMANENT_SESSION_LIFETIME', 1800):
+            return None
+        return data.get('personne_id')
+
+    def is_rate_limited(self, scope: Dict[str, Any], endpoint: str) -> bool:
+        """
+        Count a request against the default rate limits of its client address.
+
+        Args:
+            scope: The ASGI connection scope
+            endpoint: The Flask endpoint whose limits apply
+
+        Returns:
+            True if a limit is exceeded
+        """
+        if not self.app.config.get('RATELIMIT_ENABLED', True):
+            return False
+        address = scope['client'][0] if scope.get('client') else '127.0.0.1'
+        # The arguments of Flask-Limiter's keys for the default limits of an endpoint
+        args = [address, endpoint]
+        key_prefix = self.app.config.get('RATELIMIT_KEY_PREFIX')
+        if key_prefix:
+            args.insert(0, key_prefix)
+        return not all(limiter.limiter.hit(limit, *args) for limit in self.limits)
+
+    def check_request(self, scope: Dict[str, Any], headers: Headers,
+                      endpoint: str) -> Tuple[Optional[int], bool]:
+        """
+        Get the user of a request and count it against the rate limits.
+
+        Both may block on the session serializer and the rate limit storage, so
+        handle() runs this in a thread.
+
+        Returns:
+            The user ID (or None) and whether a rate limit is exceeded
+        """
+        with self.app.app_context():
+            return self.get_user_id(headers), self.is_rate_limited(scope, endpoint)
+
+    async def handle(self, scope: Dict[str, Any], send: Callable, endpoint: str,
+                     route: Callable, *args: int) -> None:
+        """Run an async route and send its JSON response."""
+        headers = Headers([(k.decode('latin-1'), v.decode('latin-1'))
+                           for k, v in scope['headers']])
+        query = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'),
+                                    keep_blank_values=True))
+        etag = None
+        try:
+            user_id, rate_limited = await sync_to_async(
+                self.check_request, thread_sensitive=False)(scope, headers, endpoint)
+            if rate_limited:
+                status, body = 429, {'error': "Trop de requêtes"}
+            elif user_id is None:
+                status, body = 401, {'error': "Authentification requise"}
+            else:
+                # The service reads the search backend and settings of the application
+                with self.app.app_context():
+                    status, body, etag = await route(user_id, query, headers, *args)
+        except TaskManagerException as e:
+            status = next(
+                (code for cls, code in ERROR_STATUS.items() if isinstance(e, cls)), 400)
+            self.app.logger.info(f"API Error ({status}): {e.message}")
+            body = {'error': e.message}
+        except Exception:
+            self.app.logger.exception(f"Server Error: {scope['path']}")
+            status, body = 500, {'error': "Erreur interne du serveur"}
+
+        response_headers = [(b'vary', b'Cookie'), (b'x-content-type-options', b'nosniff')]
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            response_headers.append((b'content-type', b'application/json'))
+        response_headers.append((b'content-length', str(len(payload)).encode('ascii')))
+        if etag is not None:
+            response_headers.append((b'etag', f'W/"{etag}"'.encode('ascii')))
+            # Clients must revalidate, the ETag makes that cheap
+            response_headers.append((b'cache-control', b'private, no-cache'))
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+        await send({'type': 'http.response.body',
+                    'body': payload if scope['method'] != 'HEAD' else b''})
+
+    async def list_tasks(self, user_id: int, query: MultiDict, headers: Headers) -> RouteResult:
+        """Async counterpart of api.list_tasks."""
+        # Get pagination parameters
+        page = query.get('page', 1, type=int)
+        per_page = max(1, min(query.get('per_page', 10, type=int), MAX_PER_PAGE))
+        cursor = query.get('cursor')
+
+        # Get filter parameters
+        filters = {
+            'status': query.get('status'),
+            'priority': query.get('priority'),
+            'category_id': query.get('category_id', type=int),
+            'search_term': query.get('search', '').strip() or None
+        }
+
+        # Get sort parameters
+        sort_by = query.get('sort_by', 'due_date')
+        sort_dir = query.get('sort_dir', 'asc')
+
+        latest, count = await self.service.get_tasks_version(user_id, **filters)
+        etag = make_etag(user_id, sorted(query.items(multi=True)), latest, count)
+        if parse_etags(headers.get('If-None-Match')).contains_weak(etag):
+            return 304, None, etag
+
+        taches, total_count, total_pages = await self.service.list_tasks(
+            user_id,
+            page=page,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            cursor=cursor,
+            count_strategy=self.app.config['TASK_COUNT_STRATEGY'],
+            **filters
+        )
+        prev_cursor, next_cursor = get_page_cursors(taches, sort_by, sort_dir)
+        return 200, {
+            'tasks': [serialize_task(tache) for tache in taches],
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'prev_cursor': prev_cursor,
+                'next_cursor': next_cursor
+            }
+        }, etag
+
+    async def get_task(self, user_id: int, query: MultiDict, headers: Headers,
+                       tache_id: int) -> RouteResult:
+        """Async counterpart of api.get_task."""
+        tache = await self.service.get_task(user_id, tache_id)
+        etag = make_etag(tache.id, tache.updated_at)
+        if parse_etags(headers.get('If-None-Match')).contains_weak(etag):
+            return 304, None, etag
+        return 200, serialize_task(tache), etag
+
+    async def task_stats(self, user_id: int, query: MultiDict, headers: Headers) -> RouteResult:
+        """Async counterpart of api.task_stats."""
+        return 200, await self.service.get_task_stats(user_id), None
+
+
+def create_asgi_app(config_name: str = 'development') -> TaskManagerASGI:
+    """
+    Create the ASGI application.
+
+    Args:
+        config_name: The configuration to use (development, testing, production)
+
+    Returns:
+        The ASGI application
+    """
+    return TaskManagerASGI(create_app(config_name))
@@ -0,0 +1,223 @@
+"""
+Async read service for the task listing, statistics and JSON API.
+
+The queries are the ones of the synchronous listing functions (same filters, sort keys
+and cursors), run on SQLAlchemy's asyncio extension so a worker waiting on the database
+keeps serving other requests. Requires an asyncio driver: aiosqlite for SQLite,
+asyncpg for PostgreSQL.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from flask import Flask
+from sqlalchemy import asc, desc, func, select
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from taskmanager import db
+from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError, ValidationError
+from taskmanager.models import Tache, TaskStats
+from taskmanager.stats import compute_user_task_stats
+from taskmanager.utils import filter_tasks, decode_cursor, _get_sort_keys, _keyset_condition
+
+# The asyncio driver used for each database backend
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def async_database_url(url: Union[str, URL]) -> str:
+    """
+    Get the asyncio driver URL of a database URL.
+
+    Args:
+        url: The synchronous database URL (a URL naming an asyncio driver is kept)
+
+    Returns:
+        The database URL with the asyncio driver of its backend
+
+    Raises:
+        ValueError: If there is no asyncio driver for the backend
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver for database: {backend}")
+    if url.get_driver_name() not in ASYNC_DRIVERS.values():
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url.render_as_string(hide_password=False)
+
+
+class AsyncTaskService:
+    """
+    Read-only task queries on an async engine.
+
+    The methods use the search backend and settings of the current application, so
+    they must be awaited within an application context.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    @classmethod
+    def from_app(cls, app: Flask) -> 'AsyncTaskService':
+        """
+        Create the service of an application.
+
+        The engine uses ASYNC_DATABASE_URL, or the application's database with the
+        asyncio driver of its backend, and the same pool settings.
+
+        Args:
+            app: The Flask application
+
+        Returns:
+            The service
+        """
+        with app.app_context():
+            # The engine URL has relative SQLite paths resolved against the instance folder
+            url = app.config.get('ASYNC_DATABASE_URL') or async_database_url(db.engine.url)
+        options = {}
+        if make_url(url).get_backend_name() != 'sqlite':
+            options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        return cls(create_async_engine(url, **options))
+
+    async def dispose(self) -> None:
+        """Close the connections of the pool."""
+        await self.engine.dispose()
+
+    async def get_tasks_version(
+        self,
+        user_id: int,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        category_id: Optional[int] = None,
+        search_term: Optional[str] = None
+    ) -> Tuple[Optional[datetime], int]:
+        """
+        Get the version of a user's tasks matching the listing filters.
+
+        See utils.get_tasks_version.
+
+        Returns:
+            Tuple containing the latest updated_at (None without tasks) and the count
+        """
+        statement, _ = filter_tasks(
+            select(func.max(Tache.updated_at), func.count(Tache.id)),
+            status, priority, user_id, category_id, search_term
+        )
+        async with self.sessionmaker() as session:
+            latest, count = (await session.execute(statement)).one()
+        return latest, count
+
+    async def list_tasks(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        category_id: Optional[int] = None,
+        search_term: Optional[str] = None,
+        sort_by: str = 'due_date',
+        sort_dir: str = 'asc',
+        cursor: Optional[str] = None,
+        count_strategy: str = 'exact'
+    ) -> Tuple[List[Tache], Optional[int], int]:
+        """
+        Get a page of a user's tasks, see utils.get_tasks_optimized.
+
+        The tasks are loaded whole and detached from their session: their columns can be
+        read, their relationships cannot.
+
+        Args:
+            count_strategy: probe skips the count and fetches one extra row to detect a
+                next page, any other strategy counts exactly (the count cache and the
+                planner estimates are synchronous)
+
+        Returns:
+            Tuple containing the tasks of the page, the total count (None with the
+            probe strategy) and the total number of pages
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        statement, rank = filter_tasks(select(Tache), status, priority, user_id,
+                                       category_id, search_term)
+        sort_keys = _get_sort_keys(sort_by, sort_dir, rank=rank)
+        probe = count_strategy == 'probe'
+
+        backward = False
+        page_statement = statement
+        if cursor:
+            values, backward = decode_cursor(cursor, sort_by, sort_dir)
+            if len(values) != len(sort_keys):
+                raise ValidationError("Curseur de pagination invalide")
+            page_statement = page_statement.where(_keyset_condition(sort_keys, values, backward))
+        else:
+            page_statement = page_statement.offset((page - 1) * per_page)
+        page_statement = page_statement.order_by(*[
+            desc(expression) if descending != backward else asc(expression)
+            for expression, descending, _ in sort_keys
+        ]).limit(per_page + 1 if probe else per_page)
+
+        async with self.sessionmaker() as session:
+            total_count = None
+            if not probe:
+                total_count = await session.scalar(
+                    select(func.count()).select_from(statement.subquery())
+                )
+            tasks = list((await session.scalars(page_statement)).all())
+
+        has_more = len(tasks) > per_page
+        tasks = tasks[:per_page]
+        if backward:
+            tasks.reverse()
+
+        if total_count is None:
+            total_pages = page + 1 if has_more or backward else page
+        else:
+            total_pages = (total_count + per_page - 1) // per_page
+        return tasks, total_count, total_pages
+
+    async def get_task(self, user_id: int, tache_id: int) -> Tache:
+        """
+        Get a task of a user, soft-deleted tasks are not found.
+
+        Args:
+            user_id: The ID of the user
+            tache_id: The ID of the task
+
+        Returns:
+            The task, detached from its session
+
+        Raises:
+            ResourceNotFoundError: If the task does not exist or is deleted
+            AuthorizationError: If the task belongs to another user
+        """
+        async with self.sessionmaker() as session:
+            tache = await session.get(Tache, tache_id)
+        if tache is None or tache.is_deleted:
+            raise ResourceNotFoundError("Tâche", tache_id)
+        if tache.personne_id != user_id:
+            raise AuthorizationError("Vous n'êtes pas autorisé à accéder à cette tâche")
+        return tache
+
+    async def get_task_stats(self, user_id: int) -> Dict[str, Any]:
+        """
+        Get the statistics of a user, see stats.get_user_task_stats.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Dictionary with total, pending, in_progress, completed and overdue counts
+        """
+        async with self.sessionmaker() as session:
+            stats = await session.get(TaskStats, user_id)
+            if stats is None:
+                return await session.run_sync(
+                    lambda sync_session: compute_user_task_stats(sync_session, user_id))
+        return stats.to_dict()
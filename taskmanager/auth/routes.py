@@ -5,6 +5,7 @@ from taskmanager.models import Personne, UserRole
 from taskmanager.forms import EnregistreForm, ConnexionForm
 from taskmanager.auth import auth_bp
 from taskmanager.session_utils import regenerate_session
+from taskmanager.user_cache import get_current_user
 from functools import wraps
 from typing import Callable, Any, List, Dict, Union
 from datetime import datetime
@@ -48,7 +49,7 @@ def admin_required(f: Callable) -> Callable:
             return redirect(url_for('auth.connexion'))
 
         # Then check if user is admin
-        personne = Personne.query.get(session['personne_id'])
+        personne = get_current_user()
         if not personne or not personne.is_admin:
             current_app.logger.warning(
                 f"Tentative d'accès à une page admin par l'utilisateur {personne.nom if personne else 'inconnu'}"
@@ -125,7 +126,9 @@ def connexion():
 def deconnecter():
     """Route for user logout."""
     if 'personne_id' in session:
-        current_app.logger.info(f"Utilisateur déconnecté: {Personne.query.get(session['personne_id']).nom}")
+        personne = get_current_user()
+        nom = personne.nom if personne else 'inconnu'
+        current_app.logger.info(f"Utilisateur déconnecté: {nom}")
     session.pop('personne_id', None)
     flash("Vous avez été déconnecté.", "info")
     return redirect(url_for('auth.connexion'))
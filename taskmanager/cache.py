@@ -0,0 +1,535 @@
+"""Shared cache with tag-based invalidation and stampede protection."""
+
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from taskmanager.models import Categorie, Personne, Tache
+
+_MISSING = object()
+
+# Tables whose writes invalidate cache tags
+TRACKED_TABLES = ('tache', 'categorie', 'personne')
+
+
+class CacheBackend:
+    """
+    Storage of a cache: byte values with an optional time-to-live.
+
+    Every backend implements the same small set of operations, the subset of Redis
+    commands the Cache needs, so they can be swapped through CACHE_BACKEND.
+    """
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get the values of several keys, None for the missing or expired ones."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """Store a value, ttl is in seconds (None to keep it until evicted)."""
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """Store a value only if the key does not exist, return whether it was stored."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer value (missing keys start at 0)."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every key of the cache."""
+        raise NotImplementedError
+
+
+class LocalBackend(CacheBackend):
+    """In-process LRU backend, private to each worker."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, Tuple[bytes, Optional[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._get(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._get(key) or 0) + 1
+            self._set(key, str(value).encode(), None)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FileBackend(CacheBackend):
+    """
+    Backend storing one file per key, shared by the workers of a host.
+
+    The default directory is under /dev/shm when it exists, so the files live in
+    shared memory. Writes go through a temporary file and an atomic rename, add
+    relies on O_EXCL and incr on an flock, so concurrent workers never see partial
+    values. Expired files are removed when they are read.
+    """
+
+    _header = struct.Struct('!d')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _encode(self, value: bytes, ttl: Optional[int]) -> bytes:
+        return self._header.pack(time.time() + ttl if ttl else 0) + value
+
+    def _read(self, path: str) -> Optional[bytes]:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < self._header.size:
+            # Created by add but not written yet
+            return None
+        expires_at, = self._header.unpack_from(data)
+        if expires_at and expires_at < time.time():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            return None
+        return data[self._header.size:]
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._read(self._path(key)) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self._encode(value, ttl))
+        os.replace(tmp_path, self._path(key))
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        path = self._path(key)
+        # Drop an expired entry first so that it does not block the creation
+        self._read(path)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self._encode(value, ttl))
+        return True
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def incr(self, key: str) -> int:
+        import fcntl
+
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            value = int(self._read(self._path(key)) or 0) + 1
+            self.set(key, str(value).encode())
+            return value
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name != '.lock':
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol through a redis-py compatible client.
+
+    Any object with the redis-py get/set/delete/incr/mget/scan_iter methods can be
+    used as the client, such as a fakeredis instance in tests.
+    """
+
+    def __init__(self, client: Any, namespace: str):
+        self.client = client
+        self.namespace = namespace
+
+    @classmethod
+    def from_url(cls, url: str, namespace: str) -> 'RedisBackend':
+        """
+        Connect to a Redis server.
+
+        Args:
+            url: The server URL (redis://host:port/db)
+            namespace: The prefix of the cache keys, used by clear
+
+        Returns:
+            The backend
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("CACHE_BACKEND=redis requires the redis package (pip install redis)")
+        return cls(redis.Redis.from_url(url), namespace)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return self.client.mget(keys)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.client.set(key, value, ex=ttl or None)
+
+    def add(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        return bool(self.client.set(key, value, ex=ttl or None, nx=True))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=f"{self.namespace}:*"):
+            self.client.delete(key)
+
+
+class Cache:
+    """
+    Namespaced cache of picklable values on top of a backend.
+
+    Entries can be tagged. Each tag has a version counter in the backend, and an entry
+    records the versions of its tags when it is computed: invalidating a tag bumps its
+    version, which makes every entry carrying it stale without having to find them.
+
+    get_or_set protects against stampedes: on a miss only one thread per process, and
+    one process per backend (through a lock key), computes the value while the others
+    wait for it.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str = 'taskmanager',
+        default_ttl: int = 300,
+        lock_timeout: int = 10
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _record(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[counter] += amount
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """
+        Get the current version of tags.
+
+        Args:
+            tags: The tags
+
+        Returns:
+            Dictionary mapping each tag to its version, 0 if it was never invalidated
+        """
+        tags = sorted(set(tags))
+        if not tags:
+            return {}
+        values = self.backend.get_many([self._tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: The key, without the namespace
+            default: The value returned on a miss
+
+        Returns:
+            The value, or default if it is missing, expired or one of its tags was
+            invalidated since it was stored
+        """
+        data = self.backend.get_many([self._key(key)])[0]
+        if data is not None:
+            value, versions = pickle.loads(data)
+            if self.tag_versions(versions) == versions:
+                self._record('hits')
+                return value
+        self._record('misses')
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = (),
+            tag_versions: Optional[Dict[str, int]] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: The key, without the namespace
+            value: The picklable value
+            ttl: Seconds before the entry expires (default: the cache's default TTL)
+            tags: The tags invalidating the entry
+            tag_versions: The tag versions read before the value was computed, so that an
+                invalidation during the computation is not missed
+        """
+        if tag_versions is None:
+            tag_versions = self.tag_versions(tags)
+        data = pickle.dumps((value, tag_versions), pickle.HIGHEST_PROTOCOL)
+        self.backend.set(self._key(key), data, ttl or self.default_ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        self.backend.delete(self._key(key))
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Make every entry carrying one of the tags stale."""
+        tags = set(tags)
+        for tag in tags:
+            self.backend.incr(self._tag_key(tag))
+        self._record('invalidations', len(tags))
+
+    def clear(self) -> None:
+        """Remove every entry and tag version."""
+        self.backend.clear()
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._key_locks_lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl: Optional[int] = None,
+                   tags: Iterable[str] = ()) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss.
+
+        Args:
+            key: The key, without the namespace
+            compute: Function returning the value
+            ttl: Seconds before the entry expires (default: the cache's default TTL)
+            tags: The tags invalidating the entry
+
+        Returns:
+            The cached or computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._key_lock(key):
+            # Another thread may have computed it while this one waited
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            lock_key = self._key(f"lock:{key}")
+            deadline = time.monotonic() + self.lock_timeout
+            acquired = self.backend.add(lock_key, b'1', self.lock_timeout)
+            # Another process is computing it: wait for its result, but compute it as
+            # well if that takes longer than the lock timeout
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                acquired = self.backend.add(lock_key, b'1', self.lock_timeout)
+
+            try:
+                tag_versions = self.tag_versions(tags)
+                value = compute()
+                self.set(key, value, ttl, tag_versions=tag_versions)
+                return value
+            finally:
+                if acquired:
+                    self.backend.delete(lock_key)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get a copy of the hit, miss and invalidation counters."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+def table_tags(table: str, user_id: Optional[int] = None) -> Tuple[str, ...]:
+    """
+    Get the tags of a cache entry built from a table.
+
+    Set-based statements invalidate the table tag. Writes through the ORM invalidate
+    the per-user tag of the rows' owner and the "any" tag of the table, so an entry
+    built from one user's rows survives the writes of other users, while an entry
+    built from every row does not.
+
+    Args:
+        table: The table name (tache, categorie or personne)
+        user_id: The user whose rows the entry is built from, or None for all users
+
+    Returns:
+        The tags of the entry
+    """
+    if user_id is None:
+        return (table, f"{table}:any")
+    return (table, f"{table}:user:{user_id}")
+
+
+def create_backend(app: Flask) -> CacheBackend:
+    """
+    Create the backend configured by CACHE_BACKEND.
+
+    Args:
+        app: The Flask application
+
+    Returns:
+        The cache backend (local, file or redis)
+
+    Raises:
+        ValueError: If CACHE_BACKEND is not a known backend
+    """
+    name = app.config.get('CACHE_BACKEND', 'local')
+    namespace = app.config.get('CACHE_NAMESPACE', 'taskmanager')
+    if name == 'local':
+        return LocalBackend(app.config.get('CACHE_MAX_SIZE', 1024))
+    if name == 'file':
+        directory = app.config.get('CACHE_DIR') or os.path.join(
+            '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+            f"{namespace}-cache"
+        )
+        return FileBackend(directory)
+    if name == 'redis':
+        return RedisBackend.from_url(
+            app.config.get('CACHE_URL', 'redis://localhost:6379/0'), namespace)
+    raise ValueError(f"Unknown CACHE_BACKEND: {name}")
+
+
+def get_cache() -> Cache:
+    """
+    Get the cache of the current application.
+
+    Returns:
+        The cache
+    """
+    return current_app.extensions['cache']
+
+
+def init_cache(app: Flask) -> None:
+    """
+    Set up the cache for an application.
+
+    Args:
+        app: The Flask application
+    """
+    app.extensions['cache'] = Cache(
+        create_backend(app),
+        namespace=app.config.get('CACHE_NAMESPACE', 'taskmanager'),
+        default_ttl=app.config.get('CACHE_DEFAULT_TTL', 300),
+        lock_timeout=app.config.get('CACHE_LOCK_TIMEOUT', 10)
+    )
+
+
+def _pending_tags(session: Session) -> set:
+    return session.info.setdefault('cache_tags', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tags(session: Session, flush_context) -> None:
+    """Record the tags of the flushed tasks, categories and users."""
+    tags = _pending_tags(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Tache, Categorie)):
+            table = obj.__tablename__
+            tags.update((f"{table}:any", f"{table}:user:{obj.personne_id}"))
+            # A task or category moved to another user changes both users' data
+            for previous in inspect(obj).attrs.personne_id.history.deleted:
+                tags.add(f"{table}:user:{previous}")
+        elif isinstance(obj, Personne):
+            tags.update(('personne:any', f"personne:user:{obj.id}"))
+            if obj in session.deleted:
+                # The database deletes the user's tasks and categories along with it
+                tags.update(('tache:any', f"tache:user:{obj.id}",
+                             'categorie:any', f"categorie:user:{obj.id}"))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_statement_tags(orm_execute_state) -> None:
+    """Record the table tag of INSERT, UPDATE and DELETE statements run by the session."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and table.name in TRACKED_TABLES:
+        _pending_tags(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_tags(session: Session) -> None:
+    """Invalidate the recorded tags once the changes are visible to other connections."""
+    tags = session.info.pop('cache_tags', None)
+    if tags and has_app_context() and 'cache' in current_app.extensions:
+        get_cache().invalidate_tags(*tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_tags(session: Session) -> None:
+    """Forget the tags of changes that were rolled back."""
+    session.info.pop('cache_tags', None)
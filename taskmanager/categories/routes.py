@@ -1,10 +1,11 @@
-from flask import render_template, redirect, url_for, session, request, current_app
-from taskmanager import db
+from flask import render_template, redirect, url_for, session, request, current_app, jsonify
+from taskmanager import db, limiter
 from taskmanager.models import Categorie, Personne
 from taskmanager.forms import CategorieForm
 from taskmanager.categories import categories_bp
 from taskmanager.auth.routes import login_required, admin_required
-from taskmanager.utils import log_and_flash
+from taskmanager.utils import log_and_flash, delete_category, get_categories_optimized, \
+    get_user_names, search_lookup
 from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError
 from datetime import datetime
 from typing import List
@@ -15,11 +16,14 @@ from markupsafe import escape
 def liste():
     """Route for listing all categories for the current user."""
     personne_id = session.get('personne_id')
-    categories = Categorie.query.filter_by(personne_id=personne_id).all()
+    # Task counts come from the same query, categorie.taches would be lazy loaded per category
+    rows = get_categories_optimized(personne_id)
+    categories = [categorie for categorie, _ in rows]
+    task_counts = {categorie.id: task_count for categorie, task_count in rows}
 
     log_and_flash(f"Affichage de {len(categories)} catégories pour l'utilisateur {personne_id}", 
                  level="debug", flash_category=None)
-    return render_template('categories/liste.html', categories=categories)
+    return render_template('categories/liste.html', categories=categories, task_counts=task_counts)
 
 @categories_bp.route('/admin/all')
 @login_required
@@ -27,15 +31,24 @@ def liste():
 def admin_liste():
     """Admin route for listing all categories across all users."""
     categories = Categorie.query.all()
-    users = Personne.query.all()
 
-    # Create a dictionary mapping user IDs to names for display
-    user_names = {user.id: user.nom for user in users}
+    # Dictionary mapping the owners' IDs to names for display
+    user_names = get_user_names(categorie.personne_id for categorie in categories)
 
     log_and_flash(f"Affichage de toutes les catégories ({len(categories)}) pour l'administrateur", 
                  level="debug", flash_category=None)
     return render_template('categories/admin_liste.html', categories=categories, user_names=user_names)
 
+@categories_bp.route('/admin/lookup')
+@login_required
+@admin_required
+@limiter.limit("120 per minute")
+def admin_lookup():
+    """Admin route returning the categories whose name starts with q, for filter typeaheads."""
+    categories = search_lookup('categorie', request.args.get('q', ''),
+                               current_app.config['LOOKUP_RESULTS'])
+    return jsonify([{'id': categorie_id, 'nom': nom} for categorie_id, nom in categories])
+
 @categories_bp.route('/nouvelle', methods=['GET', 'POST'])
 @login_required
 def nouvelle():
@@ -141,15 +154,10 @@ def admin_supprimer(categorie_id: int):
         categorie = Categorie.query.get_or_404(categorie_id)
         owner = Personne.query.get(categorie.personne_id)
 
-        # Remove category from tasks
-        for tache in categorie.taches:
-            tache.categorie_id = None
-
-        # Delete the category
+        # Delete the category, its tasks are detached with a single UPDATE
         nom_categorie = categorie.nom
         nom_owner = owner.nom
-        db.session.delete(categorie)
-        db.session.commit()
+        delete_category(categorie)
         log_and_flash(f"Catégorie supprimée par admin: {nom_categorie} (propriétaire: {nom_owner})")
         return redirect(url_for('categories.admin_liste'))
 
@@ -168,14 +176,10 @@ def supprimer(categorie_id: int):
         if categorie.personne_id != session['personne_id']:
             raise AuthorizationError("Vous n'êtes pas autorisé à supprimer cette catégorie")
 
-        # Remove category from tasks
-        for tache in categorie.taches:
-            tache.categorie_id = None
-
-        # Delete the category
-        db.session.delete(categorie)
-        db.session.commit()
-        log_and_flash(f"Catégorie supprimée: {categorie.nom}")
+        # Delete the category, its tasks are detached with a single UPDATE
+        nom_categorie = categorie.nom
+        delete_category(categorie)
+        log_and_flash(f"Catégorie supprimée: {nom_categorie}")
         return redirect(url_for('categories.liste'))
 
     except (ResourceNotFoundError, AuthorizationError) as e:
@@ -0,0 +1,103 @@
+"""Flask CLI commands for the Task Manager application."""
+
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    """
+    Register the CLI commands with the application.
+
+    Args:
+        app: The Flask application
+    """
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index() -> None:
+        """Rebuild the full-text search index of the tasks."""
+        from taskmanager.search import get_search_backend
+
+        backend = get_search_backend()
+        backend.rebuild()
+        click.echo(f"Index de recherche reconstruit ({backend.name})")
+
+    @app.cli.command('check-task-stats')
+    @click.option('--dry-run', is_flag=True, help="Report the drift without repairing it.")
+    def check_task_stats_command(dry_run: bool) -> None:
+        """Recompute the task statistics from scratch and report any drift."""
+        from taskmanager.stats import check_task_stats
+
+        drift = check_task_stats(repair=not dry_run)
+        for user_id, columns in sorted(drift.items()):
+            details = ', '.join(
+                f"{column}: {stored} -> {expected}"
+                for column, (stored, expected) in columns.items()
+            )
+            click.echo(f"Utilisateur {user_id}: {details}")
+        if not drift:
+            click.echo("Statistiques des tâches cohérentes")
+        elif dry_run:
+            click.echo(f"{len(drift)} utilisateur(s) avec des statistiques incohérentes")
+        else:
+            click.echo(f"Statistiques reconstruites, {len(drift)} utilisateur(s) corrigé(s)")
+
+    @app.cli.command('recompute-overdue-tasks')
+    def recompute_overdue_tasks() -> None:
+        """Recompute the overdue task counters (run daily after midnight UTC)."""
+        from taskmanager.stats import recompute_overdue
+
+        count = recompute_overdue()
+        click.echo(f"Tâches en retard recalculées pour {count} utilisateur(s)")
+
+    @app.cli.command('export-tasks')
+    @click.option('--format', 'export_format', type=click.Choice(['csv', 'ndjson']), default='csv',
+                  help="Export format.")
+    @click.option('--output', type=click.File('w', encoding='utf-8'), default='-',
+                  help="Output file (default: standard output).")
+    @click.option('--status', help="Only export tasks with this status.")
+    @click.option('--priority', help="Only export tasks with this priority.")
+    @click.option('--user-id', type=int, help="Only export the tasks of this user.")
+    @click.option('--category-id', type=int, help="Only export the tasks of this category.")
+    @click.option('--search', help="Only export the tasks matching this search term.")
+    def export_tasks_command(export_format: str, output, status, priority, user_id,
+                             category_id, search) -> None:
+        """Stream the tasks matching the admin listing filters as CSV or NDJSON."""
+        from taskmanager.export import export_tasks
+
+        for chunk in export_tasks(export_format, app.config['EXPORT_BATCH_SIZE'],
+                                  status=status, priority=priority, user_id=user_id,
+                                  category_id=category_id, search_term=search):
+            output.write(chunk)
+
+    @app.cli.command('import-tasks')
+    @click.argument('input_file', type=click.File('r', encoding='utf-8-sig'))
+    @click.option('--user-id', type=int, required=True, help="Owner of the imported tasks.")
+    @click.option('--format', 'import_format', type=click.Choice(['csv', 'ndjson']),
+                  help="Input format (default: from the file extension).")
+    @click.option('--no-create-categories', is_flag=True,
+                  help="Reject the rows whose category does not exist instead of creating it.")
+    def import_tasks_command(input_file, user_id: int, import_format,
+                             no_create_categories: bool) -> None:
+        """Import tasks for a user from a CSV or NDJSON file ('-' for standard input)."""
+        from taskmanager import db
+        from taskmanager.exceptions import ValidationError
+        from taskmanager.importer import import_tasks
+        from taskmanager.models import Personne
+
+        if db.session.get(Personne, user_id) is None:
+            raise click.BadParameter(f"Utilisateur {user_id} introuvable", param_hint='--user-id')
+        if not import_format:
+            import_format = 'ndjson' if input_file.name.endswith('.ndjson') else 'csv'
+        try:
+            report = import_tasks(input_file, import_format, user_id,
+                                  batch_size=app.config['IMPORT_BATCH_SIZE'],
+                                  create_categories=not no_create_categories,
+                                  max_errors=app.config['IMPORT_MAX_ERRORS'])
+        except ValidationError as e:
+            raise click.ClickException(e.message)
+
+        for error in report['errors']:
+            click.echo(f"Ligne {error['line']}: {'; '.join(error['errors'])}", err=True)
+        click.echo(f"{report['imported']} tâche(s) importée(s), "
+                   f"{report['failed']} ligne(s) rejetée(s), "
+                   f"{report['categories_created']} catégorie(s) créée(s)")
@@ -14,6 +14,96 @@ class Config:
         'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30))
     }
 
+    # Task listing count strategy: exact, cached, approximate (planner estimate on
+    # PostgreSQL) or probe (no count, fetch one extra row to detect a next page).
+    # Cached counts live in the shared cache below and are invalidated by task commits;
+    # with the local backend each worker keeps its own, stale for up to
+    # TASK_COUNT_CACHE_TTL after another worker's writes.
+    TASK_COUNT_STRATEGY = os.environ.get('TASK_COUNT_STRATEGY', 'exact')
+    ADMIN_TASK_COUNT_STRATEGY = os.environ.get('ADMIN_TASK_COUNT_STRATEGY', 'cached')
+    TASK_COUNT_CACHE_TTL = int(os.environ.get('TASK_COUNT_CACHE_TTL', 60))  # seconds
+    TASK_COUNT_EXACT_THRESHOLD = int(os.environ.get('TASK_COUNT_EXACT_THRESHOLD', 1000))
+
+    # Full-text search backend: auto (FTS5 on SQLite, tsvector on PostgreSQL) or like
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+
+    # Process-level cache of the logged-in user (in addition to the per-request memo).
+    # Entries are checked against the shared cache below, so a user changed in another
+    # worker is reloaded with the file or redis backend; with the local backend the other
+    # workers keep the previous role for up to USER_CACHE_TTL, hence the short default
+    USER_CACHE_ENABLED = os.environ.get('USER_CACHE_ENABLED', 'False').lower() == 'true'
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 5))  # seconds
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+
+    # Maximum number of tasks changed by one bulk operation
+    BULK_TASK_MAX_IDS = int(os.environ.get('BULK_TASK_MAX_IDS', 1000))
+
+    # Incremental sync API: rows per query batch, rows per response, and how many
+    # seconds recent changes are held back so transactions still in flight are not
+    # skipped by a client's watermark
+    SYNC_BATCH_SIZE = int(os.environ.get('SYNC_BATCH_SIZE', 500))
+    SYNC_MAX_ROWS = int(os.environ.get('SYNC_MAX_ROWS', 5000))
+    SYNC_SAFETY_LAG = int(os.environ.get('SYNC_SAFETY_LAG', 2))  # seconds
+
+    # Database of the async API routes served by asgi.py, defaults to the application
+    # database with the asyncio driver of its backend (aiosqlite, asyncpg)
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+
+    # Rows fetched at a time from the server-side cursor by the task exports
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+    # Task imports: rows validated and inserted per transaction, row errors reported,
+    # and the largest uploaded file accepted
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+    IMPORT_MAX_BYTES = int(os.environ.get('IMPORT_MAX_BYTES', 50 * 1024 * 1024))
+
+    # Shared cache: local (per-process LRU), file (one file per key under CACHE_DIR,
+    # /dev/shm by default, shared by the workers of a host) or redis (CACHE_URL,
+    # requires the redis package)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+    CACHE_URL = os.environ.get('CACHE_URL', 'redis://localhost:6379/0')
+    CACHE_DIR = os.environ.get('CACHE_DIR')
+    CACHE_NAMESPACE = os.environ.get('CACHE_NAMESPACE', 'taskmanager')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 300))  # seconds
+    CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 1024))
+    CACHE_LOCK_TIMEOUT = int(os.environ.get('CACHE_LOCK_TIMEOUT', 10))  # seconds
+
+    # Admin filter dropdowns list at most this many users/categories, larger tables get
+    # a typeahead searching LOOKUP_RESULTS names at a time
+    ADMIN_LOOKUP_MAX_OPTIONS = int(os.environ.get('ADMIN_LOOKUP_MAX_OPTIONS', 500))
+    LOOKUP_RESULTS = int(os.environ.get('LOOKUP_RESULTS', 20))
+
+    # Health probes: seconds the readiness database ping is reused, free space below
+    # which the instance and logs directories fail readiness, and the psutil metrics
+    # snapshot at /health/metrics
+    HEALTH_DB_PING_TTL = float(os.environ.get('HEALTH_DB_PING_TTL', 5))  # seconds
+    HEALTH_MIN_FREE_BYTES = int(os.environ.get('HEALTH_MIN_FREE_BYTES', 100 * 1024 * 1024))
+    HEALTH_METRICS_ENABLED = os.environ.get('HEALTH_METRICS_ENABLED', 'False').lower() == 'true'
+
+    # Per-request instrumentation: Server-Timing header (SQL query count and time,
+    # template time, total time) and a warning listing the slowest SQL statements of
+    # the requests slower than SLOW_REQUEST_THRESHOLD_MS. Only the
+    # SLOW_REQUEST_MAX_STATEMENTS slowest statements of a request are kept in memory
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'True').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'True').lower() == 'true'
+    SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500))
+    SLOW_REQUEST_MAX_STATEMENTS = int(os.environ.get('SLOW_REQUEST_MAX_STATEMENTS', 20))
+
+    # Prometheus metrics (requires prometheus_client): endpoint latencies and errors,
+    # rate limit rejections, pool and cache counters, served at METRICS_PATH. Under
+    # gunicorn, PROMETHEUS_MULTIPROC_DIR aggregates the workers
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+
+    # N+1 query detection: a relationship lazy loaded more than LAZY_LOAD_THRESHOLD
+    # times in one request is logged ('warn') or fails the request ('raise')
+    LAZY_LOAD_ACTION = os.environ.get('LAZY_LOAD_ACTION') or None
+    LAZY_LOAD_THRESHOLD = int(os.environ.get('LAZY_LOAD_THRESHOLD', 5))
+
+    # Rate limiting of the requests (disable for load tests only)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True').lower() == 'true'
+
     # Add logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 
@@ -36,6 +126,7 @@ class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL', 'sqlite:///../instance/data.db')
+    LAZY_LOAD_ACTION = os.environ.get('LAZY_LOAD_ACTION', 'warn')
 
     @classmethod
     def init_app(cls, app):
@@ -53,6 +144,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///:memory:')
     WTF_CSRF_ENABLED = False  # Disable CSRF for testing
+    LAZY_LOAD_ACTION = os.environ.get('LAZY_LOAD_ACTION', 'raise')
 
     @classmethod
     def init_app(cls, app):
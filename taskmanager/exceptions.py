@@ -46,4 +46,19 @@ class DatabaseError(TaskManagerException):
     """Exception raised for database-related errors."""
 
     def __init__(self, message: str = "A database error occurred"):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+
+class NPlusOneError(Exception):
+    """
+    Exception raised when a request lazy loads the same relationship too many times.
+
+    Not a TaskManagerException: it flags a bug in the code, so it is not turned into
+    an error page but fails the request, and the test that sent it.
+    """
+
+    def __init__(self, relationship: str, count: int):
+        self.relationship = relationship
+        self.count = count
+        super().__init__(f"{relationship} lazy loaded {count} times in one request, "
+                         "load it eagerly (joinedload, selectinload)")
@@ -0,0 +1,133 @@
+"""Streaming CSV and NDJSON export of tasks."""
+
+import csv
+import json
+from datetime import datetime
+from typing import Any, Iterator, Optional, Sequence
+
+from taskmanager import db
+from taskmanager.exceptions import ValidationError
+from taskmanager.models import Tache
+from taskmanager.utils import filter_tasks
+
+EXPORT_COLUMNS = (
+    'id', 'titre', 'description', 'status', 'priority', 'due_date', 'categorie_id',
+    'personne_id', 'created_at', 'updated_at'
+)
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Spreadsheet applications evaluate cells starting with these characters as formulas
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _LineBuffer:
+    """File-like object handing back what csv.writer writes instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_task_rows(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    user_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    search_term: Optional[str] = None,
+    batch_size: int = 1000
+) -> Iterator[Sequence[Any]]:
+    """
+    Stream the rows of the tasks matching the admin listing filters.
+
+    Plain column tuples are fetched through a server-side cursor (yield_per enables
+    stream_results), so memory stays constant whatever the number of tasks.
+
+    Args:
+        status: Filter by status (pending, in_progress, completed)
+        priority: Filter by priority (low, medium, high)
+        user_id: Filter by owner
+        category_id: Filter by category ID
+        search_term: Full-text search term for task title or description
+        batch_size: The number of rows fetched from the cursor at a time
+
+    Returns:
+        Iterator over the rows, with the values in EXPORT_COLUMNS order
+    """
+    query, _ = filter_tasks(db.session.query(Tache), status, priority, user_id,
+                            category_id, search_term)
+    query = query.with_entities(
+        *(getattr(Tache, column) for column in EXPORT_COLUMNS)
+    ).order_by(Tache.id).execution_options(yield_per=batch_size)
+    for row in query:
+        yield row
+
+
+def _format_value(value: Any) -> Any:
+    """Convert a column value to its exported representation."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    """Format a CSV cell, neutralizing text that a spreadsheet would run as a formula."""
+    value = _format_value(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def format_csv(rows: Iterator[Sequence[Any]]) -> Iterator[str]:
+    """
+    Write rows as CSV lines, one chunk per row after the header.
+
+    Args:
+        rows: The rows to write, in EXPORT_COLUMNS order
+
+    Returns:
+        Iterator over the CSV lines
+    """
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def format_ndjson(rows: Iterator[Sequence[Any]]) -> Iterator[str]:
+    """
+    Write rows as newline-delimited JSON objects.
+
+    Args:
+        rows: The rows to write, in EXPORT_COLUMNS order
+
+    Returns:
+        Iterator over the JSON lines
+    """
+    for row in rows:
+        record = {column: _format_value(value) for column, value in zip(EXPORT_COLUMNS, row)}
+        yield json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def export_tasks(export_format: str, batch_size: int = 1000, **filters: Any) -> Iterator[str]:
+    """
+    Stream the tasks matching the admin listing filters in an export format.
+
+    Args:
+        export_format: The export format (csv or ndjson)
+        batch_size: The number of rows fetched from the cursor at a time
+        **filters: The filters of iter_task_rows
+
+    Returns:
+        Iterator over the chunks of the export
+
+    Raises:
+        ValidationError: If the format is not supported
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError("Format d'export invalide")
+    rows = iter_task_rows(batch_size=batch_size, **filters)
+    if export_format == 'csv':
+        return format_csv(rows)
+    return format_ndjson(rows)
@@ -153,9 +153,11 @@ class TacheForm(FlaskForm):
         super(TacheForm, self).__init__(*args, **kwargs)
         personne_id = session.get('personne_id')
         if personne_id:
-            from taskmanager.models import Categorie
-            categories = Categorie.query.filter_by(personne_id=personne_id).all()
-            self.categorie_id.choices = [(0, 'Aucune catégorie')] + [(c.id, c.nom) for c in categories]
+            from taskmanager.utils import get_user_categories
+            categories = get_user_categories(personne_id)
+            self.categorie_id.choices = [(0, 'Aucune catégorie')] + [
+                (c['id'], c['nom']) for c in categories
+            ]
 
     def validate_due_date(self, due_date) -> OptionalType[ValidationError]:
         """Validate that the due date is not in the past."""
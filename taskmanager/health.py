@@ -0,0 +1,208 @@
+"""
+Liveness, readiness and metrics probes.
+
+The probes are polled by load balancers and orchestrators every few seconds, so they
+stay cheap. HealthProbeMiddleware answers them in front of the Flask request
+handling, within an application context only: no session is opened, and neither
+validate_session, Talisman (HTTPS redirect, security headers) nor the rate limiter
+run. The readiness database ping is cached for HEALTH_DB_PING_TTL seconds.
+"""
+
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Blueprint, Flask, Response, current_app, jsonify
+from taskmanager import db
+
+health_bp = Blueprint('health', __name__, url_prefix='/health')
+
+_ping_lock = threading.Lock()
+
+
+def _error_response(message: str, status: int) -> Response:
+    """Build a JSON error response."""
+    response = jsonify({'error': message})
+    response.status_code = status
+    return response
+
+
+def _get_health_state(app: Flask) -> Dict[str, Any]:
+    """Get the probe state of an application: the last ping and the process handle."""
+    return app.extensions.setdefault('health', {'ping': None, 'process': None})
+
+
+def ping_database(ttl: Optional[float] = None) -> Tuple[bool, Optional[str], float]:
+    """
+    Check that the database answers, reusing the result of a recent check.
+
+    The ping runs on its own pooled connection, outside the request's session.
+
+    Args:
+        ttl: Seconds a result is reused, defaults to HEALTH_DB_PING_TTL
+
+    Returns:
+        Tuple containing whether the database answered, the error message if it did
+        not, and the age of the result in seconds
+    """
+    if ttl is None:
+        ttl = current_app.config.get('HEALTH_DB_PING_TTL', 5)
+    state = _get_health_state(current_app)
+    now = time.monotonic()
+    with _ping_lock:
+        ping = state['ping']
+        if ping is None or now - ping[2] >= ttl:
+            try:
+                with db.engine.connect() as connection:
+                    connection.exec_driver_sql('SELECT 1')
+                ping = (True, None, now)
+            except Exception as e:
+                current_app.logger.warning(f"Health check: database ping failed: {e}")
+                ping = (False, type(e).__name__, now)
+            state['ping'] = ping
+    return ping[0], ping[1], now - ping[2]
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Get the state of the database connection pool.
+
+    Returns:
+        Dictionary with the pool class and, for queue pools, its size, the connections
+        checked out and the overflow in use, and whether all connections are in use
+    """
+    pool = db.engine.pool
+    status = {'class': type(pool).__name__}
+    if hasattr(pool, 'checkedout'):
+        status['checked_out'] = pool.checkedout()
+    if hasattr(pool, 'size') and hasattr(pool, 'overflow'):
+        status['size'] = pool.size()
+        status['overflow'] = pool.overflow()
+        # A negative max_overflow means unlimited
+        max_overflow = getattr(pool, '_max_overflow', -1)
+        status['exhausted'] = max_overflow >= 0 and \
+            status['checked_out'] >= status['size'] + max_overflow
+    return status
+
+
+def get_disk_status(min_free: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the free space of the instance and logs directories.
+
+    Args:
+        min_free: The free bytes below which a directory is reported as low
+
+    Returns:
+        Dictionary with the free and total bytes of each existing directory and
+        whether its space is low
+    """
+    directories = {
+        'instance': current_app.instance_path,
+        'logs': os.path.abspath('logs'),
+    }
+    status = {}
+    for name, path in directories.items():
+        if not os.path.isdir(path):
+            continue
+        usage = shutil.disk_usage(path)
+        status[name] = {'free': usage.free, 'total': usage.total, 'low': usage.free < min_free}
+    return status
+
+
+@health_bp.route('/live')
+def live():
+    """Liveness probe: the process serves requests, nothing else is checked."""
+    return jsonify({'status': 'ok'})
+
+
+@health_bp.route('/ready')
+def ready():
+    """
+    Readiness probe: the database answers, the pool has free connections and the data
+    directories have free space. Answers 503 when any check fails.
+    """
+    database_ok, error, age = ping_database()
+    pool = get_pool_status()
+    disk = get_disk_status(current_app.config.get('HEALTH_MIN_FREE_BYTES', 100 * 1024 * 1024))
+
+    database = {'ok': database_ok, 'age': round(age, 3)}
+    if error:
+        database['error'] = error
+    is_ready = database_ok and not pool.get('exhausted') and \
+        not any(directory['low'] for directory in disk.values())
+    response = jsonify({
+        'status': 'ok' if is_ready else 'unavailable',
+        'checks': {'database': database, 'pool': pool, 'disk': disk}
+    })
+    response.status_code = 200 if is_ready else 503
+    return response
+
+
+@health_bp.route('/metrics')
+def metrics():
+    """
+    Snapshot of the process resources, enabled by HEALTH_METRICS_ENABLED.
+
+    The CPU percentage is measured since the previous snapshot of the worker.
+    """
+    if not current_app.config.get('HEALTH_METRICS_ENABLED', False):
+        return _error_response("Not found", 404)
+    try:
+        import psutil
+    except ImportError:
+        return _error_response("psutil is not installed", 501)
+
+    state = _get_health_state(current_app)
+    process = state['process']
+    if process is None or process.pid != os.getpid():
+        # The handle is per process, a forked worker gets its own
+        process = state['process'] = psutil.Process()
+    with process.oneshot():
+        snapshot = {
+            'pid': process.pid,
+            'rss': process.memory_info().rss,
+            'cpu_percent': process.cpu_percent(interval=None),
+            'threads': process.num_threads(),
+            'open_fds': process.num_fds() if hasattr(process, 'num_fds') else None,
+        }
+    snapshot['pool'] = get_pool_status()
+    return jsonify(snapshot)
+
+
+class HealthProbeMiddleware:
+    """
+    WSGI middleware answering GET and HEAD requests to the probes before Flask.
+
+    Other requests, including other methods on the probe URLs, go to the wrapped
+    application.
+    """
+
+    def __init__(self, app: Flask, wsgi_app: Callable):
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.views = {
+            f'{health_bp.url_prefix}/live': live,
+            f'{health_bp.url_prefix}/ready': ready,
+            f'{health_bp.url_prefix}/metrics': metrics,
+        }
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        view = self.views.get(environ.get('PATH_INFO'))
+        if view is None or environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+            return self.wsgi_app(environ, start_response)
+        with self.app.app_context():
+            response = view()
+        response.headers['Cache-Control'] = 'no-store'
+        return response(environ, start_response)
+
+
+def init_health(app: Flask) -> None:
+    """
+    Answer the health probes of an application in front of its request handling.
+
+    Args:
+        app: The Flask application
+    """
+    app.wsgi_app = HealthProbeMiddleware(app, app.wsgi_app)
@@ -0,0 +1,284 @@
+"""Bulk CSV and NDJSON import of tasks."""
+
+import csv
+import json
+from datetime import date, datetime, time
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from flask import current_app
+from markupsafe import escape
+from sqlalchemy import select
+from taskmanager import db
+from taskmanager.exceptions import ValidationError
+from taskmanager.models import Categorie, Tache
+from taskmanager.stats import rebuild_task_stats
+from taskmanager.utils import TASK_STATUSES, TASK_PRIORITIES
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_FIELDS = ('titre', 'description', 'status', 'priority', 'due_date', 'categorie')
+
+# Column limits of the tache and categorie tables
+MAX_TITLE_LENGTH = 200
+MAX_CATEGORY_LENGTH = 50
+
+# A parsed input record: its line number, its fields, or the reason it could not be read
+ImportRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def iter_import_records(stream: TextIO, import_format: str) -> Iterator[ImportRecord]:
+    """
+    Parse a CSV or NDJSON stream one record at a time.
+
+    CSV input must have a header line naming the IMPORT_FIELDS columns (titre is
+    required, the others are optional). NDJSON input has one JSON object per line.
+
+    Args:
+        stream: The text stream to read
+        import_format: The input format (csv or ndjson)
+
+    Returns:
+        Iterator over (line number, fields, error) tuples, fields is None when the
+        record could not be parsed
+
+    Raises:
+        ValidationError: If the format is not supported or the CSV header has no titre column
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValidationError("Format d'import invalide")
+    if import_format == 'ndjson':
+        return _iter_ndjson_records(stream)
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or 'titre' not in reader.fieldnames:
+        raise ValidationError("L'en-tête CSV doit contenir une colonne titre")
+    return _iter_csv_records(reader)
+
+
+def _iter_csv_records(reader: csv.DictReader) -> Iterator[ImportRecord]:
+    """Parse CSV records, see iter_import_records."""
+    try:
+        for record in reader:
+            yield reader.line_num, record, None
+    except csv.Error as e:
+        yield reader.line_num, None, f"CSV invalide: {e}"
+
+
+def _iter_ndjson_records(stream: TextIO) -> Iterator[ImportRecord]:
+    """Parse NDJSON records, see iter_import_records."""
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, "JSON invalide"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "La ligne doit être un objet JSON"
+            continue
+        yield line_number, record, None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Convert an input value to text, empty values become None."""
+    if value is None:
+        return None
+    value = str(value)
+    return value if value != '' else None
+
+
+def validate_task_record(record: Dict[str, Any],
+                         today: date) -> Tuple[Dict[str, Any], Optional[str], List[str]]:
+    """
+    Validate an imported task with the rules of TacheForm.
+
+    TacheForm itself is not used: it loads the user's categories each time it is built,
+    which would cost one query per row.
+
+    Args:
+        record: The fields of the record
+        today: The earliest due date accepted
+
+    Returns:
+        Tuple containing the column values of the task, its category name (or None) and
+        the validation errors (the row must be skipped when there are any)
+    """
+    errors = []
+    titre = _text(record.get('titre'))
+    description = _text(record.get('description'))
+    status = _text(record.get('status')) or 'pending'
+    priority = _text(record.get('priority')) or 'medium'
+    due_date_text = _text(record.get('due_date'))
+    categorie = _text(record.get('categorie'))
+
+    if titre is None:
+        errors.append("Le titre est requis")
+    elif len(titre) > MAX_TITLE_LENGTH:
+        errors.append(f"Le titre ne peut pas dépasser {MAX_TITLE_LENGTH} caractères")
+    elif escape(titre.strip()) != titre:
+        errors.append("Le titre contient des caractères non autorisés.")
+
+    if description is not None and escape(description.strip()) != description:
+        errors.append("La description contient des caractères non autorisés.")
+
+    if status not in TASK_STATUSES:
+        errors.append("Statut invalide")
+    if priority not in TASK_PRIORITIES:
+        errors.append("Priorité invalide")
+
+    due_date = None
+    if due_date_text is not None:
+        try:
+            due_date = datetime.strptime(due_date_text, '%Y-%m-%d').date()
+        except ValueError:
+            errors.append("La date d'échéance doit être au format AAAA-MM-JJ")
+        else:
+            if due_date < today:
+                errors.append("La date d'échéance ne peut pas être dans le passé.")
+
+    if categorie is not None:
+        if len(categorie) > MAX_CATEGORY_LENGTH:
+            errors.append(
+                f"Le nom de la catégorie ne peut pas dépasser {MAX_CATEGORY_LENGTH} caractères")
+        elif escape(categorie.strip()) != categorie:
+            errors.append("Le nom de la catégorie contient des caractères non autorisés.")
+
+    values = {
+        'titre': titre,
+        'description': description,
+        'status': status,
+        'priority': priority,
+        'due_date': datetime.combine(due_date, time()) if due_date else None,
+    }
+    return values, categorie, errors
+
+
+def _resolve_categories(names: set, user_id: int, create: bool) -> Tuple[Dict[str, int], int]:
+    """
+    Get the IDs of a user's categories by name, with one lookup per batch.
+
+    Args:
+        names: The category names used by the batch
+        user_id: The owner of the categories
+        create: Whether to create the missing categories
+
+    Returns:
+        Tuple containing the ID of each known category name and the number of
+        categories created
+    """
+    if not names:
+        return {}, 0
+    lookup = select(Categorie.nom, Categorie.id).where(
+        Categorie.personne_id == user_id,
+        Categorie.nom.in_(names)
+    )
+    ids = dict(db.session.execute(lookup).all())
+    missing = names - ids.keys()
+    if not missing or not create:
+        return ids, 0
+
+    now = datetime.utcnow()
+    db.session.execute(Categorie.__table__.insert(), [
+        {'nom': nom, 'personne_id': user_id, 'created_at': now, 'updated_at': now}
+        for nom in sorted(missing)
+    ])
+    ids.update(db.session.execute(lookup.where(Categorie.nom.in_(missing))).all())
+    return ids, len(missing)
+
+
+def import_tasks(
+    stream: TextIO,
+    import_format: str,
+    user_id: int,
+    batch_size: int = 1000,
+    create_categories: bool = True,
+    max_errors: int = 100
+) -> Dict[str, Any]:
+    """
+    Import the tasks of a CSV or NDJSON stream for a user.
+
+    The stream is read one batch at a time. Each batch is validated, its category names
+    are resolved with one lookup, its tasks are written with one executemany INSERT and
+    it is committed on its own, so memory stays flat and a failure only loses the
+    current batch. Invalid rows are skipped and reported.
+
+    Statements that bypass the ORM do not fire the flush events, so the statistics and
+    cached counts of the user are refreshed at the end.
+
+    Args:
+        stream: The text stream to read
+        import_format: The input format (csv or ndjson)
+        user_id: The owner of the imported tasks
+        batch_size: The number of records validated and inserted at a time
+        create_categories: Whether to create the categories that do not exist yet,
+            otherwise their rows are rejected
+        max_errors: The number of row errors kept in the report (all are counted)
+
+    Returns:
+        Dictionary with the number of imported and failed rows, the number of
+        categories created and the first row errors ({'line': ..., 'errors': [...]})
+
+    Raises:
+        ValidationError: If the format is not supported or the CSV header is invalid
+    """
+    records = iter_import_records(stream, import_format)
+    today = datetime.now().date()
+    report = {'imported': 0, 'failed': 0, 'categories_created': 0, 'errors': []}
+
+    def reject(line: int, errors: List[str]) -> None:
+        report['failed'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'line': line, 'errors': errors})
+
+    try:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+
+            valid, rejected = [], []
+            for line, record, error in batch:
+                if error is not None:
+                    rejected.append((line, [error]))
+                    continue
+                values, categorie, errors = validate_task_record(record, today)
+                if errors:
+                    rejected.append((line, errors))
+                else:
+                    valid.append((line, values, categorie))
+
+            names = {categorie for _, _, categorie in valid if categorie is not None}
+            category_ids, created = _resolve_categories(names, user_id, create_categories)
+            report['categories_created'] += created
+
+            now = datetime.utcnow()
+            rows = []
+            for line, values, categorie in valid:
+                if categorie is not None and categorie not in category_ids:
+                    rejected.append((line, ["Catégorie inconnue"]))
+                    continue
+                rows.append(dict(
+                    values,
+                    categorie_id=category_ids.get(categorie),
+                    personne_id=user_id,
+                    is_deleted=False,
+                    created_at=now,
+                    updated_at=now
+                ))
+            if rows:
+                db.session.execute(Tache.__table__.insert(), rows)
+            db.session.commit()
+            report['imported'] += len(rows)
+            for line, errors in sorted(rejected):
+                reject(line, errors)
+    finally:
+        db.session.rollback()
+        if report['imported']:
+            rebuild_task_stats(db.session, [user_id])
+            db.session.commit()
+
+    current_app.logger.info(
+        f"Import de {report['imported']} tâche(s) pour l'utilisateur {user_id} "
+        f"({report['failed']} ligne(s) rejetée(s))"
+    )
+    return report
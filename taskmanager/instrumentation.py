@@ -0,0 +1,163 @@
+"""
+Per-request instrumentation: SQL query count, database time, template time and total time.
+
+Cursor events of every engine and the template signals of Flask add to the timing of
+the current request, kept in a context variable so threads and greenlets each see their
+own. Each response gets a Server-Timing header, and requests slower than
+SLOW_REQUEST_THRESHOLD_MS are logged with their slowest SQL statements. Only the
+SLOW_REQUEST_MAX_STATEMENTS slowest statements are kept, so long requests such as
+streaming exports use bounded memory.
+"""
+
+import heapq
+import time
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from flask import Flask, Response, before_render_template, current_app, request, \
+    request_started, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTiming:
+    """The measures of one request."""
+
+    __slots__ = ('start', 'queries', 'db_time', 'template_time', 'template_start',
+                 'statements', 'max_statements')
+
+    def __init__(self, max_statements: int = 20):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_start: Optional[float] = None
+        self.max_statements = max_statements
+        # Heap of the (duration, statement) of the slowest queries, for the slow request log
+        self.statements: List[Tuple[float, str]] = []
+
+    def add_statement(self, duration: float, statement: str) -> None:
+        """
+        Add a finished statement to the totals, keeping it if it is among the slowest.
+
+        Args:
+            duration: The time spent on the statement, in seconds
+            statement: The SQL of the statement
+        """
+        self.queries += 1
+        self.db_time += duration
+        if len(self.statements) < self.max_statements:
+            heapq.heappush(self.statements, (duration, statement))
+        elif self.statements and duration > self.statements[0][0]:
+            heapq.heapreplace(self.statements, (duration, statement))
+
+    def server_timing(self, total: float) -> str:
+        """
+        Format the measures as a Server-Timing header value, durations in milliseconds.
+
+        Args:
+            total: The time spent on the request so far, in seconds
+
+        Returns:
+            The header value
+        """
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+            f'tpl;dur={self.template_time * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar('request_timing', default=None)
+
+
+def get_request_timing() -> Optional[RequestTiming]:
+    """Get the timing of the current request, or None outside instrumented requests."""
+    return _current_timing.get()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Note when a statement of an instrumented request starts."""
+    if _current_timing.get() is not None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Add a finished statement to the timing of its request."""
+    starts = conn.info.get('query_start')
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    timing = _current_timing.get()
+    if timing is None:
+        return
+    timing.add_statement(duration, statement)
+
+
+def _start_request(sender: Flask, **extra: Any) -> None:
+    """Start the timing of a request."""
+    _current_timing.set(RequestTiming(sender.config.get('SLOW_REQUEST_MAX_STATEMENTS', 20)))
+
+
+def _before_render(sender: Flask, template: Any, context: dict, **extra: Any) -> None:
+    """Note when a template starts rendering."""
+    timing = _current_timing.get()
+    if timing is not None and timing.template_start is None:
+        timing.template_start = time.perf_counter()
+
+
+def _after_render(sender: Flask, template: Any, context: dict, **extra: Any) -> None:
+    """Add a rendered template to the timing of its request."""
+    timing = _current_timing.get()
+    if timing is not None and timing.template_start is not None:
+        timing.template_time += time.perf_counter() - timing.template_start
+        timing.template_start = None
+
+
+def _finish_request(response: Response) -> Response:
+    """Add the Server-Timing header and log the request if it was slow."""
+    timing = _current_timing.get()
+    if timing is None:
+        return response
+    total = time.perf_counter() - timing.start
+    config = current_app.config
+    if config.get('SERVER_TIMING_ENABLED', True):
+        response.headers['Server-Timing'] = timing.server_timing(total)
+
+    threshold = config.get('SLOW_REQUEST_THRESHOLD_MS', 500)
+    if threshold is not None and total * 1000 >= threshold:
+        statements = '\n'.join(
+            f"  {duration * 1000:.1f} ms: {' '.join(statement.split())}"
+            for duration, statement in sorted(timing.statements, reverse=True)
+        )
+        current_app.logger.warning(
+            f"Requête lente: {request.method} {request.full_path.rstrip('?')} "
+            f"({response.status_code}) en {total * 1000:.1f} ms, "
+            f"{timing.queries} requête(s) SQL en {timing.db_time * 1000:.1f} ms, "
+            f"templates en {timing.template_time * 1000:.1f} ms"
+            + (f"\n{statements}" if statements else '')
+        )
+    return response
+
+
+def _end_request(exc: Optional[BaseException]) -> None:
+    """Stop the timing of a request."""
+    _current_timing.set(None)
+
+
+def init_instrumentation(app: Flask) -> None:
+    """
+    Instrument the requests of an application, unless INSTRUMENTATION_ENABLED is off.
+
+    Args:
+        app: The Flask application
+    """
+    if not app.config.get('INSTRUMENTATION_ENABLED', True):
+        return
+    request_started.connect(_start_request, app)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
@@ -0,0 +1,76 @@
+"""
+Detection of N+1 queries: the same relationship lazy loaded over and over in a request.
+
+The lazy loads that reach the database go through Session.execute, so the
+do_orm_execute event sees each of them along with the relationship loaded. They are
+counted per request in a context variable; when a relationship is lazy loaded more
+than LAZY_LOAD_THRESHOLD times, LAZY_LOAD_ACTION decides what happens: 'raise' an
+NPlusOneError (testing), 'warn' in the log (development), or nothing when unset.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, request, request_started
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+from taskmanager.exceptions import NPlusOneError
+
+LAZY_LOAD_ACTIONS = ('warn', 'raise')
+
+# Lazy loads of the current request by relationship ('Tache.personne'), None outside
+# requests of applications with detection on
+_lazy_loads: ContextVar[Optional[Dict[str, int]]] = ContextVar('lazy_loads', default=None)
+
+
+def get_lazy_loads() -> Optional[Dict[str, int]]:
+    """Get the lazy loads of the current request by relationship, or None if not counted."""
+    return _lazy_loads.get()
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _count_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    """Count a lazy load of the current request, and report it once over the threshold."""
+    loads = _lazy_loads.get()
+    if loads is None or not orm_execute_state.is_select \
+            or orm_execute_state.lazy_loaded_from is None:
+        return
+    relationship = str(orm_execute_state.loader_strategy_path[-1])
+    count = loads[relationship] = loads.get(relationship, 0) + 1
+    if count != current_app.config.get('LAZY_LOAD_THRESHOLD', 5) + 1:
+        return
+    if current_app.config.get('LAZY_LOAD_ACTION') == 'raise':
+        raise NPlusOneError(relationship, count)
+    current_app.logger.warning(
+        f"Requête N+1: {relationship} chargé en différé plus de {count - 1} fois "
+        f"pendant {request.method} {request.path}"
+    )
+
+
+def _start_request(sender: Flask, **extra: Any) -> None:
+    """Start counting the lazy loads of a request."""
+    _lazy_loads.set({})
+
+
+def _end_request(exc: Optional[BaseException]) -> None:
+    """Stop counting the lazy loads of a request."""
+    _lazy_loads.set(None)
+
+
+def init_lazy_load_detection(app: Flask) -> None:
+    """
+    Detect the N+1 queries of an application's requests, if LAZY_LOAD_ACTION is set.
+
+    Args:
+        app: The Flask application
+
+    Raises:
+        ValueError: If LAZY_LOAD_ACTION is not 'warn' or 'raise'
+    """
+    action = app.config.get('LAZY_LOAD_ACTION')
+    if not action:
+        return
+    if action not in LAZY_LOAD_ACTIONS:
+        raise ValueError(f"LAZY_LOAD_ACTION must be one of {', '.join(LAZY_LOAD_ACTIONS)}")
+    request_started.connect(_start_request, app)
+    app.teardown_request(_end_request)
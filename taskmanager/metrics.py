@@ -0,0 +1,231 @@
+"""
+Prometheus metrics of the application.
+
+Per-endpoint request latency histograms and request/error counters, rate limit
+rejections, database pool gauges and cache hit counters, exposed in the Prometheus
+text format at METRICS_PATH. Requires the prometheus_client package.
+
+Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR: every worker then
+writes its values to mmap-backed files in that directory and a scrape served by any
+worker aggregates the files of all of them.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask, Response, current_app, request, request_started
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from taskmanager import db
+
+_request_start: ContextVar[Optional[float]] = ContextVar('metrics_request_start', default=None)
+
+# The metric objects, created once per process (prometheus_client registers them globally)
+_metrics: Dict[str, Any] = {}
+
+
+def _get_metrics() -> Dict[str, Any]:
+    """Create the metric objects on first use."""
+    if _metrics:
+        return _metrics
+    from prometheus_client import Counter, Gauge, Histogram
+
+    endpoint_labels = ('blueprint', 'endpoint')
+    _metrics.update(
+        latency=Histogram('taskmanager_request_duration_seconds',
+                          "Request latency", endpoint_labels),
+        requests=Counter('taskmanager_requests_total', "Requests",
+                         endpoint_labels + ('method', 'status')),
+        errors=Counter('taskmanager_request_errors_total', "Requests answered with a 5xx status",
+                       endpoint_labels),
+        rate_limited=Counter('taskmanager_rate_limited_total',
+                             "Requests rejected by the rate limiter", endpoint_labels),
+        pool_checked_out=Gauge('taskmanager_db_pool_checked_out',
+                               "Database connections in use", multiprocess_mode='livesum'),
+        pool_overflow=Gauge('taskmanager_db_pool_overflow',
+                            "Database connections opened beyond the pool size",
+                            multiprocess_mode='livesum'),
+        pool_size=Gauge('taskmanager_db_pool_size', "Configured database pool size",
+                        multiprocess_mode='livesum'),
+        pool_max_overflow=Gauge('taskmanager_db_pool_max_overflow',
+                                "Configured database pool overflow",
+                                multiprocess_mode='livesum'),
+        cache=Counter('taskmanager_cache_events_total', "Cache lookups and invalidations",
+                      ('cache', 'event')),
+    )
+    return _metrics
+
+
+# Seconds between two additions of the cache counters to the metrics of a process
+CACHE_SYNC_INTERVAL = 1.0
+
+
+def _get_state(app: Flask) -> Dict[str, Any]:
+    """Get the per-process state of an application's metrics."""
+    return app.extensions.setdefault('metrics', {'pid': None, 'cache_stats': {}, 'synced': 0.0})
+
+
+def _start_process(app: Flask, state: Dict[str, Any]) -> None:
+    """Record the configured pool limits the first time a process serves a request."""
+    metrics = _get_metrics()
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    if 'pool_size' in options:
+        metrics['pool_size'].set(options['pool_size'])
+    if 'max_overflow' in options:
+        metrics['pool_max_overflow'].set(options['max_overflow'])
+    state['pid'] = os.getpid()
+
+
+def _sync_cache_stats(app: Flask, state: Dict[str, Any]) -> None:
+    """Add the cache counters incremented since the previous sync to the metrics."""
+    from taskmanager.user_cache import get_user_cache_stats
+
+    counter = _get_metrics()['cache']
+    last = state['cache_stats']
+    current = {'shared': app.extensions['cache'].get_stats(), 'user': get_user_cache_stats()}
+    for cache, stats in current.items():
+        previous = last.get(cache, {})
+        for name, value in stats.items():
+            delta = value - previous.get(name, 0)
+            if delta > 0 and name != 'size':
+                counter.labels(cache, name).inc(delta)
+    state['cache_stats'] = current
+
+
+# Labelled metrics of each (endpoint, method, status), looked up once per process
+_children: Dict[Tuple[Optional[str], str, int], Tuple[Any, ...]] = {}
+
+
+def _get_children(endpoint: Optional[str], method: str, status: int) -> Tuple[Any, ...]:
+    """Get the latency histogram and the counters of a kind of request."""
+    key = (endpoint, method, status)
+    children = _children.get(key)
+    if children is None:
+        metrics = _get_metrics()
+        blueprint = (endpoint.rpartition('.')[0] if endpoint else None) or 'none'
+        labels = (blueprint, endpoint or 'none')
+        counter = None
+        if status >= 500:
+            counter = metrics['errors'].labels(*labels)
+        elif status == 429:
+            counter = metrics['rate_limited'].labels(*labels)
+        children = _children[key] = (
+            metrics['latency'].labels(*labels),
+            metrics['requests'].labels(*labels, method, str(status)),
+            counter,
+        )
+    return children
+
+
+def _watch_pool(engine: Engine, metrics: Dict[str, Any]) -> None:
+    """Keep the pool gauges up to date as an engine's connections are checked out and in."""
+
+    def update_overflow() -> None:
+        # engine.pool is replaced when a forked worker disposes the engine
+        overflow = getattr(engine.pool, 'overflow', None)
+        if overflow is not None:
+            metrics['pool_overflow'].set(max(0, overflow()))
+
+    @event.listens_for(engine, 'checkout')
+    def checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        metrics['pool_checked_out'].inc()
+        update_overflow()
+
+    @event.listens_for(engine, 'checkin')
+    def checkin(dbapi_connection, connection_record) -> None:
+        metrics['pool_checked_out'].dec()
+        update_overflow()
+
+
+def _start_request(sender: Flask, **extra: Any) -> None:
+    """Note when a request starts."""
+    _request_start.set(time.perf_counter())
+
+
+def _record_request(response: Response) -> Response:
+    """Record the latency and outcome of a request."""
+    start = _request_start.get()
+    if start is None:
+        return response
+    now = time.perf_counter()
+    latency, requests, counter = _get_children(request.endpoint, request.method,
+                                               response.status_code)
+    latency.observe(now - start)
+    requests.inc()
+    if counter is not None:
+        counter.inc()
+
+    app = current_app._get_current_object()
+    state = _get_state(app)
+    if state['pid'] != os.getpid():
+        _start_process(app, state)
+    if now - state['synced'] >= CACHE_SYNC_INTERVAL:
+        state['synced'] = now
+        _sync_cache_stats(app, state)
+    return response
+
+
+def _end_request(exc: Optional[BaseException]) -> None:
+    """Forget the start of a request."""
+    _request_start.set(None)
+
+
+def render_metrics() -> Response:
+    """
+    Render the metrics in the Prometheus text format.
+
+    Returns:
+        The response, aggregating every worker in multiprocess mode
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    registry = REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """
+    WSGI middleware answering GET requests to the metrics path before Flask, so scrapes
+    skip the session, Talisman and the rate limiter like the health probes.
+    """
+
+    def __init__(self, path: str, wsgi_app: Callable):
+        self.path = path
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if environ.get('PATH_INFO') != self.path or environ.get('REQUEST_METHOD') != 'GET':
+            return self.wsgi_app(environ, start_response)
+        return render_metrics()(environ, start_response)
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Record the metrics of an application and serve them at METRICS_PATH, unless
+    METRICS_ENABLED is off or prometheus_client is not installed.
+
+    Args:
+        app: The Flask application
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    try:
+        metrics = _get_metrics()
+    except ImportError:
+        app.logger.warning("prometheus_client n'est pas installé, les métriques sont désactivées")
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _watch_pool(engine, metrics)
+
+    request_started.connect(_start_request, app)
+    app.after_request(_record_request)
+    app.teardown_request(_end_request)
+    app.wsgi_app = MetricsMiddleware(app.config.get('METRICS_PATH', '/metrics'), app.wsgi_app)
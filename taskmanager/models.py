@@ -2,12 +2,27 @@ from datetime import datetime
 from taskmanager import db
 from typing import List, Optional
 from enum import Enum
+from sqlalchemy import text
 
 class UserRole(str, Enum):
     """Enum for user roles."""
     USER = "user"
     ADMIN = "admin"
 
+def _active_tasks_index(name: str, *columns) -> db.Index:
+    """
+    Create an index on tasks that only covers rows that are not soft-deleted.
+
+    Listing queries always filter on is_deleted = false, so a partial index stays
+    smaller than the table and still matches every listing query shape.
+    """
+    return db.Index(
+        name,
+        *columns,
+        sqlite_where=text('is_deleted = 0'),
+        postgresql_where=text('is_deleted = false')
+    )
+
 class Personne(db.Model):
     """User model representing a person in the system."""
 
@@ -16,14 +31,16 @@ class Personne(db.Model):
     password = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False, default=UserRole.USER)
     email = db.Column(db.String(150), unique=True, nullable=True)
-    bio = db.Column(db.Text, nullable=True)
+    # Only the profile pages show the bio, it is loaded on first access
+    bio = db.deferred(db.Column(db.Text, nullable=True))
     profile_picture = db.Column(db.String(200), nullable=True, default='default.jpg')
     notification_preferences = db.Column(db.Boolean, default=True)  # For email notifications
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    taches = db.relationship('Tache', backref='personne', lazy=True, cascade="all, delete-orphan")
+    # Relationships (tasks are deleted by the database, see utils.delete_user)
+    taches = db.relationship('Tache', backref='personne', lazy=True, cascade="all, delete-orphan",
+                             passive_deletes=True)
 
     def __repr__(self) -> str:
         """String representation of the user."""
@@ -45,10 +62,16 @@ class Categorie(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Foreign keys
-    personne_id = db.Column(db.Integer, db.ForeignKey('personne.id'), nullable=False)
+    personne_id = db.Column(db.Integer, db.ForeignKey('personne.id', ondelete='CASCADE'),
+                            nullable=False)
+
+    # Relationships (tasks are detached by the database, see utils.delete_category)
+    taches = db.relationship('Tache', backref='categorie', lazy=True, passive_deletes=True)
 
-    # Relationships
-    taches = db.relationship('Tache', backref='categorie', lazy=True)
+    # Indexes (categories are always listed per user, ordered by name)
+    __table_args__ = (
+        db.Index('ix_categorie_personne_nom', personne_id, nom),
+    )
 
     def __repr__(self) -> str:
         """String representation of the category."""
@@ -69,8 +92,29 @@ class Tache(db.Model):
     is_deleted = db.Column(db.Boolean, default=False)  # Soft delete flag
 
     # Foreign keys
-    personne_id = db.Column(db.Integer, db.ForeignKey('personne.id'), nullable=False)
-    categorie_id = db.Column(db.Integer, db.ForeignKey('categorie.id'), nullable=True)
+    personne_id = db.Column(db.Integer, db.ForeignKey('personne.id', ondelete='CASCADE'),
+                            nullable=False)
+    categorie_id = db.Column(db.Integer, db.ForeignKey('categorie.id', ondelete='SET NULL'),
+                             nullable=True)
+
+    # Indexes matching the task listing query shapes (see utils.get_tasks_optimized)
+    __table_args__ = (
+        # User listing, default sort: NULL due dates last, id as tie-breaker
+        _active_tasks_index(
+            'ix_tache_personne_due_date', personne_id, due_date.is_(None), due_date, id
+        ),
+        _active_tasks_index('ix_tache_personne_created_at', personne_id, created_at, id),
+        # Status/priority filters and the per-status statistics
+        _active_tasks_index('ix_tache_personne_status', personne_id, status),
+        _active_tasks_index('ix_tache_personne_priority', personne_id, priority),
+        # Admin listing across all users
+        _active_tasks_index('ix_tache_due_date', due_date.is_(None), due_date, id),
+        _active_tasks_index('ix_tache_created_at', created_at, id),
+        # Category filter and category deletion
+        db.Index('ix_tache_categorie_id', categorie_id),
+        # Incremental sync, soft-deleted tasks included as tombstones
+        db.Index('ix_tache_personne_updated_at', personne_id, updated_at, id),
+    )
 
     def __repr__(self) -> str:
         """String representation of the task."""
@@ -85,3 +129,38 @@ class Tache(db.Model):
         """Mark the task as deleted without removing it from the database."""
         self.is_deleted = True
         db.session.commit()
+
+
+class TaskStats(db.Model):
+    """
+    Per-user task statistics, maintained incrementally (see taskmanager.stats).
+
+    The counters only cover tasks that are not soft-deleted. The overdue counter is
+    recomputed daily, since a task becomes overdue without any write to its row.
+    """
+
+    __tablename__ = 'task_stats'
+
+    personne_id = db.Column(
+        db.Integer, db.ForeignKey('personne.id', ondelete='CASCADE'), primary_key=True
+    )
+    total = db.Column(db.Integer, default=0, nullable=False)
+    pending = db.Column(db.Integer, default=0, nullable=False)
+    in_progress = db.Column(db.Integer, default=0, nullable=False)
+    completed = db.Column(db.Integer, default=0, nullable=False)
+    overdue = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of the statistics."""
+        return f"<TaskStats {self.personne_id}>"
+
+    def to_dict(self) -> dict:
+        """Get the statistics as a dictionary."""
+        return {
+            'total': self.total,
+            'pending': self.pending,
+            'in_progress': self.in_progress,
+            'completed': self.completed,
+            'overdue': self.overdue,
+        }
@@ -0,0 +1,70 @@
+"""Read-only row objects for the listing pages."""
+
+from datetime import datetime
+from typing import Any, NamedTuple, Optional, Sequence
+
+
+class CategoryRow(NamedTuple):
+    """The category columns a task listing displays."""
+
+    id: int
+    nom: str
+    couleur: str
+
+
+class UserRow(NamedTuple):
+    """The user columns a task listing displays."""
+
+    id: int
+    nom: str
+
+
+class TaskRow(NamedTuple):
+    """
+    Immutable, slotted view of a task for listing pages.
+
+    It exposes the attributes of Tache the listing templates read, without an ORM
+    instance: no identity map entry, no change tracking and no lazy loading. The
+    description is not part of it.
+    """
+
+    id: int
+    titre: str
+    status: str
+    priority: str
+    due_date: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    is_deleted: bool
+    personne_id: int
+    categorie_id: Optional[int]
+    categorie: Optional[CategoryRow] = None
+    personne: Optional[UserRow] = None
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any], with_user: bool = False) -> 'TaskRow':
+        """
+        Build a task row from a result row of the columns of TASK_ROW_COLUMNS, followed
+        by the category columns and, with_user, the user name.
+
+        Args:
+            row: The result row
+            with_user: Whether the row ends with the owner's name
+
+        Returns:
+            The task row
+        """
+        values = tuple(row)
+        fields = len(TASK_ROW_COLUMNS)
+        task = values[:fields]
+        categorie_id, categorie_nom, categorie_couleur = values[fields:fields + 3]
+        categorie = None
+        if categorie_id is not None:
+            categorie = CategoryRow(categorie_id, categorie_nom, categorie_couleur)
+        personne = UserRow(task[_PERSONNE_ID], values[fields + 3]) if with_user else None
+        return cls(*task, categorie, personne)
+
+
+# The names of the Tache columns selected for a TaskRow, in field order
+TASK_ROW_COLUMNS = TaskRow._fields[:10]
+_PERSONNE_ID = TASK_ROW_COLUMNS.index('personne_id')
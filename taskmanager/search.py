@@ -0,0 +1,224 @@
+"""Full-text search backends for task titles and descriptions."""
+
+import re
+from typing import Any, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import DDL, event, func, literal, literal_column, table, column
+from taskmanager import db
+from taskmanager.models import Tache
+
+# Common French inflection suffixes, longest first. Query terms are reduced to their
+# stem and matched as prefixes, so "documents" also finds "documentation".
+FRENCH_SUFFIXES = (
+    'issements', 'issement', 'ements', 'ement', 'ations', 'ation', 'atrices', 'atrice',
+    'ateurs', 'ateur', 'euses', 'euse', 'eurs', 'eur', 'ités', 'ité', 'ives', 'ive',
+    'iques', 'ique', 'ables', 'able', 'ances', 'ance', 'ences', 'ence',
+    'aient', 'erons', 'erez', 'eront', 'erai', 'eras', 'era', 'ions', 'iez',
+    'ées', 'ée', 'és', 'er', 'ez', 'es', 'é', 'e', 's', 'x'
+)
+MIN_STEM_LENGTH = 3
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# SQLite FTS5 index kept in sync with the tache table by triggers. Only tasks that are
+# not soft-deleted are indexed.
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tache_fts USING fts5("
+    "titre, description, content='tache', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tache_fts_ai AFTER INSERT ON tache "
+    "WHEN coalesce(new.is_deleted, 0) = 0 BEGIN "
+    "INSERT INTO tache_fts(rowid, titre, description) "
+    "VALUES (new.id, new.titre, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tache_fts_ad AFTER DELETE ON tache "
+    "WHEN coalesce(old.is_deleted, 0) = 0 BEGIN "
+    "INSERT INTO tache_fts(tache_fts, rowid, titre, description) "
+    "VALUES ('delete', old.id, old.titre, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tache_fts_au AFTER UPDATE OF titre, description, is_deleted "
+    "ON tache BEGIN "
+    "INSERT INTO tache_fts(tache_fts, rowid, titre, description) "
+    "SELECT 'delete', old.id, old.titre, old.description WHERE coalesce(old.is_deleted, 0) = 0; "
+    "INSERT INTO tache_fts(rowid, titre, description) "
+    "SELECT new.id, new.titre, new.description WHERE coalesce(new.is_deleted, 0) = 0; END",
+]
+SQLITE_FTS_DROP_DDL = ["DROP TABLE IF EXISTS tache_fts"]
+
+# PostgreSQL generated tsvector column (French configuration) with a partial GIN index
+POSTGRESQL_FTS_DDL = [
+    "ALTER TABLE tache ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('french', coalesce(titre, '')), 'A') || "
+    "setweight(to_tsvector('french', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tache_search_vector ON tache "
+    "USING GIN (search_vector) WHERE is_deleted = false",
+]
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(Tache.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in SQLITE_FTS_DROP_DDL:
+    event.listen(Tache.__table__, 'before_drop', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in POSTGRESQL_FTS_DDL:
+    event.listen(Tache.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+
+
+def stem_french(word: str) -> str:
+    """
+    Reduce a French word to a crude stem by stripping a common inflection suffix.
+
+    Args:
+        word: The lowercase word to stem
+
+    Returns:
+        The stem, never shorter than MIN_STEM_LENGTH characters
+    """
+    for suffix in FRENCH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(term: str) -> List[str]:
+    """
+    Split a search term into lowercase words.
+
+    Args:
+        term: The search term entered by the user
+
+    Returns:
+        The words of the term
+    """
+    return [word.lower() for word in WORD_PATTERN.findall(term)]
+
+
+class SearchBackend:
+    """Base search backend using a LIKE scan on the title and description."""
+
+    name = 'like'
+
+    def apply(self, query, term: str) -> Tuple[Any, Optional[Any]]:
+        """
+        Restrict a task query to the tasks matching a search term.
+
+        Args:
+            query: The task query to filter
+            term: The search term
+
+        Returns:
+            Tuple containing the filtered query and a rank expression (lower is more
+            relevant), or None if the backend cannot rank
+        """
+        search_pattern = f"%{term}%"
+        query = query.filter(
+            db.or_(
+                Tache.titre.ilike(search_pattern),
+                Tache.description.ilike(search_pattern)
+            )
+        )
+        return query, None
+
+    def rebuild(self) -> None:
+        """Rebuild the search index from the tache table."""
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Search backend using the SQLite FTS5 tache_fts table."""
+
+    name = 'sqlite_fts5'
+    fts = table('tache_fts', column('rowid'), column('rank'))
+
+    def build_match_query(self, term: str) -> Optional[str]:
+        """
+        Build an FTS5 MATCH expression with every stemmed word as a prefix.
+
+        Args:
+            term: The search term
+
+        Returns:
+            The MATCH expression, or None if the term has no words
+        """
+        words = tokenize(term)
+        if not words:
+            return None
+        return ' '.join('"{}"*'.format(stem_french(word).replace('"', '""')) for word in words)
+
+    def apply(self, query, term: str) -> Tuple[Any, Optional[Any]]:
+        """Restrict a task query to the tasks matching a search term, ranked by bm25."""
+        match_query = self.build_match_query(term)
+        if match_query is None:
+            return query, None
+        query = query.join(self.fts, self.fts.c.rowid == Tache.id).filter(
+            literal_column('tache_fts').op('MATCH')(literal(match_query))
+        )
+        return query, self.fts.c.rank
+
+    def rebuild(self) -> None:
+        """Rebuild the FTS5 index from the tasks that are not soft-deleted."""
+        for statement in SQLITE_FTS_DDL:
+            db.session.execute(db.text(statement))
+        db.session.execute(db.text("INSERT INTO tache_fts(tache_fts) VALUES ('delete-all')"))
+        db.session.execute(db.text(
+            "INSERT INTO tache_fts(rowid, titre, description) "
+            "SELECT id, titre, description FROM tache WHERE coalesce(is_deleted, 0) = 0"
+        ))
+        db.session.commit()
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """Search backend using the tsvector column and GIN index on PostgreSQL."""
+
+    name = 'postgresql_tsvector'
+    search_vector = literal_column('tache.search_vector')
+
+    def build_tsquery(self, term: str) -> Optional[str]:
+        """
+        Build a tsquery string matching every word as a prefix.
+
+        Args:
+            term: The search term
+
+        Returns:
+            The tsquery string, or None if the term has no words
+        """
+        words = tokenize(term)
+        if not words:
+            return None
+        return ' & '.join(f"{word}:*" for word in words)
+
+    def apply(self, query, term: str) -> Tuple[Any, Optional[Any]]:
+        """Restrict a task query to the tasks matching a search term, ranked by ts_rank_cd."""
+        tsquery_string = self.build_tsquery(term)
+        if tsquery_string is None:
+            return query, None
+        tsquery = func.to_tsquery('french', tsquery_string)
+        query = query.filter(self.search_vector.op('@@')(tsquery))
+        return query, -func.ts_rank_cd(self.search_vector, tsquery)
+
+    def rebuild(self) -> None:
+        """Create the generated column and index if missing (the column is always in sync)."""
+        for statement in POSTGRESQL_FTS_DDL:
+            db.session.execute(db.text(statement))
+        db.session.commit()
+
+
+BACKENDS = {
+    'like': SearchBackend,
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Get the search backend configured by SEARCH_BACKEND.
+
+    With the default "auto" setting, the backend matching the database dialect is used,
+    falling back to a LIKE scan on other databases.
+
+    Returns:
+        The search backend
+    """
+    name = current_app.config.get('SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = db.session.get_bind().dialect.name
+    return BACKENDS.get(name, SearchBackend)()
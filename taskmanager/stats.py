@@ -0,0 +1,278 @@
+"""Materialized per-user task statistics, maintained incrementally on flush."""
+
+from collections import Counter
+from datetime import date, datetime, time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, case, event, func, inspect, select
+from sqlalchemy.orm import Session
+from taskmanager import db
+from taskmanager.models import Personne, Tache, TaskStats
+
+STATUSES = ('pending', 'in_progress', 'completed')
+STAT_COLUMNS = ('total',) + STATUSES + ('overdue',)
+
+# Attributes a task's contribution to the statistics depends on. Their previous value
+# must be known on flush, even when they are set on an expired instance.
+TRACKED_ATTRIBUTES = ('personne_id', 'status', 'is_deleted', 'due_date')
+
+
+def overdue_cutoff() -> datetime:
+    """
+    Get the instant before which a due date is overdue (today at midnight, UTC).
+
+    Returns:
+        The cutoff datetime
+    """
+    return datetime.combine(datetime.utcnow().date(), time.min)
+
+
+def _contribution(status: Optional[str], is_deleted: Optional[bool],
+                  due_date: Optional[date], cutoff: datetime) -> Counter:
+    """
+    Get the counters a single task adds to its owner's statistics.
+
+    Args:
+        status: The status of the task
+        is_deleted: The soft delete flag of the task
+        due_date: The due date of the task
+        cutoff: The overdue cutoff
+
+    Returns:
+        The counter increments of the task
+    """
+    counts = Counter()
+    if type(due_date) is date:
+        # Forms may assign a plain date before the column round-trips to a datetime
+        due_date = datetime.combine(due_date, time.min)
+    if is_deleted:
+        return counts
+    counts['total'] = 1
+    if status in STATUSES:
+        counts[status] = 1
+    if status != 'completed' and due_date is not None and due_date < cutoff:
+        counts['overdue'] = 1
+    return counts
+
+
+def _stats_select(cutoff: datetime, user_ids: Optional[Iterable[int]] = None):
+    """Build the aggregate recomputing the statistics from the tache table."""
+    columns = [
+        Personne.id.label('personne_id'),
+        func.count(Tache.id).label('total'),
+    ]
+    for status in STATUSES:
+        columns.append(func.coalesce(func.sum(case((Tache.status == status, 1), else_=0)), 0)
+                       .label(status))
+    columns.append(func.coalesce(func.sum(case(
+        (and_(Tache.status != 'completed', Tache.due_date < cutoff), 1), else_=0
+    )), 0).label('overdue'))
+
+    query = select(*columns).select_from(Personne).outerjoin(
+        Tache, and_(Tache.personne_id == Personne.id, Tache.is_deleted == False)
+    ).group_by(Personne.id)
+    if user_ids is not None:
+        query = query.where(Personne.id.in_(list(user_ids)))
+    return query
+
+
+def rebuild_task_stats(connection, user_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute the statistics from scratch with a single INSERT ... SELECT.
+
+    Bulk statements that bypass the ORM (query.update, table inserts) must call this
+    for the users they touched.
+
+    Args:
+        connection: The connection (or session) to run the statements on
+        user_ids: The users to rebuild, or None for every user
+    """
+    stats = TaskStats.__table__
+    delete = stats.delete()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        delete = delete.where(stats.c.personne_id.in_(user_ids))
+    connection.execute(delete)
+    connection.execute(stats.insert().from_select(
+        ['personne_id'] + list(STAT_COLUMNS), _stats_select(overdue_cutoff(), user_ids)
+    ))
+
+
+def recompute_overdue() -> int:
+    """
+    Recompute the overdue counter of every user, meant to run daily after midnight.
+
+    Tasks only become overdue when the date changes, so between two runs the counter is
+    kept exact by the incremental maintenance.
+
+    Returns:
+        The number of statistics rows updated
+    """
+    stats = TaskStats.__table__
+    overdue = select(func.count(Tache.id)).where(
+        Tache.personne_id == stats.c.personne_id,
+        Tache.is_deleted == False,
+        Tache.status != 'completed',
+        Tache.due_date < overdue_cutoff()
+    ).scalar_subquery()
+    result = db.session.execute(
+        stats.update().values(overdue=overdue, updated_at=datetime.utcnow())
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def check_task_stats(repair: bool = True) -> Dict[int, Dict[str, Tuple[Optional[int], int]]]:
+    """
+    Compare the stored statistics with a full recomputation.
+
+    Args:
+        repair: Whether to replace every stored row with the recomputed values
+
+    Returns:
+        Dictionary mapping each user with drift to {column: (stored, expected)};
+        stored is None when the user has no statistics row
+    """
+    expected = {
+        row.personne_id: {column: getattr(row, column) for column in STAT_COLUMNS}
+        for row in db.session.execute(_stats_select(overdue_cutoff()))
+    }
+    stored = {row.personne_id: row.to_dict() for row in TaskStats.query.all()}
+
+    drift = {}
+    for user_id in expected.keys() | stored.keys():
+        values = stored.get(user_id)
+        fresh = expected.get(user_id)
+        if values is None:
+            diff = {column: (None, fresh[column]) for column in STAT_COLUMNS}
+        elif fresh is None:
+            # Statistics left behind by a deleted user
+            diff = {column: (values[column], 0) for column in STAT_COLUMNS}
+        else:
+            diff = {
+                column: (values[column], fresh[column])
+                for column in STAT_COLUMNS if values[column] != fresh[column]
+            }
+        if diff:
+            drift[user_id] = diff
+
+    if repair:
+        rebuild_task_stats(db.session)
+        db.session.commit()
+    return drift
+
+
+def compute_user_task_stats(connection, user_id: int) -> Dict[str, int]:
+    """
+    Compute the statistics of a user from the tache table, without storing them.
+
+    Args:
+        connection: The connection (or session) to run the query on
+        user_id: The ID of the user
+
+    Returns:
+        Dictionary with total, pending, in_progress, completed and overdue counts
+    """
+    row = connection.execute(_stats_select(overdue_cutoff(), [user_id])).first()
+    if row is None:
+        return dict.fromkeys(STAT_COLUMNS, 0)
+    return {column: getattr(row, column) for column in STAT_COLUMNS}
+
+
+def get_user_task_stats(user_id: int) -> Dict[str, int]:
+    """
+    Get the statistics of a user with a primary key lookup.
+
+    Users without a statistics row get them computed from their tasks. Reads never
+    write: the row is built by the next flush of one of the user's tasks, or by the
+    check-task-stats command.
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        Dictionary with total, pending, in_progress, completed and overdue counts
+    """
+    stats = db.session.get(TaskStats, user_id)
+    if stats is None:
+        return compute_user_task_stats(db.session, user_id)
+    return stats.to_dict()
+
+
+def _previous_value(task: Tache, key: str):
+    """Get the value an attribute had before the pending changes."""
+    history = inspect(task).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(task, key)
+
+
+@event.listens_for(Session, 'after_flush')
+def _update_stats_after_flush(session: Session, flush_context) -> None:
+    """Apply the counter deltas of the flushed tasks to the statistics rows."""
+    deltas: Dict[int, Counter] = {}
+    deleted_users = set()
+    cutoff = None
+
+    def add(user_id, counts: Counter, sign: int) -> None:
+        for column, value in counts.items():
+            deltas.setdefault(user_id, Counter())[column] += sign * value
+
+    for obj in session.new:
+        if isinstance(obj, Tache):
+            cutoff = cutoff or overdue_cutoff()
+            add(obj.personne_id, _contribution(obj.status, obj.is_deleted, obj.due_date, cutoff), 1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Tache) and session.is_modified(obj, include_collections=False):
+            cutoff = cutoff or overdue_cutoff()
+            old = {key: _previous_value(obj, key) for key in TRACKED_ATTRIBUTES}
+            add(old['personne_id'],
+                _contribution(old['status'], old['is_deleted'], old['due_date'], cutoff), -1)
+            add(obj.personne_id, _contribution(obj.status, obj.is_deleted, obj.due_date, cutoff), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Tache):
+            cutoff = cutoff or overdue_cutoff()
+            old = {key: _previous_value(obj, key) for key in TRACKED_ATTRIBUTES}
+            add(old['personne_id'],
+                _contribution(old['status'], old['is_deleted'], old['due_date'], cutoff), -1)
+        elif isinstance(obj, Personne):
+            deleted_users.add(obj.id)
+
+    if not deltas and not deleted_users:
+        return
+
+    connection = session.connection()
+    stats = TaskStats.__table__
+    missing = []
+    for user_id, counts in deltas.items():
+        counts = {column: value for column, value in counts.items() if value}
+        if user_id in deleted_users or not counts:
+            continue
+        result = connection.execute(
+            stats.update()
+            .where(stats.c.personne_id == user_id)
+            .values(updated_at=datetime.utcnow(),
+                    **{column: stats.c[column] + value for column, value in counts.items()})
+        )
+        if result.rowcount == 0:
+            missing.append(user_id)
+    # Users without a row yet get it built from the table, which already includes this flush
+    rebuild_task_stats(connection, missing)
+    if deleted_users:
+        connection.execute(stats.delete().where(stats.c.personne_id.in_(deleted_users)))
+
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    """No-op set listener, registered with active_history to load previous values."""
+    return value
+
+
+for _key in TRACKED_ATTRIBUTES:
+    event.listen(getattr(Tache, _key), 'set', _track_previous_value,
+                 active_history=True, retval=True)
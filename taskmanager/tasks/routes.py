@@ -1,4 +1,7 @@
-from flask import render_template, redirect, url_for, session, request, current_app
+from flask import (
+    render_template, redirect, url_for, session, request, current_app, jsonify,
+    stream_with_context
+)
 from taskmanager import db
 from taskmanager.models import Tache, Personne
 from taskmanager.forms import TacheForm
@@ -11,11 +14,22 @@ from taskmanager.utils import (
     populate_task_from_form, 
     save_task,
     get_tasks_optimized,
-    get_admin_tasks_optimized
+    get_admin_tasks_optimized,
+    get_page_cursors,
+    bulk_update_tasks,
+    count_bulk_outcomes,
+    get_user_names,
+    get_user_categories,
+    get_lookup_choices
 )
-from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError
+from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError, ValidationError
+from taskmanager.export import export_tasks, EXPORT_FORMATS
+from taskmanager.importer import import_tasks, IMPORT_FORMATS
+from werkzeug.exceptions import RequestEntityTooLarge
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+import io
+import os
 
 @tasks_bp.route('/')
 @login_required
@@ -26,6 +40,7 @@ def liste():
     # Get pagination parameters
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
+    cursor = request.args.get('cursor')
 
     # Get filter parameters
     status = request.args.get('status')
@@ -33,6 +48,7 @@ def liste():
     category_id = request.args.get('category_id')
     if category_id and category_id.isdigit():
         category_id = int(category_id)
+    search = request.args.get('search', '').strip() or None
 
     # Get sort parameters
     sort_by = request.args.get('sort_by', 'due_date')
@@ -46,13 +62,17 @@ def liste():
         status=status,
         priority=priority,
         category_id=category_id,
+        search_term=search,
         sort_by=sort_by,
-        sort_dir=sort_dir
+        sort_dir=sort_dir,
+        cursor=cursor,
+        count_strategy=current_app.config['TASK_COUNT_STRATEGY'],
+        load='rows'
     )
+    prev_cursor, next_cursor = get_page_cursors(taches, sort_by, sort_dir)
 
     # Get categories for filtering UI
-    from taskmanager.models import Categorie
-    categories = Categorie.query.filter_by(personne_id=personne_id).all()
+    categories = get_user_categories(personne_id)
 
     log_and_flash(f"Affichage de {len(taches)} tâches sur {total_count} pour l'utilisateur {personne_id} (page {page}/{total_pages})", 
                  level="debug", flash_category=None)
@@ -65,12 +85,15 @@ def liste():
             'page': page,
             'per_page': per_page,
             'total_count': total_count,
-            'total_pages': total_pages
+            'total_pages': total_pages,
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor
         },
         filters={
             'status': status,
             'priority': priority,
             'category_id': category_id,
+            'search': search,
             'sort_by': sort_by,
             'sort_dir': sort_dir
         }
@@ -84,6 +107,7 @@ def admin_liste():
     # Get pagination parameters
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
+    cursor = request.args.get('cursor')
 
     # Get filter parameters
     status = request.args.get('status')
@@ -94,6 +118,7 @@ def admin_liste():
     category_id = request.args.get('category_id')
     if category_id and category_id.isdigit():
         category_id = int(category_id)
+    search = request.args.get('search', '').strip() or None
 
     # Get sort parameters
     sort_by = request.args.get('sort_by', 'due_date')
@@ -107,17 +132,20 @@ def admin_liste():
         priority=priority,
         user_id=user_id,
         category_id=category_id,
+        search_term=search,
         sort_by=sort_by,
-        sort_dir=sort_dir
+        sort_dir=sort_dir,
+        cursor=cursor,
+        count_strategy=current_app.config['ADMIN_TASK_COUNT_STRATEGY'],
+        load='rows'
     )
+    prev_cursor, next_cursor = get_page_cursors(taches, sort_by, sort_dir, admin=True)
 
-    # Get all users for filtering UI and mapping user IDs to names
-    users = Personne.query.all()
-    user_names = {user.id: user.nom for user in users}
-
-    # Get all categories for filtering UI
-    from taskmanager.models import Categorie
-    categories = Categorie.query.all()
+    # Names of the page's task owners, and the (id, nom) options of the filters (None
+    # when the table is too large for a dropdown and a typeahead is shown instead)
+    user_names = get_user_names(tache.personne_id for tache in taches)
+    users = get_lookup_choices('personne')
+    categories = get_lookup_choices('categorie')
 
     log_and_flash(f"Affichage de {len(taches)} tâches sur {total_count} pour l'administrateur (page {page}/{total_pages})", 
                  level="debug", flash_category=None)
@@ -132,13 +160,16 @@ def admin_liste():
             'page': page,
             'per_page': per_page,
             'total_count': total_count,
-            'total_pages': total_pages
+            'total_pages': total_pages,
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor
         },
         filters={
             'status': status,
             'priority': priority,
             'user_id': user_id,
             'category_id': category_id,
+            'search': search,
             'sort_by': sort_by,
             'sort_dir': sort_dir
         }
@@ -297,3 +328,199 @@ def changer_statut(tache_id: int, nouveau_statut: str):
     except (ResourceNotFoundError, AuthorizationError) as e:
         log_and_flash(e.message, level="warning", flash_category="danger")
         return redirect(url_for('tasks.liste'))
+
+def _read_bulk_request() -> Tuple[List[int], str, Any]:
+    """
+    Read the task IDs, action and value of a bulk request (JSON body or form).
+
+    Returns:
+        Tuple containing the task IDs, the action and its value
+
+    Raises:
+        ValidationError: If the task IDs are not integers
+    """
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        task_ids, action, value = data.get('ids') or [], data.get('action'), data.get('value')
+    else:
+        task_ids = request.form.getlist('ids')
+        action, value = request.form.get('action'), request.form.get('value')
+    try:
+        return [int(task_id) for task_id in task_ids], action, value
+    except (TypeError, ValueError):
+        raise ValidationError("Identifiants de tâches invalides")
+
+def _bulk_response(user_id: Optional[int], redirect_endpoint: str):
+    """
+    Apply a bulk request and report the outcome of every task.
+
+    JSON requests get a JSON response with the per-task outcomes, form submissions get a
+    flash message and a redirect to the task list.
+
+    Args:
+        user_id: The user applying the action, or None for an administrator
+        redirect_endpoint: The endpoint to redirect form submissions to
+
+    Returns:
+        The JSON response or the redirect
+    """
+    try:
+        task_ids, action, value = _read_bulk_request()
+        outcomes = bulk_update_tasks(task_ids, action, value, user_id=user_id)
+    except ValidationError as e:
+        if request.is_json:
+            return jsonify({'error': e.message}), 400
+        log_and_flash(e.message, level="warning", flash_category="danger")
+        return redirect(url_for(redirect_endpoint))
+
+    summary = count_bulk_outcomes(outcomes)
+
+    if request.is_json:
+        return jsonify({
+            'action': action,
+            'results': {str(task_id): outcome for task_id, outcome in outcomes.items()},
+            **summary
+        })
+
+    log_and_flash(f"{summary['updated']} tâche(s) modifiée(s) ({action})")
+    if summary['not_found'] or summary['forbidden']:
+        log_and_flash(f"{summary['not_found'] + summary['forbidden']} tâche(s) ignorée(s)",
+                      level="warning", flash_category="warning")
+    return redirect(url_for(redirect_endpoint))
+
+@tasks_bp.route('/bulk', methods=['POST'])
+@login_required
+def bulk():
+    """Route for changing the status, deleting or re-categorizing many tasks at once."""
+    return _bulk_response(session['personne_id'], 'tasks.liste')
+
+@tasks_bp.route('/admin/bulk', methods=['POST'])
+@login_required
+@admin_required
+def admin_bulk():
+    """Admin route for changing many tasks at once regardless of ownership."""
+    return _bulk_response(None, 'tasks.admin_liste')
+
+def _export_response(filters: Dict[str, Any], filename: str, redirect_endpoint: str):
+    """
+    Stream the tasks matching the filters as a CSV or NDJSON download.
+
+    Args:
+        filters: The filters of export_tasks
+        filename: The download file name, without extension
+        redirect_endpoint: The endpoint to redirect to if the format is invalid
+
+    Returns:
+        The streamed response or the redirect
+    """
+    export_format = request.args.get('format', 'csv')
+    try:
+        chunks = export_tasks(export_format, current_app.config['EXPORT_BATCH_SIZE'], **filters)
+    except ValidationError as e:
+        log_and_flash(e.message, level="warning", flash_category="danger")
+        return redirect(url_for(redirect_endpoint))
+
+    current_app.logger.info(
+        f"Export {export_format} des tâches ({filters}) "
+        f"par l'utilisateur {session.get('personne_id')}"
+    )
+    response = current_app.response_class(
+        stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers['Content-Disposition'] = (
+        f"attachment; filename={filename}-{datetime.utcnow():%Y%m%d}.{export_format}"
+    )
+    # Let proxies pass the rows through as they are produced
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@tasks_bp.route('/export')
+@login_required
+def export():
+    """Route for downloading the current user's tasks, with the filters of the task list."""
+    return _export_response({
+        'status': request.args.get('status') or None,
+        'priority': request.args.get('priority') or None,
+        'user_id': session['personne_id'],
+        'category_id': request.args.get('category_id', type=int),
+        'search_term': request.args.get('search', '').strip() or None
+    }, 'taches', 'tasks.liste')
+
+@tasks_bp.route('/admin/export')
+@login_required
+@admin_required
+def admin_export():
+    """Admin route for downloading all tasks, with the filters of the admin task list."""
+    return _export_response({
+        'status': request.args.get('status') or None,
+        'priority': request.args.get('priority') or None,
+        'user_id': request.args.get('user_id', type=int),
+        'category_id': request.args.get('category_id', type=int),
+        'search_term': request.args.get('search', '').strip() or None
+    }, 'toutes-les-taches', 'tasks.admin_liste')
+
+# Content types of the raw import bodies
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+}
+
+@tasks_bp.route('/import', methods=['POST'])
+@login_required
+def import_taches():
+    """
+    Route for importing many tasks at once from a CSV or NDJSON file.
+
+    A file uploaded from the task list (field file, format taken from the format field
+    or the file extension) gets a flash message and a redirect; a raw text/csv or
+    application/x-ndjson body gets the JSON import report.
+
+    Bodies over IMPORT_MAX_BYTES are rejected. Without a Content-Length (chunked
+    uploads) the limit is only reached while reading, the batches imported by then are
+    kept.
+    """
+    # Checked against the Content-Length and enforced while reading the body
+    request.max_content_length = current_app.config['IMPORT_MAX_BYTES']
+    is_upload = request.mimetype == 'multipart/form-data'
+
+    try:
+        try:
+            upload = request.files.get('file')
+            if upload is not None:
+                extension = os.path.splitext(upload.filename or '')[1].lstrip('.').lower()
+                import_format = request.form.get('format') or extension
+                binary = upload.stream
+            else:
+                import_format = IMPORT_CONTENT_TYPES.get(request.mimetype,
+                                                         request.args.get('format'))
+                binary = io.BufferedReader(request.stream)
+            if import_format not in IMPORT_FORMATS:
+                raise ValidationError("Format d'import invalide")
+            stream = io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+            report = import_tasks(
+                stream,
+                import_format,
+                session['personne_id'],
+                batch_size=current_app.config['IMPORT_BATCH_SIZE'],
+                max_errors=current_app.config['IMPORT_MAX_ERRORS']
+            )
+        except UnicodeDecodeError:
+            raise ValidationError("Le fichier doit être encodé en UTF-8")
+        except RequestEntityTooLarge:
+            raise ValidationError("Le fichier est trop volumineux")
+    except ValidationError as e:
+        if not is_upload:
+            return jsonify({'error': e.message}), 400
+        log_and_flash(e.message, level="warning", flash_category="danger")
+        return redirect(url_for('tasks.liste'))
+
+    if not is_upload:
+        return jsonify(report)
+
+    log_and_flash(f"{report['imported']} tâche(s) importée(s)")
+    if report['failed']:
+        first = report['errors'][0] if report['errors'] else None
+        details = f" (ligne {first['line']}: {'; '.join(first['errors'])})" if first else ""
+        log_and_flash(f"{report['failed']} ligne(s) rejetée(s){details}",
+                      level="warning", flash_category="warning")
+    return redirect(url_for('tasks.liste'))
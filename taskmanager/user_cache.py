@@ -0,0 +1,236 @@
+"""Request-scoped and cross-request cache for the logged-in user."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, g, has_app_context, session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from taskmanager import db
+from taskmanager.cache import get_cache, table_tags
+from taskmanager.models import Personne
+
+_MISSING = object()
+
+
+class UserCache:
+    """
+    Process-level LRU cache of user rows with a time-to-live.
+
+    Entries are snapshots of the column values rather than ORM instances, so a cached
+    user can be attached to any request's session without sharing mutable state
+    between threads. Each entry records the shared cache tag versions of its user when
+    it was loaded: a commit writing the user in any worker bumps them, which makes the
+    entry stale in every process.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'request_hits': 0, 'process_hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def record(self, counter: str) -> None:
+        """Increment one of the hit/miss counters."""
+        with self._lock:
+            self.stats[counter] += 1
+
+    def get(self, user_id: int,
+            versions: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached column values of a user.
+
+        Args:
+            user_id: The ID of the user
+            versions: The current tag versions of the user
+
+        Returns:
+            The column values, or None if the user is not cached, the entry expired or
+            was stored with other tag versions
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            values, stored_versions, expires_at = entry
+            if expires_at < time.monotonic() or stored_versions != versions:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def put(self, user: Personne, versions: Optional[Dict[str, int]] = None) -> None:
+        """
+        Cache the column values of a loaded user.
+
+        Args:
+            user: The user to cache
+            versions: The tag versions of the user read before it was loaded, so that a
+                write committed in the meantime is not missed
+        """
+        # Deferred columns that were not loaded stay unloaded on the cached copy
+        unloaded = inspect(user).unloaded
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(Personne).column_attrs
+                  if attr.key not in unloaded}
+        with self._lock:
+            self._entries[user.id] = (values, versions, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """
+        Drop a user from the cache.
+
+        Args:
+            user_id: The ID of the user, or None to clear the whole cache
+        """
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+            self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get a copy of the counters along with the current number of entries."""
+        with self._lock:
+            return dict(self.stats, size=len(self._entries))
+
+
+def get_user_cache() -> UserCache:
+    """
+    Get the user cache of the current application.
+
+    Returns:
+        The user cache
+    """
+    return current_app.extensions['user_cache']
+
+
+def get_current_user() -> Optional[Personne]:
+    """
+    Get the logged-in user, loading it at most once per request.
+
+    The user is memoized on flask.g for the rest of the request. When USER_CACHE_ENABLED
+    is set, users are also kept in a process-level cache and attached to the request's
+    session without any query, after checking their tag versions in the shared cache.
+
+    Returns:
+        The logged-in user, or None if nobody is logged in or the user no longer exists
+    """
+    user_id = session.get('personne_id')
+    if user_id is None:
+        return None
+
+    cache = get_user_cache()
+    # The memo keeps the ID next to the user, reading it from an instance expired by a
+    # commit would issue a query
+    memo = g.get('_current_user', _MISSING)
+    if memo is not _MISSING and memo[0] == user_id:
+        cache.record('request_hits')
+        return memo[1]
+
+    user = None
+    versions = None
+    if current_app.config.get('USER_CACHE_ENABLED', False):
+        versions = get_cache().tag_versions(table_tags('personne', user_id))
+        values = cache.get(user_id, versions)
+        if values is not None:
+            cache.record('process_hits')
+            user = Personne(**values)
+            make_transient_to_detached(user)
+            user = db.session.merge(user, load=False)
+
+    if user is None:
+        cache.record('misses')
+        user = db.session.get(Personne, user_id)
+        if user is not None and current_app.config.get('USER_CACHE_ENABLED', False):
+            cache.put(user, versions)
+
+    g._current_user = (user_id, user)
+    return user
+
+
+def invalidate_cached_user(user_id: Optional[int] = None) -> None:
+    """
+    Drop a user from the request memo and the process-level cache.
+
+    Args:
+        user_id: The ID of the user, or None to clear every cached user
+    """
+    if not has_app_context():
+        return
+    get_user_cache().invalidate(user_id)
+    memo = g.get('_current_user', _MISSING)
+    if memo is not _MISSING and user_id in (None, memo[0]):
+        g.pop('_current_user')
+
+
+def get_user_cache_stats() -> Dict[str, int]:
+    """
+    Get the hit/miss counters of the user cache for monitoring.
+
+    Returns:
+        Dictionary with request_hits, process_hits, misses, invalidations and size
+    """
+    return get_user_cache().get_stats()
+
+
+class CurrentUserProxy:
+    """
+    Template proxy for the logged-in user, providing a Flask-Login like interface.
+
+    The proxy holds no state and only looks the user up, through get_current_user, when
+    one of its attributes is read. Templates that never touch current_user cost no
+    query, and the user loaded by a view is reused from the request memo.
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_authenticated(self) -> bool:
+        """Whether a user is logged in and still exists."""
+        if 'personne_id' not in session:
+            return False
+        return get_current_user() is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            # Jinja probes for protocols such as __html__, these must not hit the database
+            raise AttributeError(name)
+        user = get_current_user()
+        if user is None:
+            return None
+        return getattr(user, name)
+
+
+current_user_proxy = CurrentUserProxy()
+
+
+def init_user_cache(app: Flask) -> None:
+    """
+    Set up the user cache for an application.
+
+    Args:
+        app: The Flask application
+    """
+    app.extensions['user_cache'] = UserCache(
+        max_size=app.config.get('USER_CACHE_SIZE', 1024),
+        ttl=app.config.get('USER_CACHE_TTL', 5)
+    )
+
+    @app.teardown_request
+    def clear_current_user(exc: Optional[BaseException] = None) -> None:
+        """Forget the memoized user at the end of the request."""
+        g.pop('_current_user', None)
+
+
+@event.listens_for(Personne, 'after_update')
+@event.listens_for(Personne, 'after_delete')
+def _invalidate_on_write(mapper, connection, target: Personne) -> None:
+    """Invalidate a cached user whenever its row is updated or deleted."""
+    invalidate_cached_user(target.id)
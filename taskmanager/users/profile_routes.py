@@ -1,9 +1,10 @@
-from flask import render_template, redirect, url_for, flash, request, current_app, session
+from flask import render_template, redirect, url_for, flash, request, current_app, session, abort
 from werkzeug.security import check_password_hash, generate_password_hash
 from taskmanager import db
 from taskmanager.models import Personne
 from taskmanager.users import users_bp
 from taskmanager.auth.routes import login_required
+from taskmanager.user_cache import get_current_user
 from taskmanager.utils import log_and_flash
 from taskmanager.profile_form import ProfileForm
 from datetime import datetime
@@ -20,7 +21,9 @@ def profile():
         flash("Vous devez être connecté pour accéder à cette page.", "danger")
         return redirect(url_for('auth.connexion'))
     
-    user = Personne.query.get_or_404(user_id)
+    user = get_current_user()
+    if user is None:
+        abort(404)
     return render_template('users/profile.html', user=user)
 
 @users_bp.route('/profile/edit', methods=['GET', 'POST'])
@@ -32,7 +35,9 @@ def edit_profile():
         flash("Vous devez être connecté pour accéder à cette page.", "danger")
         return redirect(url_for('auth.connexion'))
     
-    user = Personne.query.get_or_404(user_id)
+    user = get_current_user()
+    if user is None:
+        abort(404)
     form = ProfileForm(user_id=user_id)
     
     # Pre-populate form with existing data
@@ -1,10 +1,10 @@
-from flask import render_template, redirect, url_for, flash, request, current_app, session
+from flask import render_template, redirect, url_for, flash, request, current_app, session, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
-from taskmanager import db
+from taskmanager import db, limiter
 from taskmanager.models import Personne, UserRole
 from taskmanager.users import users_bp
 from taskmanager.auth.routes import login_required, admin_required
-from taskmanager.utils import log_and_flash
+from taskmanager.utils import log_and_flash, delete_user, search_lookup
 from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError
 from taskmanager.profile_form import ProfileForm
 from datetime import datetime
@@ -23,6 +23,16 @@ def admin_liste():
                  level="debug", flash_category=None)
     return render_template('users/admin_liste.html', users=users, roles=UserRole)
 
+@users_bp.route('/admin/lookup')
+@login_required
+@admin_required
+@limiter.limit("120 per minute")
+def admin_lookup():
+    """Admin route returning the users whose name starts with q, for filter typeaheads."""
+    users = search_lookup('personne', request.args.get('q', ''),
+                          current_app.config['LOOKUP_RESULTS'])
+    return jsonify([{'id': user_id, 'nom': nom} for user_id, nom in users])
+
 @users_bp.route('/admin/edit/<int:user_id>', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -115,9 +125,9 @@ def admin_delete(user_id: int):
             flash("Vous ne pouvez pas supprimer votre propre compte.", "danger")
             return redirect(url_for('users.admin_liste'))
 
+        # Delete the user, their tasks and categories with set-based statements
         nom_user = user.nom
-        db.session.delete(user)
-        db.session.commit()
+        delete_user(user)
 
         log_and_flash(f"Utilisateur supprimé: {nom_user}", level="info")
         return redirect(url_for('users.admin_liste'))
@@ -1,13 +1,20 @@
 """Utility functions for the Task Manager application."""
 
 from flask import session, flash, current_app, redirect, url_for
-from typing import Optional, Tuple, Any, Dict, Union, List
-from sqlalchemy import func, desc, asc
-from sqlalchemy.orm import joinedload, contains_eager
+from typing import Optional, Tuple, Any, Dict, Iterable, Union, List, Callable
+from sqlalchemy import func, desc, asc, case, literal, update, delete, select
+from sqlalchemy.orm import joinedload, contains_eager, defer
 from taskmanager import db
 from taskmanager.models import Tache, Categorie, Personne
-from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError
+from taskmanager.exceptions import AuthorizationError, ResourceNotFoundError, ValidationError
+from taskmanager.search import get_search_backend
+from taskmanager.cache import get_cache, table_tags
+from taskmanager.stats import get_user_task_stats, rebuild_task_stats
+from taskmanager.rows import TaskRow, TASK_ROW_COLUMNS
 from markupsafe import escape
+from datetime import datetime
+import base64
+import json
 
 def get_task_by_id(task_id: int) -> Tache:
     """
@@ -113,48 +120,625 @@ def save_task(task: Tache, is_new: bool = False) -> None:
         db.session.add(task)
     db.session.commit()
 
+def delete_category(categorie: Categorie) -> int:
+    """
+    Delete a category, detaching its tasks with a single UPDATE.
+
+    The tasks are never loaded into the session, the schema's ON DELETE SET NULL is
+    mirrored explicitly for databases that do not enforce foreign keys (SQLite).
+
+    Args:
+        categorie: The category to delete
+
+    Returns:
+        The number of tasks detached from the category
+    """
+    # The new updated_at sends the detached tasks to sync clients and changes list ETags
+    result = db.session.execute(
+        update(Tache).where(Tache.categorie_id == categorie.id)
+        .values(categorie_id=None, updated_at=datetime.utcnow())
+    )
+    db.session.delete(categorie)
+    db.session.commit()
+    return result.rowcount
+
+def delete_user(user: Personne) -> int:
+    """
+    Delete a user along with their tasks and categories using set-based statements.
+
+    The schema cascades these deletions (ON DELETE CASCADE), the statements mirror it
+    for databases that do not enforce foreign keys and keep the tasks out of the
+    session.
+
+    Args:
+        user: The user to delete
+
+    Returns:
+        The number of tasks deleted
+    """
+    user_id = user.id
+    result = db.session.execute(delete(Tache).where(Tache.personne_id == user_id))
+    user_categories = select(Categorie.id).where(Categorie.personne_id == user_id)
+    db.session.execute(
+        update(Tache).where(Tache.categorie_id.in_(user_categories))
+        .values(categorie_id=None, updated_at=datetime.utcnow())
+    )
+    db.session.execute(delete(Categorie).where(Categorie.personne_id == user_id))
+    db.session.delete(user)
+    db.session.commit()
+    return result.rowcount
+
+def serialize_task(task: Tache) -> Dict[str, Any]:
+    """
+    Convert a task to a JSON-serializable dictionary.
+
+    Only the category ID is included, so serializing a page never loads categories.
+
+    Args:
+        task: The task to serialize
+
+    Returns:
+        Dictionary with the task fields, dates in ISO 8601 format
+    """
+    return {
+        'id': task.id,
+        'titre': task.titre,
+        'description': task.description,
+        'status': task.status,
+        'priority': task.priority,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'categorie_id': task.categorie_id,
+        'is_deleted': bool(task.is_deleted),
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'updated_at': task.updated_at.isoformat() if task.updated_at else None,
+    }
+
+# Bulk task operations
+
+TASK_STATUSES = ('pending', 'in_progress', 'completed')
+TASK_PRIORITIES = ('low', 'medium', 'high')
+BULK_ACTIONS = ('status', 'delete', 'categorize')
+
+def _bulk_values(action: str, value: Any,
+                 user_id: Optional[int]) -> Tuple[Dict[str, Any], Optional[int]]:
+    """
+    Validate a bulk action and get the column values it sets.
+
+    Args:
+        action: The bulk action (status, delete or categorize)
+        value: The new status, or the category ID (None to remove the category)
+        user_id: The user applying the action, or None for an administrator
+
+    Returns:
+        Tuple containing the column values and the owner tasks must have to be changed
+        (the category owner when re-categorizing), or None
+
+    Raises:
+        ValidationError: If the action or its value is invalid
+    """
+    if action == 'status':
+        if value not in TASK_STATUSES:
+            raise ValidationError("Statut invalide")
+        return {'status': value}, None
+    if action == 'delete':
+        return {'is_deleted': True}, None
+    if action == 'categorize':
+        if value in (None, ''):
+            return {'categorie_id': None}, None
+        try:
+            categorie = db.session.get(Categorie, int(value))
+        except (TypeError, ValueError):
+            categorie = None
+        if categorie is None or (user_id is not None and categorie.personne_id != user_id):
+            raise ValidationError("Catégorie invalide")
+        return {'categorie_id': categorie.id}, categorie.personne_id
+    raise ValidationError("Action invalide")
+
+def bulk_update_tasks(
+    task_ids: List[int],
+    action: str,
+    value: Any = None,
+    user_id: Optional[int] = None
+) -> Dict[int, str]:
+    """
+    Apply an action to many tasks with one ownership query, one UPDATE and one commit.
+
+    Statements that bypass the ORM do not fire the flush events, so the statistics of
+    the affected owners are refreshed here.
+
+    Args:
+        task_ids: The IDs of the tasks to change
+        action: The bulk action (status, delete or categorize)
+        value: The new status, or the category ID for categorize
+        user_id: The user applying the action (only their tasks are changed), or None
+            for an administrator
+
+    Returns:
+        Dictionary mapping each task ID to its outcome: updated, not_found or forbidden
+
+    Raises:
+        ValidationError: If the action, its value or the number of tasks is invalid
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        raise ValidationError("Aucune tâche sélectionnée")
+    max_ids = current_app.config.get('BULK_TASK_MAX_IDS', 1000)
+    if len(task_ids) > max_ids:
+        raise ValidationError(f"Vous ne pouvez pas modifier plus de {max_ids} tâches à la fois")
+    values, required_owner = _bulk_values(action, value, user_id)
+
+    owners = dict(db.session.query(Tache.id, Tache.personne_id).filter(
+        Tache.id.in_(task_ids),
+        Tache.is_deleted == False
+    ).all())
+
+    outcomes = {}
+    for task_id in task_ids:
+        owner = owners.get(task_id)
+        if owner is None:
+            outcomes[task_id] = 'not_found'
+        elif (user_id is not None and owner != user_id) or \
+                (required_owner is not None and owner != required_owner):
+            outcomes[task_id] = 'forbidden'
+        else:
+            outcomes[task_id] = 'updated'
+
+    forbidden = [task_id for task_id, outcome in outcomes.items() if outcome == 'forbidden']
+    if forbidden:
+        current_app.logger.warning(
+            f"Tentative de modification groupée non autorisée des tâches {forbidden} "
+            f"par l'utilisateur {session.get('personne_id')}"
+        )
+
+    allowed = [task_id for task_id, outcome in outcomes.items() if outcome == 'updated']
+    if allowed:
+        statement = update(Tache).where(
+            Tache.id.in_(allowed),
+            Tache.is_deleted == False
+        )
+        if user_id is not None:
+            statement = statement.where(Tache.personne_id == user_id)
+        db.session.execute(statement.values(updated_at=datetime.utcnow(), **values))
+
+        affected_users = {owners[task_id] for task_id in allowed}
+        rebuild_task_stats(db.session, affected_users)
+    db.session.commit()
+    return outcomes
+
+def count_bulk_outcomes(outcomes: Dict[int, str]) -> Dict[str, int]:
+    """
+    Count the outcomes of a bulk operation.
+
+    Args:
+        outcomes: The outcome of every task, as returned by bulk_update_tasks
+
+    Returns:
+        Dictionary with the number of updated, not_found and forbidden tasks
+    """
+    summary = {'updated': 0, 'not_found': 0, 'forbidden': 0}
+    for outcome in outcomes.values():
+        summary[outcome] += 1
+    return summary
+
 # Query optimization functions
 
-def get_admin_tasks_optimized(
-    page: int = 1, 
-    per_page: int = 10, 
+# Sort order of the custom CASE orderings (unknown values sort last)
+PRIORITY_ORDER = {'high': 1, 'medium': 2, 'low': 3}
+STATUS_ORDER = {'pending': 1, 'in_progress': 2, 'completed': 3}
+
+# How listing queries load tasks: full rows, only what the HTML listings display, or
+# read-only TaskRow tuples of those columns
+TASK_LOAD_MODES = ('full', 'list', 'rows')
+
+def _task_load_options(load: str) -> List[Any]:
+    """
+    Get the loader options of a task listing query.
+
+    The list mode defers the unbounded description column (loaded on first access if
+    ever needed) and loads only the name and color of the joined category.
+
+    Args:
+        load: The load mode (full, list or rows)
+
+    Returns:
+        The options to pass to Query.options, none in rows mode which selects
+        columns instead of entities (see _select_task_rows)
+
+    Raises:
+        ValueError: If the load mode is unknown
+    """
+    if load == 'rows':
+        return []
+    if load == 'full':
+        return [joinedload(Tache.categorie)]
+    if load == 'list':
+        return [
+            defer(Tache.description),
+            joinedload(Tache.categorie).load_only(Categorie.nom, Categorie.couleur)
+        ]
+    raise ValueError(f"Unknown task load mode: {load}")
+
+def _select_task_rows(query, with_user: bool = False):
+    """
+    Turn a task query into a query of the columns of TaskRow.
+
+    Args:
+        query: The filtered task query
+        with_user: Whether to select the owner's name, the query must already be
+            joined to Personne
+
+    Returns:
+        The column query, its rows are read with TaskRow.from_row
+    """
+    columns = [getattr(Tache, name) for name in TASK_ROW_COLUMNS]
+    columns += [Categorie.id, Categorie.nom, Categorie.couleur]
+    if with_user:
+        columns.append(Personne.nom)
+    return query.with_entities(*columns).outerjoin(
+        Categorie, Categorie.id == Tache.categorie_id
+    )
+
+# Task count strategies for paginated listings
+COUNT_STRATEGIES = ('exact', 'cached', 'approximate', 'probe')
+
+def _cached_count(query, cache_key: Tuple[Any, ...]) -> int:
+    """
+    Count the rows of a query, reusing a recent count for the same filters.
+
+    The counts live in the shared cache, tagged with the tasks of the user (or every
+    task for admin listings): a commit writing tasks in any worker invalidates them,
+    TASK_COUNT_CACHE_TTL only bounds the staleness of writes the tags miss.
+
+    Args:
+        query: The query to count
+        cache_key: The (user_id, filter tuple) key of the count
+
+    Returns:
+        The number of rows
+    """
+    return get_cache().get_or_set(
+        f"task_count:{cache_key!r}", query.count,
+        ttl=current_app.config.get('TASK_COUNT_CACHE_TTL', 60),
+        tags=table_tags('tache', cache_key[0])
+    )
+
+def _approximate_count(query, cache_key: Tuple[Any, ...]) -> int:
+    """
+    Estimate the rows of a query from the query planner.
+
+    Only PostgreSQL exposes row estimates; other databases fall back to a cached count.
+    Small estimates are replaced by an exact count, since counting is cheap there and
+    planner estimates are least accurate.
+
+    Args:
+        query: The query to count
+        cache_key: The key used by the cached count fallback
+
+    Returns:
+        The estimated number of rows
+    """
+    dialect = db.session.get_bind().dialect
+    if dialect.name != 'postgresql':
+        return _cached_count(query, cache_key)
+
+    compiled = query.statement.compile(dialect=dialect)
+    plan = db.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    estimate = int(plan[0]['Plan']['Plan Rows'])
+    if estimate < current_app.config.get('TASK_COUNT_EXACT_THRESHOLD', 1000):
+        return query.count()
+    return estimate
+
+def count_tasks(query, strategy: str, cache_key: Tuple[Any, ...]) -> int:
+    """
+    Count the rows of a filtered task query with the given strategy.
+
+    Args:
+        query: The filtered task query, without ordering
+        strategy: exact, cached or approximate
+        cache_key: The (user_id, filter tuple) key used by cached counts
+
+    Returns:
+        The number of rows
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy == 'exact':
+        return query.count()
+    if strategy == 'cached':
+        return _cached_count(query, cache_key)
+    if strategy == 'approximate':
+        return _approximate_count(query, cache_key)
+    raise ValueError(f"Unknown count strategy: {strategy}")
+
+def encode_cursor(values: List[Any], sort_by: str, sort_dir: str, backward: bool = False) -> str:
+    """
+    Encode the sort key of a row into an opaque pagination cursor.
+
+    Args:
+        values: The sort key values of the row, ending with the task ID
+        sort_by: The sort field the cursor was produced for
+        sort_dir: The sort direction the cursor was produced for
+        backward: Whether the cursor points to the previous page
+
+    Returns:
+        A URL-safe cursor string
+    """
+    payload = {
+        's': sort_by,
+        'd': sort_dir,
+        'b': backward,
+        'v': [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, sort_by: str, sort_dir: str) -> Tuple[List[Any], bool]:
+    """
+    Decode a pagination cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor string
+        sort_by: The sort field of the current request
+        sort_dir: The sort direction of the current request
+
+    Returns:
+        Tuple containing the sort key values and whether the cursor points backward
+
+    Raises:
+        ValidationError: If the cursor is malformed or was produced for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw.decode('utf-8'))
+        values = [
+            datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v
+            for v in payload['v']
+        ]
+        backward = bool(payload.get('b', False))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValidationError("Curseur de pagination invalide")
+
+    if payload.get('s') != sort_by or payload.get('d') != sort_dir:
+        raise ValidationError("Le curseur de pagination ne correspond pas au tri demandé")
+
+    return values, backward
+
+def _get_sort_keys(
+    sort_by: str,
+    sort_dir: str,
+    admin: bool = False,
+    rank: Optional[Any] = None
+) -> List[Tuple[Any, bool, Optional[Callable]]]:
+    """
+    Build the sort keys for a task listing.
+
+    Each key is a tuple of (SQL expression, descending flag, function extracting the
+    key value from a loaded task). The task ID is always appended as a tie-breaker so
+    that the ordering is total, which keyset pagination relies on. The search rank
+    cannot be read back from a task, so its key has no extractor.
+
+    Args:
+        sort_by: Field to sort by (due_date, created_at, priority, status, titre, user,
+            relevance)
+        sort_dir: Sort direction (asc or desc)
+        admin: Whether sorting by user name is allowed
+        rank: The search rank expression, required to sort by relevance
+
+    Returns:
+        List of sort keys
+    """
+    descending = sort_dir == 'desc'
+
+    if sort_by == 'due_date':
+        # Handle NULL due_dates with an explicit flag so they sort as a block
+        # (matches the expression index on (due_date IS NULL, due_date))
+        keys = [
+            (Tache.due_date.is_(None), descending, lambda t: t.due_date is None),
+            (Tache.due_date, descending, lambda t: t.due_date)
+        ]
+    elif sort_by == 'created_at':
+        keys = [(Tache.created_at, descending, lambda t: t.created_at)]
+    elif sort_by == 'priority':
+        # Custom priority ordering (high, medium, low)
+        unknown = len(PRIORITY_ORDER) + 1
+        keys = [(case(PRIORITY_ORDER, value=Tache.priority, else_=unknown), descending,
+                 lambda t: PRIORITY_ORDER.get(t.priority, unknown))]
+    elif sort_by == 'status':
+        # Custom status ordering (pending, in_progress, completed)
+        unknown = len(STATUS_ORDER) + 1
+        keys = [(case(STATUS_ORDER, value=Tache.status, else_=unknown), descending,
+                 lambda t: STATUS_ORDER.get(t.status, unknown))]
+    elif sort_by == 'user' and admin:
+        # Sort by user name
+        keys = [(Personne.nom, descending, lambda t: t.personne.nom)]
+    elif sort_by == 'relevance' and rank is not None:
+        # Best search matches first
+        keys = [(rank, descending, None)]
+    else:  # Default to title
+        keys = [(Tache.titre, descending, lambda t: t.titre)]
+
+    keys.append((Tache.id, descending, lambda t: t.id))
+    return keys
+
+def _keyset_condition(
+    sort_keys: List[Tuple[Any, bool, Callable]],
+    values: List[Any],
+    backward: bool = False
+):
+    """
+    Build the WHERE clause selecting the rows that follow a cursor.
+
+    The clause is the lexicographic comparison (k1 > v1) OR (k1 = v1 AND k2 > v2) ...
+    with the operator flipped for descending keys, so the database can seek directly
+    to the cursor position instead of scanning and discarding earlier rows.
+
+    Args:
+        sort_keys: The sort keys from _get_sort_keys
+        values: The sort key values stored in the cursor
+        backward: Whether to select the rows preceding the cursor
+
+    Returns:
+        A SQL boolean expression
+    """
+    conditions = []
+    equalities = []
+    for (expression, descending, _), value in zip(sort_keys, values):
+        if value is None:
+            # NULLs are grouped by the preceding flag key, only equality applies
+            equalities.append(expression.is_(None))
+            continue
+        if isinstance(value, bool):
+            # Flags such as (due_date IS NULL) are compared as bound booleans
+            value = literal(value)
+        if descending != backward:
+            conditions.append(db.and_(*equalities, expression < value))
+        else:
+            conditions.append(db.and_(*equalities, expression > value))
+        equalities.append(expression == value)
+    return db.or_(*conditions)
+
+def _paginate_tasks(
+    query,
+    sort_keys: List[Tuple[Any, bool, Callable]],
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    sort_by: str,
+    sort_dir: str,
+    count_strategy: Optional[str],
+    cache_key: Tuple[Any, ...],
+    select_page: Optional[Callable] = None
+) -> Tuple[List[Any], Optional[int], int]:
+    """
+    Sort, count and paginate a filtered task query.
+
+    Without a cursor, pages are fetched with LIMIT/OFFSET. With a cursor, the page is
+    fetched by seeking past the cursor position, so its cost does not depend on how
+    deep the page is.
+
+    With the probe count strategy no count is run at all: one extra row is fetched to
+    know whether a next page exists, the total count is None and the total number of
+    pages only reaches one past the current page.
+
+    Args:
+        query: The filtered task query
+        sort_keys: The sort keys from _get_sort_keys
+        page: The page number (1-indexed)
+        per_page: The number of items per page
+        cursor: An optional cursor from get_page_cursors
+        sort_by: The sort field, checked against the cursor
+        sort_dir: The sort direction, checked against the cursor
+        count_strategy: exact, cached, approximate or probe, defaults to TASK_COUNT_STRATEGY
+        cache_key: The (user_id, filter tuple) key used by cached counts
+        select_page: An optional function applied to the query after counting, to fetch
+            the page with other columns
+
+    Returns:
+        Tuple containing the tasks of the page, the total count and the total number of pages
+    """
+    if count_strategy is None:
+        count_strategy = current_app.config.get('TASK_COUNT_STRATEGY', 'exact')
+    if count_strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown count strategy: {count_strategy}")
+
+    # Get total count for pagination
+    total_count = None
+    if count_strategy != 'probe':
+        total_count = count_tasks(query, count_strategy, cache_key)
+    limit = per_page + 1 if count_strategy == 'probe' else per_page
+    if select_page is not None:
+        query = select_page(query)
+
+    backward = False
+    if cursor:
+        values, backward = decode_cursor(cursor, sort_by, sort_dir)
+        if len(values) != len(sort_keys):
+            raise ValidationError("Curseur de pagination invalide")
+        query = query.filter(_keyset_condition(sort_keys, values, backward))
+        query = query.order_by(*[
+            desc(expression) if descending != backward else asc(expression)
+            for expression, descending, _ in sort_keys
+        ])
+        tasks = query.limit(limit).all()
+    else:
+        query = query.order_by(*[
+            desc(expression) if descending else asc(expression)
+            for expression, descending, _ in sort_keys
+        ])
+
+        # Apply pagination
+        tasks = query.limit(limit).offset((page - 1) * per_page).all()
+
+    has_more = len(tasks) > per_page
+    tasks = tasks[:per_page]
+    if backward:
+        tasks.reverse()
+
+    if total_count is None:
+        # Going backward, the page we came from is still ahead
+        total_pages = page + 1 if has_more or backward else page
+    else:
+        total_pages = (total_count + per_page - 1) // per_page  # Ceiling division
+
+    return tasks, total_count, total_pages
+
+def get_page_cursors(
+    tasks: List[Tache],
+    sort_by: str = 'due_date',
+    sort_dir: str = 'asc',
+    admin: bool = False
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the cursors pointing to the pages before and after a page of tasks.
+
+    Args:
+        tasks: The tasks of the current page, as returned by the listing functions
+        sort_by: The sort field used to fetch the page
+        sort_dir: The sort direction used to fetch the page
+        admin: Whether the page comes from the admin listing
+
+    Returns:
+        Tuple containing the previous page cursor and the next page cursor,
+        or (None, None) if the page is empty or sorted by search relevance
+    """
+    if not tasks or sort_by == 'relevance':
+        return None, None
+
+    sort_keys = _get_sort_keys(sort_by, sort_dir, admin=admin)
+    first = [extract(tasks[0]) for _, _, extract in sort_keys]
+    last = [extract(tasks[-1]) for _, _, extract in sort_keys]
+    return (
+        encode_cursor(first, sort_by, sort_dir, backward=True),
+        encode_cursor(last, sort_by, sort_dir)
+    )
+
+def filter_tasks(
+    query,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     user_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    search_term: Optional[str] = None,
-    sort_by: str = 'due_date',
-    sort_dir: str = 'asc'
-) -> Tuple[List[Tache], int, int]:
+    search_term: Optional[str] = None
+) -> Tuple[Any, Optional[Any]]:
     """
-    Get all tasks with optimized queries, filtering, sorting, and pagination for admin view.
+    Apply the task listing filters to a query, excluding soft-deleted tasks.
 
     Args:
-        page: The page number (1-indexed)
-        per_page: The number of items per page
+        query: The task query to filter
         status: Filter by status (pending, in_progress, completed)
         priority: Filter by priority (low, medium, high)
-        user_id: Filter by user ID
+        user_id: Filter by owner
         category_id: Filter by category ID
-        search_term: Search term for task title or description
-        sort_by: Field to sort by (due_date, created_at, priority, status, titre)
-        sort_dir: Sort direction (asc or desc)
+        search_term: Full-text search term for task title or description
 
     Returns:
-        Tuple containing:
-        - List of tasks for the current page
-        - Total number of tasks matching the filters
-        - Total number of pages
+        Tuple containing the filtered query and the search rank expression, or None
     """
-    # Start with a query that eagerly loads the category and user to avoid N+1 queries
-    query = Tache.query.options(
-        joinedload(Tache.categorie),
-        joinedload(Tache.personne)
-    ).filter(
-        Tache.is_deleted == False
-    )
+    query = query.filter(Tache.is_deleted == False)
 
-    # Apply filters
     if status:
         query = query.filter(Tache.status == status)
 
@@ -167,68 +751,105 @@ def get_admin_tasks_optimized(
     if category_id:
         query = query.filter(Tache.categorie_id == category_id)
 
+    rank = None
     if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.filter(
-            db.or_(
-                Tache.titre.ilike(search_pattern),
-                Tache.description.ilike(search_pattern)
-            )
-        )
+        query, rank = get_search_backend().apply(query, search_term)
+    return query, rank
 
-    # Apply sorting
-    if sort_by == 'due_date':
-        # Handle NULL due_dates by sorting them last
-        if sort_dir == 'asc':
-            query = query.order_by(
-                Tache.due_date.is_(None).asc(),
-                Tache.due_date.asc()
-            )
-        else:
-            query = query.order_by(
-                Tache.due_date.is_(None).desc(),
-                Tache.due_date.desc()
-            )
-    elif sort_by == 'created_at':
-        query = query.order_by(
-            desc(Tache.created_at) if sort_dir == 'desc' else asc(Tache.created_at)
-        )
-    elif sort_by == 'priority':
-        # Custom priority ordering (high, medium, low)
-        priority_order = case(
-            {'high': 1, 'medium': 2, 'low': 3},
-            value=Tache.priority
-        )
-        query = query.order_by(
-            desc(priority_order) if sort_dir == 'desc' else asc(priority_order)
-        )
-    elif sort_by == 'status':
-        # Custom status ordering (pending, in_progress, completed)
-        status_order = case(
-            {'pending': 1, 'in_progress': 2, 'completed': 3},
-            value=Tache.status
-        )
-        query = query.order_by(
-            desc(status_order) if sort_dir == 'desc' else asc(status_order)
-        )
-    elif sort_by == 'user':
-        # Sort by user name
-        query = query.join(Personne).order_by(
-            desc(Personne.nom) if sort_dir == 'desc' else asc(Personne.nom)
-        )
-    else:  # Default to title
-        query = query.order_by(
-            desc(Tache.titre) if sort_dir == 'desc' else asc(Tache.titre)
-        )
+def get_tasks_version(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    user_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    search_term: Optional[str] = None
+) -> Tuple[Optional[datetime], int]:
+    """
+    Get a cheap version of the tasks matching the listing filters.
 
-    # Get total count for pagination
-    total_count = query.count()
-    total_pages = (total_count + per_page - 1) // per_page  # Ceiling division
+    Any insert, update or soft delete of a matching task changes the latest updated_at
+    or the count, so the pair can be used to validate cached listings.
 
-    # Apply pagination
-    tasks = query.limit(per_page).offset((page - 1) * per_page).all()
+    Args:
+        status: Filter by status (pending, in_progress, completed)
+        priority: Filter by priority (low, medium, high)
+        user_id: Filter by owner
+        category_id: Filter by category ID
+        search_term: Full-text search term for task title or description
 
-    return tasks, total_count, total_pages
+    Returns:
+        Tuple containing the latest updated_at (None without tasks) and the count
+    """
+    query, _ = filter_tasks(db.session.query(Tache), status, priority, user_id,
+                            category_id, search_term)
+    latest, count = query.with_entities(func.max(Tache.updated_at), func.count(Tache.id)).one()
+    return latest, count
+
+def get_admin_tasks_optimized(
+    page: int = 1, 
+    per_page: int = 10, 
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    user_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    search_term: Optional[str] = None,
+    sort_by: str = 'due_date',
+    sort_dir: str = 'asc',
+    cursor: Optional[str] = None,
+    count_strategy: Optional[str] = None,
+    load: str = 'full'
+) -> Tuple[List[Union[Tache, TaskRow]], Optional[int], int]:
+    """
+    Get all tasks with optimized queries, filtering, sorting, and pagination for admin view.
+
+    Args:
+        page: The page number (1-indexed)
+        per_page: The number of items per page
+        status: Filter by status (pending, in_progress, completed)
+        priority: Filter by priority (low, medium, high)
+        user_id: Filter by user ID
+        category_id: Filter by category ID
+        search_term: Full-text search term for task title or description
+        sort_by: Field to sort by (due_date, created_at, priority, status, titre, user,
+            relevance)
+        sort_dir: Sort direction (asc or desc)
+        cursor: Keyset pagination cursor from get_page_cursors; when given, the page
+            is fetched by seeking past the cursor and `page` is ignored
+        count_strategy: How to count matching tasks (exact, cached, approximate or probe),
+            defaults to the TASK_COUNT_STRATEGY setting
+        load: full loads whole rows, list defers the description and the unused
+            category columns for pages that do not show them, rows returns read-only
+            TaskRow tuples of the same columns instead of Tache instances
+
+    Returns:
+        Tuple containing:
+        - List of tasks for the current page
+        - Total number of tasks matching the filters (None with the probe strategy)
+        - Total number of pages
+    """
+    # Start with a query that eagerly loads the category to avoid N+1 queries, owner
+    # names are resolved for the page with get_user_names
+    query = Tache.query.options(*_task_load_options(load))
+
+    # Apply filters
+    query, rank = filter_tasks(query, status, priority, user_id, category_id, search_term)
+
+    if sort_by == 'user':
+        query = query.join(Personne)
+
+    # Apply sorting and pagination
+    sort_keys = _get_sort_keys(sort_by, sort_dir, admin=True, rank=rank)
+    cache_key = (None, (status, priority, user_id, category_id, search_term))
+    if load != 'rows':
+        return _paginate_tasks(query, sort_keys, page, per_page, cursor, sort_by, sort_dir,
+                               count_strategy, cache_key)
+
+    # The owner's name is only needed by the cursors of the user sort
+    with_user = sort_by == 'user'
+    rows, total_count, total_pages = _paginate_tasks(
+        query, sort_keys, page, per_page, cursor, sort_by, sort_dir, count_strategy,
+        cache_key, select_page=lambda q: _select_task_rows(q, with_user)
+    )
+    return [TaskRow.from_row(row, with_user) for row in rows], total_count, total_pages
 
 def get_tasks_optimized(
     user_id: int, 
@@ -239,8 +860,11 @@ def get_tasks_optimized(
     category_id: Optional[int] = None,
     search_term: Optional[str] = None,
     sort_by: str = 'due_date',
-    sort_dir: str = 'asc'
-) -> Tuple[List[Tache], int, int]:
+    sort_dir: str = 'asc',
+    cursor: Optional[str] = None,
+    count_strategy: Optional[str] = None,
+    load: str = 'full'
+) -> Tuple[List[Union[Tache, TaskRow]], Optional[int], int]:
     """
     Get tasks for a user with optimized queries, filtering, sorting, and pagination.
 
@@ -251,91 +875,106 @@ def get_tasks_optimized(
         status: Filter by status (pending, in_progress, completed)
         priority: Filter by priority (low, medium, high)
         category_id: Filter by category ID
-        search_term: Search term for task title or description
-        sort_by: Field to sort by (due_date, created_at, priority, status, titre)
+        search_term: Full-text search term for task title or description
+        sort_by: Field to sort by (due_date, created_at, priority, status, titre, relevance)
         sort_dir: Sort direction (asc or desc)
+        cursor: Keyset pagination cursor from get_page_cursors; when given, the page
+            is fetched by seeking past the cursor and `page` is ignored
+        count_strategy: How to count matching tasks (exact, cached, approximate or probe),
+            defaults to the TASK_COUNT_STRATEGY setting
+        load: full loads whole rows, list defers the description and the unused
+            category columns for pages that do not show them, rows returns read-only
+            TaskRow tuples of the same columns instead of Tache instances
 
     Returns:
         Tuple containing:
         - List of tasks for the current page
-        - Total number of tasks matching the filters
+        - Total number of tasks matching the filters (None with the probe strategy)
         - Total number of pages
     """
     # Start with a query that eagerly loads the category to avoid N+1 queries
-    query = Tache.query.options(
-        joinedload(Tache.categorie)
-    ).filter(
-        Tache.personne_id == user_id,
-        Tache.is_deleted == False
-    )
+    query = Tache.query.options(*_task_load_options(load))
 
     # Apply filters
-    if status:
-        query = query.filter(Tache.status == status)
+    query, rank = filter_tasks(query, status, priority, user_id, category_id, search_term)
 
-    if priority:
-        query = query.filter(Tache.priority == priority)
+    # Apply sorting and pagination
+    sort_keys = _get_sort_keys(sort_by, sort_dir, rank=rank)
+    cache_key = (user_id, (status, priority, category_id, search_term))
+    if load != 'rows':
+        return _paginate_tasks(query, sort_keys, page, per_page, cursor, sort_by, sort_dir,
+                               count_strategy, cache_key)
 
-    if category_id:
-        query = query.filter(Tache.categorie_id == category_id)
+    rows, total_count, total_pages = _paginate_tasks(
+        query, sort_keys, page, per_page, cursor, sort_by, sort_dir, count_strategy,
+        cache_key, select_page=_select_task_rows
+    )
+    return [TaskRow.from_row(row) for row in rows], total_count, total_pages
 
-    if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.filter(
-            db.or_(
-                Tache.titre.ilike(search_pattern),
-                Tache.description.ilike(search_pattern)
-            )
-        )
+def encode_sync_watermark(task: Tache) -> str:
+    """
+    Encode the sync position just after a task into an opaque watermark.
 
-    # Apply sorting
-    if sort_by == 'due_date':
-        # Handle NULL due_dates by sorting them last
-        if sort_dir == 'asc':
-            query = query.order_by(
-                Tache.due_date.is_(None).asc(),
-                Tache.due_date.asc()
-            )
-        else:
-            query = query.order_by(
-                Tache.due_date.is_(None).desc(),
-                Tache.due_date.desc()
-            )
-    elif sort_by == 'created_at':
-        query = query.order_by(
-            desc(Tache.created_at) if sort_dir == 'desc' else asc(Tache.created_at)
-        )
-    elif sort_by == 'priority':
-        # Custom priority ordering (high, medium, low)
-        priority_order = case(
-            {'high': 1, 'medium': 2, 'low': 3},
-            value=Tache.priority
-        )
-        query = query.order_by(
-            desc(priority_order) if sort_dir == 'desc' else asc(priority_order)
-        )
-    elif sort_by == 'status':
-        # Custom status ordering (pending, in_progress, completed)
-        status_order = case(
-            {'pending': 1, 'in_progress': 2, 'completed': 3},
-            value=Tache.status
-        )
-        query = query.order_by(
-            desc(status_order) if sort_dir == 'desc' else asc(status_order)
-        )
-    else:  # Default to title
-        query = query.order_by(
-            desc(Tache.titre) if sort_dir == 'desc' else asc(Tache.titre)
-        )
+    Args:
+        task: The last task sent to the client
 
-    # Get total count for pagination
-    total_count = query.count()
-    total_pages = (total_count + per_page - 1) // per_page  # Ceiling division
+    Returns:
+        A URL-safe watermark string
+    """
+    return encode_cursor([task.updated_at, task.id], 'sync', 'asc')
 
-    # Apply pagination
-    tasks = query.limit(per_page).offset((page - 1) * per_page).all()
+def decode_sync_watermark(watermark: str) -> Tuple[datetime, int]:
+    """
+    Decode a watermark produced by encode_sync_watermark.
 
-    return tasks, total_count, total_pages
+    Args:
+        watermark: The watermark string
+
+    Returns:
+        Tuple containing the updated_at and ID of the last task the client received
+
+    Raises:
+        ValidationError: If the watermark is malformed
+    """
+    values, _ = decode_cursor(watermark, 'sync', 'asc')
+    if len(values) != 2 or not isinstance(values[0], datetime) or not isinstance(values[1], int):
+        raise ValidationError("Marqueur de synchronisation invalide")
+    return values[0], values[1]
+
+def get_changed_tasks(
+    user_id: int,
+    watermark: Optional[Tuple[datetime, int]] = None,
+    limit: int = 500,
+    until: Optional[datetime] = None
+) -> List[Tache]:
+    """
+    Get the tasks of a user created, updated or soft-deleted after a watermark.
+
+    Soft-deleted tasks are included as tombstones. The tasks are ordered by
+    (updated_at, id), which the ix_tache_personne_updated_at index serves directly, so
+    a sync without changes is a single index probe.
+
+    Args:
+        user_id: The ID of the user
+        watermark: The (updated_at, id) of the last task the client received, or None
+            for a full sync
+        limit: The maximum number of tasks to return
+        until: Only return tasks updated strictly before this instant
+
+    Returns:
+        List of tasks in (updated_at, id) order
+    """
+    query = Tache.query.filter(Tache.personne_id == user_id)
+    if watermark is not None:
+        updated_at, task_id = watermark
+        # The leading >= bounds the index range, the OR resolves ties on updated_at
+        query = query.filter(
+            Tache.updated_at >= updated_at,
+            db.or_(Tache.updated_at > updated_at, Tache.id > task_id)
+        )
+    if until is not None:
+        query = query.filter(Tache.updated_at < until)
+    return query.order_by(Tache.updated_at, Tache.id).limit(limit).all()
 
 def get_categories_optimized(user_id: int) -> List[Categorie]:
     """
@@ -364,68 +1003,106 @@ def get_categories_optimized(user_id: int) -> List[Categorie]:
         Categorie.nom
     ).all()
 
-def get_task_stats(user_id: int) -> Dict[str, int]:
+# Tables offered as admin filter dropdowns, with the model providing their (id, nom)
+LOOKUP_MODELS = {
+    'personne': Personne,
+    'categorie': Categorie,
+}
+
+def get_user_names(user_ids: Iterable[int]) -> Dict[int, str]:
     """
-    Get task statistics for a user.
+    Get the names of some users with one query on the id and nom columns.
+
+    Listings resolve the owners of the rows they display instead of loading every user.
 
     Args:
-        user_id: The ID of the user
+        user_ids: The IDs of the users
 
     Returns:
-        Dictionary with task statistics
+        Dictionary mapping user IDs to names
     """
-    # Query for task counts by status
-    status_counts = db.session.query(
-        Tache.status,
-        func.count(Tache.id)
-    ).filter(
-        Tache.personne_id == user_id,
-        Tache.is_deleted == False
-    ).group_by(
-        Tache.status
-    ).all()
+    user_ids = set(user_ids) - {None}
+    if not user_ids:
+        return {}
+    return dict(db.session.query(Personne.id, Personne.nom).filter(Personne.id.in_(user_ids)).all())
 
-    # Convert to dictionary
-    stats = {
-        'total': 0,
-        'pending': 0,
-        'in_progress': 0,
-        'completed': 0
-    }
+def get_lookup_choices(table: str) -> Optional[List[Tuple[int, str]]]:
+    """
+    Get the (id, nom) options of an admin filter dropdown, cached and shared by the workers.
 
-    for status, count in status_counts:
-        stats[status] = count
-        stats['total'] += count
+    Only the two columns are loaded. Tables with more than ADMIN_LOOKUP_MAX_OPTIONS rows
+    are too large for a select field, None is returned and the page falls back to a
+    typeahead backed by search_lookup.
 
-    # Add overdue tasks count
-    overdue_count = db.session.query(
-        func.count(Tache.id)
-    ).filter(
-        Tache.personne_id == user_id,
-        Tache.is_deleted == False,
-        Tache.status != 'completed',
-        Tache.due_date < func.current_date(),
-        Tache.due_date.isnot(None)
-    ).scalar()
+    Args:
+        table: The table of the options (personne or categorie)
 
-    stats['overdue'] = overdue_count or 0
+    Returns:
+        The options sorted by name, or None if there are too many
+    """
+    model = LOOKUP_MODELS[table]
+    max_options = current_app.config.get('ADMIN_LOOKUP_MAX_OPTIONS', 500)
+
+    def load() -> Optional[List[Tuple[int, str]]]:
+        rows = db.session.query(model.id, model.nom).order_by(model.nom, model.id) \
+            .limit(max_options + 1).all()
+        if len(rows) > max_options:
+            return None
+        return [tuple(row) for row in rows]
 
-    return stats
+    return get_cache().get_or_set(f'lookup:{table}', load, tags=table_tags(table))
 
-# Helper function for case statements
-def case(mapping, value):
+def search_lookup(table: str, term: str, limit: int = 20) -> List[Tuple[int, str]]:
     """
-    Create a CASE statement for custom ordering.
+    Find the (id, nom) options of an admin typeahead whose name starts with a term.
 
     Args:
-        mapping: Dictionary mapping values to sort order
-        value: The column to check
+        table: The table of the options (personne or categorie)
+        term: The beginning of the name
+        limit: The maximum number of options
 
     Returns:
-        A case expression for ordering
+        The matching options sorted by name
+    """
+    model = LOOKUP_MODELS[table]
+    query = db.session.query(model.id, model.nom)
+    term = term.strip()
+    if term:
+        pattern = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        query = query.filter(model.nom.like(pattern, escape='\\'))
+    return [tuple(row) for row in query.order_by(model.nom, model.id).limit(limit)]
+
+def get_user_categories(user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get the categories of a user for filters and select fields, cached and shared by the
+    workers.
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        List of dictionaries with the id, nom and couleur of each category, by name
+    """
+    def load() -> List[Dict[str, Any]]:
+        rows = db.session.query(Categorie.id, Categorie.nom, Categorie.couleur).filter(
+            Categorie.personne_id == user_id
+        ).order_by(Categorie.nom)
+        return [{'id': id_, 'nom': nom, 'couleur': couleur} for id_, nom, couleur in rows]
+
+    return get_cache().get_or_set(f'categories:user:{user_id}', load,
+                                  tags=table_tags('categorie', user_id))
+
+def get_task_stats(user_id: int) -> Dict[str, int]:
     """
-    whens = []
-    for val, order in mapping.items():
-        whens.append((value == val, order))
+    Get task statistics for a user.
+
+    The statistics are read from the task_stats table, which is kept up to date on
+    every flush (see taskmanager.stats), instead of aggregating the user's tasks.
 
-    return func.case(*whens, else_=len(mapping) + 1)
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        Dictionary with task statistics
+    """
+    return get_user_task_stats(user_id)
@@ -6,6 +6,8 @@ This file contains fixtures and configuration for testing the application.
 
 import os
 import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
 from taskmanager import create_app, db
 from taskmanager.models import Personne, Categorie, Tache
 from werkzeug.security import generate_password_hash
@@ -102,3 +104,34 @@ def auth_client(client, test_user):
         'password': 'password123'
     }, follow_redirects=True)
     return client
+
+@pytest.fixture(scope='function')
+def assert_max_queries(app):
+    """
+    Assert that a block runs at most a number of SQL queries.
+
+    Usage:
+        with assert_max_queries(3):
+            client.get('/tasks/')
+
+    The block gets the list of the statements run so far.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def check(limit):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'after_cursor_execute', count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'after_cursor_execute', count)
+        assert len(statements) <= limit, \
+            f"{len(statements)} queries, at most {limit} expected:\n" + '\n'.join(statements)
+
+    return check
@@ -0,0 +1,172 @@
+"""
+Integration tests for the JSON API.
+"""
+
+import pytest
+
+
+class TestTaskApi:
+    """Tests for the task API routes."""
+
+    def test_requires_authentication(self, client):
+        """Test that anonymous requests get a JSON 401."""
+        response = client.get('/api/v1/tasks')
+        assert response.status_code == 401
+        assert 'error' in response.get_json()
+
+    def test_list_tasks(self, auth_client, test_task):
+        """Test listing the current user's tasks."""
+        response = auth_client.get('/api/v1/tasks')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [task['id'] for task in data['tasks']] == [test_task.id]
+        assert data['tasks'][0]['titre'] == 'Test Task'
+        assert data['pagination']['total_count'] == 1
+        assert response.headers['ETag'].startswith('W/')
+
+    def test_list_not_modified(self, auth_client, db_session, test_task):
+        """Test that an unchanged listing returns 304 until a task changes."""
+        etag = auth_client.get('/api/v1/tasks').headers['ETag']
+
+        response = auth_client.get('/api/v1/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+        test_task.status = 'completed'
+        db_session.session.commit()
+        response = auth_client.get('/api/v1/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+    def test_list_modified_by_category_deletion(self, auth_client, test_task, test_category):
+        """Test that deleting a category changes the ETag of the listing of its tasks."""
+        etag = auth_client.get('/api/v1/tasks').headers['ETag']
+        auth_client.get(f'/categories/supprimer/{test_category.id}')
+
+        response = auth_client.get('/api/v1/tasks', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['tasks'][0]['categorie_id'] is None
+
+    def test_list_etag_depends_on_query(self, auth_client, test_task):
+        """Test that different pages or filters get different ETags."""
+        first = auth_client.get('/api/v1/tasks').headers['ETag']
+        filtered = auth_client.get('/api/v1/tasks?status=completed').headers['ETag']
+        assert first != filtered
+
+    def test_get_task_not_modified(self, auth_client, test_task):
+        """Test conditional GET on a single task."""
+        response = auth_client.get(f'/api/v1/tasks/{test_task.id}')
+        assert response.status_code == 200
+        assert response.get_json()['id'] == test_task.id
+
+        response = auth_client.get(f'/api/v1/tasks/{test_task.id}',
+                                   headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+
+    def test_stats(self, auth_client, test_task):
+        """Test reading the current user's task statistics."""
+        response = auth_client.get('/api/v1/stats')
+        assert response.status_code == 200
+        assert response.get_json()['total'] == 1
+
+    def test_get_missing_task(self, auth_client):
+        """Test that a missing task is a JSON 404."""
+        response = auth_client.get('/api/v1/tasks/999')
+        assert response.status_code == 404
+        assert 'error' in response.get_json()
+
+    def test_create_task(self, auth_client, db_session, test_category):
+        """Test creating a task validated like the task form."""
+        response = auth_client.post('/api/v1/tasks', json={
+            'titre': 'API Task',
+            'priority': 'high',
+            'categorie_id': test_category.id
+        })
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['status'] == 'pending'
+        assert data['categorie_id'] == test_category.id
+        assert response.headers['Location'].endswith(f"/api/v1/tasks/{data['id']}")
+
+    def test_create_invalid_task(self, auth_client):
+        """Test that invalid data is rejected."""
+        response = auth_client.post('/api/v1/tasks', json={'titre': '', 'status': 'archived'})
+        assert response.status_code == 422
+        assert 'titre' in response.get_json()['error']
+
+    def test_update_task(self, auth_client, db_session, test_task):
+        """Test that a partial update keeps the other fields."""
+        response = auth_client.patch(f'/api/v1/tasks/{test_task.id}', json={'status': 'completed'})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['status'] == 'completed'
+        assert data['titre'] == 'Test Task'
+        assert data['categorie_id'] == test_task.categorie_id
+
+    def test_bulk(self, auth_client, db_session, test_task):
+        """Test the bulk endpoint."""
+        response = auth_client.post('/api/v1/tasks/bulk', json={
+            'ids': [test_task.id, 999], 'action': 'delete'
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['results'] == {str(test_task.id): 'updated', '999': 'not_found'}
+        db_session.session.refresh(test_task)
+        assert test_task.is_deleted is True
+
+
+class TestSyncApi:
+    """Tests for the incremental sync route."""
+
+    @pytest.fixture
+    def no_lag(self, app):
+        """Send changes immediately instead of holding recent ones back."""
+        app.config['SYNC_SAFETY_LAG'] = -1
+
+    def test_full_then_incremental_sync(self, app, auth_client, db_session, test_user, no_lag):
+        """Test that a watermark only returns later changes, tombstones included."""
+        from taskmanager.models import Tache
+        app.config['SYNC_BATCH_SIZE'] = 2
+        tasks = [Tache(titre=f'Task {i}', personne_id=test_user.id) for i in range(5)]
+        db_session.session.add_all(tasks)
+        db_session.session.commit()
+        deleted_id = tasks[1].id
+
+        data = auth_client.get('/api/v1/tasks/sync').get_json()
+        assert len(data['tasks']) == 5
+        assert data['has_more'] is False
+        watermark = data['watermark']
+
+        data = auth_client.get(f'/api/v1/tasks/sync?since={watermark}').get_json()
+        assert data == {'tasks': [], 'watermark': watermark, 'has_more': False}
+
+        db_session.session.get(Tache, deleted_id).soft_delete()
+        data = auth_client.get(f'/api/v1/tasks/sync?since={watermark}').get_json()
+        assert [(task['id'], task['is_deleted']) for task in data['tasks']] == [(deleted_id, True)]
+        assert data['watermark'] != watermark
+
+    def test_sync_category_deletion(self, auth_client, test_task, test_category, no_lag):
+        """Test that tasks detached from a deleted category are synced again."""
+        watermark = auth_client.get('/api/v1/tasks/sync').get_json()['watermark']
+        auth_client.get(f'/categories/supprimer/{test_category.id}')
+
+        data = auth_client.get(f'/api/v1/tasks/sync?since={watermark}').get_json()
+        assert [(task['id'], task['categorie_id']) for task in data['tasks']] == \
+            [(test_task.id, None)]
+
+    def test_max_rows(self, app, auth_client, db_session, test_user, no_lag):
+        """Test that large syncs are split across calls."""
+        from taskmanager.models import Tache
+        app.config['SYNC_MAX_ROWS'] = 3
+        db_session.session.add_all([Tache(titre=f'Task {i}', personne_id=test_user.id)
+                                    for i in range(4)])
+        db_session.session.commit()
+
+        first = auth_client.get('/api/v1/tasks/sync').get_json()
+        assert len(first['tasks']) == 3 and first['has_more'] is True
+        second = auth_client.get(f"/api/v1/tasks/sync?since={first['watermark']}").get_json()
+        assert len(second['tasks']) == 1 and second['has_more'] is False
+
+    def test_invalid_watermark(self, auth_client):
+        """Test that a malformed watermark is rejected."""
+        response = auth_client.get('/api/v1/tasks/sync?since=abc')
+        assert response.status_code == 422
@@ -0,0 +1,120 @@
+"""
+Tests for the ASGI entry point and the async service.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+import pytest
+
+pytest.importorskip('asgiref')
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+from taskmanager import limiter  # noqa: E402
+from taskmanager.asgi import TaskManagerASGI  # noqa: E402
+
+
+def call(asgi, path, cookie=None, headers=(), query=b''):
+    """Send a GET request to an ASGI application and return (status, headers, body)."""
+    request_headers = [(name.lower().encode(), value.encode()) for name, value in headers]
+    if cookie:
+        request_headers.append((b'cookie', f'session={cookie}'.encode()))
+    scope = {'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'path': path, 'root_path': '', 'query_string': query, 'headers': request_headers,
+             'client': ('127.0.0.1', 1234), 'server': ('127.0.0.1', 80)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await asgi(scope, receive, send)
+        await asgi.service.dispose()
+
+    # A new thread starts without the application context pushed by the fixtures, like
+    # an ASGI server's event loop
+    thread = threading.Thread(target=asyncio.run, args=(run(),))
+    thread.start()
+    thread.join()
+    start, body = messages[0], b''.join(m.get('body', b'') for m in messages[1:])
+    return start['status'], dict((k.decode(), v.decode()) for k, v in start['headers']), body
+
+
+@pytest.fixture
+def asgi(app):
+    """The ASGI application."""
+    app.config['RATELIMIT_ENABLED'] = False
+    return TaskManagerASGI(app)
+
+
+@pytest.fixture
+def cookie(app, test_user):
+    """A session cookie of the test user."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    return serializer.dumps({'personne_id': test_user.id,
+                             'login_time': datetime.utcnow().timestamp()})
+
+
+class TestAsyncApi:
+    """Tests for the async API routes."""
+
+    def test_requires_authentication(self, asgi, db_session):
+        """Test that anonymous requests get a JSON 401."""
+        status, _, body = call(asgi, '/api/v1/tasks')
+        assert status == 401
+        assert 'error' in json.loads(body)
+
+    def test_list_matches_wsgi(self, asgi, auth_client, cookie, test_task):
+        """Test that the async listing answers like the Flask route, ETag included."""
+        expected = auth_client.get('/api/v1/tasks?per_page=5')
+        status, headers, body = call(asgi, '/api/v1/tasks', cookie, query=b'per_page=5')
+        assert status == 200
+        assert json.loads(body) == expected.get_json()
+        assert headers['etag'] == expected.headers['ETag']
+
+        status, _, body = call(asgi, '/api/v1/tasks', cookie, query=b'per_page=5',
+                               headers=[('If-None-Match', headers['etag'])])
+        assert status == 304
+        assert body == b''
+
+    def test_task_and_stats(self, asgi, cookie, test_task):
+        """Test reading one task and the statistics."""
+        status, _, body = call(asgi, f'/api/v1/tasks/{test_task.id}', cookie)
+        assert status == 200
+        assert json.loads(body)['titre'] == 'Test Task'
+
+        status, _, body = call(asgi, '/api/v1/tasks/999', cookie)
+        assert status == 404
+
+        status, _, body = call(asgi, '/api/v1/stats', cookie)
+        assert json.loads(body)['total'] == 1
+
+    def test_search(self, asgi, auth_client, cookie, test_task):
+        """Test that searches, which read the search backend of the application, work."""
+        expected = auth_client.get('/api/v1/tasks?search=Test').get_json()
+        status, _, body = call(asgi, '/api/v1/tasks', cookie, query=b'search=Test')
+        assert status == 200
+        assert json.loads(body) == expected
+        assert [task['id'] for task in expected['tasks']] == [test_task.id]
+
+    def test_other_routes_use_flask(self, asgi, db_session):
+        """Test that the other requests are served by the Flask application."""
+        status, _, _ = call(asgi, '/auth/connexion')
+        assert status == 200
+
+    def test_shares_flask_rate_limits(self, app, asgi, auth_client, cookie, test_task):
+        """Test that the async routes count against the budget of their Flask routes."""
+        app.config['RATELIMIT_ENABLED'] = True
+        limiter.reset()
+        statuses = [auth_client.get('/api/v1/stats').status_code for _ in range(50)]
+        assert 429 not in statuses
+        status, _, _ = call(asgi, '/api/v1/stats', cookie)
+        assert status == 429
+        # Another endpoint has its own budget, like with Flask-Limiter
+        status, _, _ = call(asgi, f'/api/v1/tasks/{test_task.id}', cookie)
+        assert status == 200
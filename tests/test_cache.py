@@ -0,0 +1,210 @@
+"""
+Tests for the shared cache.
+"""
+
+import fnmatch
+import threading
+import time
+import pytest
+from sqlalchemy import update
+from taskmanager.models import Categorie
+from taskmanager.cache import Cache, LocalBackend, FileBackend, RedisBackend, get_cache
+from taskmanager.utils import get_user_categories, get_lookup_choices
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis-py client, implementing the commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _alive(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] < time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def mget(self, keys):
+        return [entry[0] if entry else None for entry in map(self._alive, keys)]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self._alive(key):
+            return None
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        entry = self._alive(key)
+        value = int(entry[0]) + 1 if entry else 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+def fake_redis_backend():
+    """A Redis backend on the in-memory stand-in."""
+    return RedisBackend(FakeRedis(), 'taskmanager')
+
+
+@pytest.fixture(params=['local', 'file', 'redis'])
+def backend(request, tmp_path):
+    """Each cache backend."""
+    if request.param == 'local':
+        return LocalBackend()
+    if request.param == 'file':
+        return FileBackend(str(tmp_path))
+    return RedisBackend(FakeRedis(), 'test')
+
+
+class TestBackends:
+    """Tests shared by every backend."""
+
+    def test_set_get_delete(self, backend):
+        """Test storing, reading and removing values."""
+        backend.set('test:a', b'1')
+        assert backend.get_many(['test:a', 'test:b']) == [b'1', None]
+        backend.delete('test:a')
+        assert backend.get_many(['test:a']) == [None]
+
+    def test_ttl(self, backend):
+        """Test that expired values are missing."""
+        backend.set('test:a', b'1', ttl=1)
+        assert backend.get_many(['test:a']) == [b'1']
+        time.sleep(1.1)
+        assert backend.get_many(['test:a']) == [None]
+
+    def test_add_and_incr(self, backend):
+        """Test set-if-absent and counters."""
+        assert backend.add('test:lock', b'1')
+        assert not backend.add('test:lock', b'1')
+        assert backend.incr('test:n') == 1
+        assert backend.incr('test:n') == 2
+
+    def test_clear(self, backend):
+        """Test removing every key."""
+        backend.set('test:a', b'1')
+        backend.clear()
+        assert backend.get_many(['test:a']) == [None]
+
+
+class TestCache:
+    """Tests for the Cache class."""
+
+    def test_lru_eviction(self):
+        """Test that the local backend evicts the least recently used entries."""
+        cache = Cache(LocalBackend(max_size=2))
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+
+    def test_tag_invalidation(self):
+        """Test that invalidating a tag makes its entries stale."""
+        cache = Cache(LocalBackend())
+        cache.set('a', 1, tags=['x'])
+        cache.set('b', 2, tags=['y'])
+        cache.invalidate_tags('x')
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+
+    def test_namespaces_are_isolated(self):
+        """Test that caches with different namespaces share a backend safely."""
+        backend = LocalBackend()
+        Cache(backend, namespace='one').set('a', 1)
+        assert Cache(backend, namespace='two').get('a') is None
+
+    def test_invalidation_during_computation(self):
+        """Test that a value computed before an invalidation is not served."""
+        cache = Cache(LocalBackend())
+
+        def compute():
+            cache.invalidate_tags('x')
+            return 'old'
+
+        assert cache.get_or_set('a', compute, tags=['x']) == 'old'
+        assert cache.get('a') is None
+
+    def test_stampede_protection(self):
+        """Test that concurrent misses compute the value once."""
+        cache = Cache(fake_redis_backend())
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_set('a', compute)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 5
+        assert len(calls) == 1
+
+    def test_stampede_protection_across_processes(self):
+        """Test that a process waits for the value another one is computing."""
+        backend = fake_redis_backend()
+        other, cache = Cache(backend), Cache(backend)
+        backend.add('taskmanager:lock:a', b'1')
+
+        def compute_elsewhere():
+            time.sleep(0.2)
+            other.set('a', 'theirs')
+
+        threading.Thread(target=compute_elsewhere).start()
+        assert cache.get_or_set('a', lambda: 'ours') == 'theirs'
+
+
+class TestCommitInvalidation:
+    """Tests for the invalidation of cached data when writes are committed."""
+
+    def test_user_categories(self, app, db_session, test_user, test_category):
+        """Test that a new category is visible once committed."""
+        with app.test_request_context():
+            user_id = test_user.id
+            assert [c['nom'] for c in get_user_categories(user_id)] == ['Test Category']
+
+            db_session.session.add(Categorie(nom='Autre', personne_id=user_id))
+            assert len(get_user_categories(user_id)) == 1
+            db_session.session.commit()
+            assert [c['nom'] for c in get_user_categories(user_id)] == ['Autre', 'Test Category']
+
+    def test_rollback_keeps_entries(self, app, db_session, test_user):
+        """Test that rolled back changes do not invalidate anything."""
+        with app.test_request_context():
+            get_lookup_choices('personne')
+            invalidations = get_cache().get_stats()['invalidations']
+            test_user.nom = 'renamed'
+            db_session.session.flush()
+            db_session.session.rollback()
+            assert get_cache().get_stats()['invalidations'] == invalidations
+
+    def test_user_names(self, app, db_session, test_user):
+        """Test that renaming a user refreshes the cached names."""
+        with app.test_request_context():
+            user_id = test_user.id
+            assert get_lookup_choices('personne') == [(user_id, 'testuser')]
+            test_user.nom = 'renamed'
+            db_session.session.commit()
+            assert get_lookup_choices('personne') == [(user_id, 'renamed')]
+
+    def test_set_based_statements(self, app, db_session, test_user, test_category):
+        """Test that statements bypassing the ORM invalidate the whole table."""
+        with app.test_request_context():
+            user_id = test_user.id
+            get_user_categories(user_id)
+            db_session.session.execute(update(Categorie).values(nom='Renommée'))
+            db_session.session.commit()
+            assert get_user_categories(user_id)[0]['nom'] == 'Renommée'
@@ -0,0 +1,70 @@
+"""
+Tests for the streaming task export.
+"""
+
+import csv
+import io
+import json
+from taskmanager.models import Tache
+from taskmanager.export import EXPORT_COLUMNS, export_tasks
+
+
+class TestExportTasks:
+    """Tests for the export_tasks function."""
+
+    def test_csv(self, db_session, test_task):
+        """Test that the CSV export has a header and one line per task."""
+        rows = list(csv.reader(io.StringIO(''.join(export_tasks('csv')))))
+        assert rows[0] == list(EXPORT_COLUMNS)
+        assert rows[1][:2] == [str(test_task.id), 'Test Task']
+        assert len(rows) == 2
+
+    def test_ndjson_filters(self, db_session, test_user, test_task):
+        """Test that the admin listing filters are applied."""
+        db_session.session.add(Tache(titre='Done', status='completed', personne_id=test_user.id))
+        db_session.session.commit()
+
+        lines = list(export_tasks('ndjson', status='completed'))
+        assert [json.loads(line)['titre'] for line in lines] == ['Done']
+
+    def test_deleted_tasks_are_excluded(self, db_session, test_task):
+        """Test that soft-deleted tasks are not exported."""
+        test_task.soft_delete()
+        assert list(export_tasks('ndjson')) == []
+
+    def test_csv_formulas_are_neutralized(self, db_session, test_user):
+        """Test that cells a spreadsheet would evaluate are prefixed."""
+        db_session.session.add(Tache(titre='=HYPERLINK("x")', personne_id=test_user.id))
+        db_session.session.commit()
+
+        rows = list(csv.reader(io.StringIO(''.join(export_tasks('csv')))))
+        assert rows[1][1] == '\'=HYPERLINK("x")'
+
+
+class TestExportRoutes:
+    """Tests for the export routes and command."""
+
+    def test_user_export(self, auth_client, test_task):
+        """Test downloading the current user's tasks."""
+        response = auth_client.get('/tasks/export?format=ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert 'attachment' in response.headers['Content-Disposition']
+        assert json.loads(response.data.decode().splitlines()[0])['id'] == test_task.id
+
+    def test_invalid_format(self, auth_client):
+        """Test that an unknown format is rejected."""
+        response = auth_client.get('/tasks/export?format=xml', follow_redirects=True)
+        assert response.status_code == 200
+        assert 'Format d&#39;export invalide' in response.data.decode()
+
+    def test_admin_export_requires_admin(self, auth_client):
+        """Test that regular users cannot export every task."""
+        response = auth_client.get('/tasks/admin/export')
+        assert response.status_code == 302
+
+    def test_cli(self, runner, db_session, test_task):
+        """Test the export-tasks command."""
+        result = runner.invoke(args=['export-tasks', '--format', 'csv'])
+        assert result.exit_code == 0
+        assert 'Test Task' in result.output
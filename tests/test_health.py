@@ -0,0 +1,58 @@
+"""
+Tests for the health probes.
+"""
+
+from datetime import datetime, timedelta
+
+
+class TestHealthProbes:
+    """Tests for the liveness, readiness and metrics probes."""
+
+    def test_live(self, client):
+        """Test that the liveness probe answers without a database."""
+        response = client.get('/health/live')
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ok'}
+        assert 'Set-Cookie' not in response.headers
+
+    def test_ready(self, client, db_session):
+        """Test that the readiness probe reports its checks."""
+        response = client.get('/health/ready')
+        assert response.status_code == 200
+        checks = response.get_json()['checks']
+        assert checks['database']['ok']
+        assert 'class' in checks['pool']
+        assert 'instance' in checks['disk']
+
+    def test_database_ping_is_cached(self, app, client, db_session):
+        """Test that the database is pinged once per HEALTH_DB_PING_TTL."""
+        app.config['HEALTH_DB_PING_TTL'] = 60
+        client.get('/health/ready')
+        ping = app.extensions['health']['ping']
+        client.get('/health/ready')
+        assert app.extensions['health']['ping'] is ping
+
+    def test_low_disk_space(self, app, client, db_session):
+        """Test that a directory short of space fails readiness."""
+        app.config['HEALTH_MIN_FREE_BYTES'] = 2 ** 62
+        response = client.get('/health/ready')
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'unavailable'
+
+    def test_metrics(self, app, client, db_session):
+        """Test that the metrics snapshot is only served when enabled."""
+        assert client.get('/health/metrics').status_code == 404
+        app.config['HEALTH_METRICS_ENABLED'] = True
+        data = client.get('/health/metrics').get_json()
+        assert data['rss'] > 0
+        assert 'checked_out' in data['pool']
+
+    def test_probes_skip_request_handling(self, client, test_user):
+        """Test that probes ignore expired sessions and rate limits."""
+        with client.session_transaction() as session:
+            session['personne_id'] = test_user.id
+            session['login_time'] = (datetime.utcnow() - timedelta(days=1)).timestamp()
+        for _ in range(60):
+            assert client.get('/health/live').status_code == 200
+        with client.session_transaction() as session:
+            assert 'personne_id' in session
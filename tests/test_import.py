@@ -0,0 +1,137 @@
+"""
+Tests for the bulk task import.
+"""
+
+import io
+import json
+import pytest
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+from taskmanager.models import Categorie, Tache
+from taskmanager.exceptions import ValidationError
+from taskmanager.importer import import_tasks
+from taskmanager.stats import get_user_task_stats
+
+
+CSV_INPUT = (
+    "titre,description,status,priority,due_date,categorie\n"
+    "Première,Une tâche,pending,high,2999-01-01,Test Category\n"
+    "Deuxième,,completed,,,Nouvelle\n"
+    ",sans titre,pending,low,,\n"
+    "Troisième,,unknown,low,2000-01-01,\n"
+    "<b>Quatrième</b>,,,,,\n"
+)
+
+
+class TestImportTasks:
+    """Tests for the import_tasks function."""
+
+    def test_csv(self, db_session, test_user, test_category):
+        """Test that valid rows are imported and invalid rows reported."""
+        user_id = test_user.id
+        report = import_tasks(io.StringIO(CSV_INPUT), 'csv', user_id, batch_size=2)
+
+        assert report['imported'] == 2
+        assert report['failed'] == 3
+        assert report['categories_created'] == 1
+        assert [error['line'] for error in report['errors']] == [4, 5, 6]
+        assert len(report['errors'][1]['errors']) == 2
+
+        first = Tache.query.filter_by(titre='Première').one()
+        assert first.categorie_id == test_category.id
+        assert first.priority == 'high'
+        assert first.due_date.year == 2999
+        second = Tache.query.filter_by(titre='Deuxième').one()
+        assert second.priority == 'medium'
+        assert Categorie.query.get(second.categorie_id).nom == 'Nouvelle'
+
+    def test_statistics_are_refreshed(self, db_session, test_user):
+        """Test that the task statistics include the imported tasks."""
+        user_id = test_user.id
+        get_user_task_stats(user_id)
+        import_tasks(io.StringIO(CSV_INPUT), 'csv', user_id)
+
+        stats = get_user_task_stats(user_id)
+        assert stats['total'] == 2
+        assert stats['completed'] == 1
+
+    def test_ndjson_without_category_creation(self, db_session, test_user):
+        """Test NDJSON input and the rejection of unknown categories."""
+        lines = [
+            json.dumps({'titre': 'A'}),
+            'not json',
+            json.dumps({'titre': 'B', 'categorie': 'Inconnue'}),
+            '',
+            json.dumps(['C']),
+        ]
+        report = import_tasks(io.StringIO('\n'.join(lines)), 'ndjson', test_user.id,
+                              create_categories=False)
+
+        assert report['imported'] == 1
+        assert report['errors'] == [
+            {'line': 2, 'errors': ['JSON invalide']},
+            {'line': 3, 'errors': ['Catégorie inconnue']},
+            {'line': 5, 'errors': ['La ligne doit être un objet JSON']},
+        ]
+        assert Categorie.query.count() == 0
+
+    def test_invalid_input(self, db_session, test_user):
+        """Test that an unknown format or a CSV without titre column is rejected."""
+        with pytest.raises(ValidationError):
+            import_tasks(io.StringIO(''), 'xml', test_user.id)
+        with pytest.raises(ValidationError):
+            import_tasks(io.StringIO('nom\nA\n'), 'csv', test_user.id)
+
+    def test_reported_errors_are_capped(self, db_session, test_user):
+        """Test that only max_errors row errors are kept, but all are counted."""
+        report = import_tasks(io.StringIO('titre\n' + '\n'.join(['<x>'] * 5)), 'csv',
+                              test_user.id, max_errors=2)
+        assert report['failed'] == 5
+        assert len(report['errors']) == 2
+
+
+class TestImportRoutes:
+    """Tests for the import route and command."""
+
+    def test_upload(self, auth_client, test_user):
+        """Test importing an uploaded file from the task list."""
+        response = auth_client.post('/tasks/import', data={
+            'file': (io.BytesIO(CSV_INPUT.encode('utf-8')), 'taches.csv')
+        }, content_type='multipart/form-data', follow_redirects=True)
+        assert response.status_code == 200
+        assert '2 tâche(s) importée(s)' in response.data.decode()
+
+    def test_raw_body(self, auth_client, test_user):
+        """Test importing an NDJSON body, the report is returned as JSON."""
+        response = auth_client.post('/tasks/import', data=json.dumps({'titre': 'A'}) + '\n',
+                                    content_type='application/x-ndjson')
+        assert response.status_code == 200
+        assert response.get_json()['imported'] == 1
+
+    def test_body_too_large(self, app, auth_client, test_user):
+        """Test that a body over IMPORT_MAX_BYTES is rejected without a Content-Length."""
+        app.config['IMPORT_MAX_BYTES'] = 1000
+        body = ''.join(json.dumps({'titre': f'Tâche {i}'}) + '\n' for i in range(100))
+        cookie = auth_client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+        environ = EnvironBuilder('/tasks/import', method='POST', data=body.encode(),
+                                 content_type='application/x-ndjson',
+                                 headers={'Cookie': f'{cookie.key}={cookie.value}'}).get_environ()
+        # A chunked upload, whose end the server detects (like gunicorn does); the test
+        # client would add the Content-Length back
+        del environ['CONTENT_LENGTH']
+        environ['wsgi.input_terminated'] = True
+        app_iter, status, _ = run_wsgi_app(app, environ, buffered=True)
+        assert status.startswith('400')
+        assert 'volumineux' in json.loads(b''.join(app_iter))['error']
+
+    def test_invalid_format(self, auth_client):
+        """Test that a body in an unknown format is rejected."""
+        response = auth_client.post('/tasks/import', data='<xml/>', content_type='text/xml')
+        assert response.status_code == 400
+
+    def test_cli(self, runner, db_session, test_user, tmp_path):
+        """Test the import-tasks command."""
+        path = tmp_path / 'taches.csv'
+        path.write_text(CSV_INPUT, encoding='utf-8')
+        result = runner.invoke(args=['import-tasks', str(path), '--user-id', str(test_user.id)])
+        assert result.exit_code == 0
+        assert '2 tâche(s) importée(s), 3 ligne(s) rejetée(s)' in result.output
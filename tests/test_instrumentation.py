@@ -0,0 +1,45 @@
+"""
+Tests for the per-request instrumentation.
+"""
+
+import logging
+from taskmanager import create_app
+
+
+class TestInstrumentation:
+    """Tests for the Server-Timing header and the slow request log."""
+
+    def test_server_timing(self, auth_client, test_task):
+        """Test that a page reports its queries, templates and total time."""
+        response = auth_client.get('/tasks/')
+        timing = response.headers['Server-Timing']
+        assert timing.startswith('db;dur=')
+        assert 'queries"' in timing
+        assert 'tpl;dur=' in timing and 'total;dur=' in timing
+        assert int(timing.split('desc="')[1].split()[0]) > 0
+
+    def test_slow_request_log(self, app, auth_client, test_task, caplog):
+        """Test that requests over the threshold are logged with their statements."""
+        app.config['SLOW_REQUEST_THRESHOLD_MS'] = 0
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            auth_client.get('/tasks/')
+        messages = [record.getMessage() for record in caplog.records]
+        assert any('Requête lente: GET /tasks/' in m and 'FROM tache' in m for m in messages)
+
+    def test_statements_are_bounded(self, app, auth_client, test_task, caplog):
+        """Test that only the slowest statements are kept, the totals count them all."""
+        app.config['SLOW_REQUEST_THRESHOLD_MS'] = 0
+        app.config['SLOW_REQUEST_MAX_STATEMENTS'] = 1
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            response = auth_client.get('/tasks/')
+        timing = response.headers['Server-Timing']
+        assert int(timing.split('desc="')[1].split()[0]) > 1
+        message = next(record.getMessage() for record in caplog.records
+                       if 'Requête lente: GET /tasks/' in record.getMessage())
+        assert len([line for line in message.splitlines() if ' ms: ' in line]) == 1
+
+    def test_disabled(self, monkeypatch):
+        """Test that no header is added when the instrumentation is off."""
+        monkeypatch.setattr('taskmanager.config.TestingConfig.INSTRUMENTATION_ENABLED', False)
+        app = create_app('testing')
+        assert 'Server-Timing' not in app.test_client().get('/auth/connexion').headers
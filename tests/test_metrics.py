@@ -0,0 +1,69 @@
+"""
+Tests for the Prometheus metrics.
+"""
+
+import pytest
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+
+def sample(name, **labels):
+    """Get the current value of a sample of the default registry, 0 when missing."""
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    """Tests for the request, rate limit, pool and cache metrics."""
+
+    def test_request_metrics(self, auth_client, test_task):
+        """Test that requests are counted and timed per endpoint."""
+        labels = {'blueprint': 'tasks', 'endpoint': 'tasks.liste'}
+        requests = sample('taskmanager_requests_total', method='GET', status='200', **labels)
+        latencies = sample('taskmanager_request_duration_seconds_count', **labels)
+        auth_client.get('/tasks/')
+        auth_client.get('/tasks/')
+        assert sample('taskmanager_requests_total', method='GET', status='200',
+                      **labels) == requests + 2
+        assert sample('taskmanager_request_duration_seconds_count', **labels) == latencies + 2
+
+    def test_exposition(self, client):
+        """Test that the metrics are served in the Prometheus text format."""
+        client.get('/auth/connexion')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert b'taskmanager_requests_total{' in response.data
+        assert b'taskmanager_db_pool_checked_out' in response.data
+        assert 'Set-Cookie' not in response.headers
+
+    def test_rate_limited_login(self, app, client):
+        """Test that logins rejected by the rate limiter are counted."""
+        app.config['RATELIMIT_ENABLED'] = True
+        labels = {'blueprint': 'auth', 'endpoint': 'auth.connexion'}
+        rejected = sample('taskmanager_rate_limited_total', **labels)
+        statuses = [
+            client.post('/auth/connexion', data={'nom': 'x', 'password': 'y'}).status_code
+            for _ in range(7)
+        ]
+        assert statuses.count(429) >= 1
+        assert sample('taskmanager_rate_limited_total', **labels) == \
+            rejected + statuses.count(429)
+
+    def test_pool_gauge(self, auth_client, db_session, test_task):
+        """Test that connections are counted out during a request and back in after."""
+        checked_out = sample('taskmanager_db_pool_checked_out')
+        auth_client.get('/tasks/')
+        # The request shares the application context of the test, and its session
+        assert sample('taskmanager_db_pool_checked_out') == checked_out + 1
+        db_session.session.remove()
+        assert sample('taskmanager_db_pool_checked_out') == checked_out
+
+    def test_cache_events(self, auth_client, test_task, monkeypatch):
+        """Test that cache lookups are added to the metrics."""
+        monkeypatch.setattr('taskmanager.metrics.CACHE_SYNC_INTERVAL', 0)
+        before = sum(sample('taskmanager_cache_events_total', cache='user', event=event)
+                     for event in ('request_hits', 'process_hits', 'misses'))
+        auth_client.get('/tasks/')
+        after = sum(sample('taskmanager_cache_events_total', cache='user', event=event)
+                    for event in ('request_hits', 'process_hits', 'misses'))
+        assert after > before
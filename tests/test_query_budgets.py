@@ -0,0 +1,96 @@
+"""
+Tests for the SQL query budgets of the routes and the N+1 query detection.
+"""
+
+import logging
+
+import pytest
+from werkzeug.security import generate_password_hash
+from taskmanager.exceptions import NPlusOneError
+from taskmanager.models import Categorie, Personne, Tache
+
+
+@pytest.fixture(scope='function')
+def many_tasks(db_session, test_user):
+    """Create categories and enough tasks that per-row queries would show."""
+    categories = [
+        Categorie(nom=f'Catégorie {i}', personne_id=test_user.id) for i in range(3)
+    ]
+    db_session.session.add_all(categories)
+    db_session.session.flush()
+    tasks = [
+        Tache(titre=f'Tâche {i}', personne_id=test_user.id,
+              categorie_id=categories[i % 3].id if i % 4 else None)
+        for i in range(20)
+    ]
+    db_session.session.add_all(tasks)
+    db_session.session.commit()
+    return tasks
+
+
+@pytest.fixture(scope='function')
+def admin_client(client, db_session):
+    """A test client logged in as an administrator."""
+    db_session.session.add(Personne(nom='admin', password=generate_password_hash('adminpass'),
+                                    role='admin'))
+    db_session.session.commit()
+    client.post('/auth/connexion', data={'nom': 'admin', 'password': 'adminpass'})
+    return client
+
+
+def lazy_load_categories():
+    """A view lazy loading the tasks of each category, one query per category."""
+    return {'tasks': [len(categorie.taches) for categorie in Categorie.query.all()]}
+
+
+class TestQueryBudgets:
+    """Tests that the routes run a fixed number of queries, whatever the rows listed."""
+
+    @pytest.mark.parametrize('url, budget', [
+        ('/tasks/', 4),
+        ('/tasks/?sort_by=priority&sort_dir=desc', 4),
+        ('/tasks/?search=Tâche', 4),
+        ('/categories/', 2),
+        ('/api/v1/tasks', 3),
+        ('/api/v1/stats', 1),
+    ])
+    def test_user_routes(self, auth_client, many_tasks, assert_max_queries, url, budget):
+        """Test the queries of the pages of a user."""
+        with assert_max_queries(budget):
+            assert auth_client.get(url).status_code == 200
+
+    def test_task_edit_page(self, auth_client, many_tasks, assert_max_queries):
+        """Test the queries of the task edit form, which lists the categories."""
+        with assert_max_queries(3):
+            assert auth_client.get(f'/tasks/editer/{many_tasks[1].id}').status_code == 200
+
+    @pytest.mark.parametrize('url', ['/tasks/admin/all', '/tasks/admin/all?sort_by=user'])
+    def test_admin_task_list(self, admin_client, many_tasks, assert_max_queries, url):
+        """Test the queries of the task list of all users, with the owner names."""
+        with assert_max_queries(6):
+            assert admin_client.get(url).status_code == 200
+
+
+class TestLazyLoadDetection:
+    """Tests for the detection of relationships lazy loaded over and over."""
+
+    def test_raise(self, app, client, many_tasks):
+        """Test that a request over the threshold fails in testing."""
+        app.add_url_rule('/lazy', view_func=lazy_load_categories)
+        app.config['LAZY_LOAD_THRESHOLD'] = 2
+        with pytest.raises(NPlusOneError, match='Categorie.taches'):
+            client.get('/lazy')
+
+    def test_under_threshold(self, app, client, many_tasks):
+        """Test that a few lazy loads are allowed."""
+        app.add_url_rule('/lazy', view_func=lazy_load_categories)
+        assert client.get('/lazy').get_json()['tasks'] == [5, 5, 5]
+
+    def test_warn(self, app, client, many_tasks, caplog):
+        """Test that a request over the threshold is logged in development."""
+        app.add_url_rule('/lazy', view_func=lazy_load_categories)
+        app.config.update(LAZY_LOAD_THRESHOLD=2, LAZY_LOAD_ACTION='warn')
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            assert client.get('/lazy').status_code == 200
+        messages = [record.getMessage() for record in caplog.records]
+        assert any('Requête N+1: Categorie.taches' in message for message in messages)
@@ -0,0 +1,90 @@
+"""
+Unit tests for the full-text search backends.
+"""
+
+import pytest
+from taskmanager.models import Tache
+from taskmanager.search import stem_french, get_search_backend, SQLiteSearchBackend
+from taskmanager.utils import get_tasks_optimized
+
+
+class TestStemFrench:
+    """Tests for the stem_french function."""
+
+    @pytest.mark.parametrize('word, stem', [
+        ('documents', 'document'),
+        ('réunions', 'réun'),
+        ('préparation', 'prépar'),
+        ('tâche', 'tâch'),
+        ('vert', 'vert'),
+    ])
+    def test_stem(self, word, stem):
+        """Test stripping common French suffixes."""
+        assert stem_french(word) == stem
+
+    def test_short_words_are_kept(self):
+        """Test that stems never become shorter than three characters."""
+        assert stem_french('les') == 'les'
+
+
+class TestSQLiteSearch:
+    """Tests for the SQLite FTS5 search backend."""
+
+    @pytest.fixture
+    def tasks(self, db_session, test_user):
+        """Create tasks with French titles and descriptions."""
+        tasks = [
+            Tache(titre='Préparer la réunion', description='Ordre du jour',
+                  personne_id=test_user.id),
+            Tache(titre='Classer les documents', description='Factures et contrats',
+                  personne_id=test_user.id),
+            Tache(titre='Appeler le client', description='Préparation du devis',
+                  personne_id=test_user.id),
+        ]
+        db_session.session.add_all(tasks)
+        db_session.session.commit()
+        return tasks
+
+    def search(self, user_id, term, **kwargs):
+        """Return the titles of the tasks matching a search term."""
+        tasks, _, _ = get_tasks_optimized(user_id, search_term=term, **kwargs)
+        return [t.titre for t in tasks]
+
+    def test_backend_selection(self, app):
+        """Test that SQLite databases use the FTS5 backend."""
+        with app.app_context():
+            assert isinstance(get_search_backend(), SQLiteSearchBackend)
+
+    def test_stemmed_prefix_and_diacritics(self, tasks, test_user):
+        """Test that inflected words and missing accents still match."""
+        assert self.search(test_user.id, 'document') == ['Classer les documents']
+        assert self.search(test_user.id, 'reunions') == ['Préparer la réunion']
+        assert self.search(test_user.id, 'fact') == ['Classer les documents']
+
+    def test_ranked_results(self, tasks, test_user):
+        """Test that title matches rank before description matches."""
+        titles = self.search(test_user.id, 'préparation', sort_by='relevance')
+        assert titles == ['Préparer la réunion', 'Appeler le client']
+
+    def test_index_follows_edit_and_soft_delete(self, db_session, tasks, test_user):
+        """Test that the index stays in sync on edit and soft delete."""
+        tasks[0].titre = 'Réserver la salle'
+        db_session.session.commit()
+        assert self.search(test_user.id, 'salle') == ['Réserver la salle']
+        assert self.search(test_user.id, 'réunion') == []
+
+        tasks[1].soft_delete()
+        assert self.search(test_user.id, 'documents') == []
+
+    def test_rebuild(self, db_session, tasks, test_user):
+        """Test that rebuilding the index keeps the same results."""
+        tasks[2].soft_delete()
+        SQLiteSearchBackend().rebuild()
+        assert self.search(test_user.id, 'prépar') == ['Préparer la réunion']
+
+    def test_search_route(self, auth_client, tasks):
+        """Test that the task list route passes the search term through."""
+        response = auth_client.get('/tasks/?search=documents')
+        assert response.status_code == 200
+        assert 'Classer les documents'.encode() in response.data
+        assert 'Appeler le client'.encode() not in response.data
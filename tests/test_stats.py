@@ -0,0 +1,104 @@
+"""
+Unit tests for the materialized task statistics.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from taskmanager.models import Tache, TaskStats
+from taskmanager.stats import check_task_stats, recompute_overdue
+from taskmanager.utils import get_task_stats
+
+
+def stored_stats(db_session, user_id):
+    """Read the statistics row of a user, bypassing the identity map."""
+    db_session.session.expire_all()
+    return db_session.session.get(TaskStats, user_id).to_dict()
+
+
+class TestIncrementalStats:
+    """Tests for the statistics maintained on flush."""
+
+    @pytest.fixture
+    def tasks(self, db_session, test_user):
+        """Create tasks in every status, one of them overdue."""
+        yesterday = datetime.utcnow() - timedelta(days=1)
+        tasks = [
+            Tache(titre='A', status='pending', due_date=yesterday, personne_id=test_user.id),
+            Tache(titre='B', status='in_progress', personne_id=test_user.id),
+            Tache(titre='C', status='completed', due_date=yesterday, personne_id=test_user.id),
+        ]
+        db_session.session.add_all(tasks)
+        db_session.session.commit()
+        return tasks
+
+    def test_insert(self, db_session, test_user, tasks):
+        """Test that new tasks are counted."""
+        assert stored_stats(db_session, test_user.id) == {
+            'total': 3, 'pending': 1, 'in_progress': 1, 'completed': 1, 'overdue': 1
+        }
+
+    def test_status_change(self, db_session, test_user, tasks):
+        """Test that changing the status of an expired instance moves the counters."""
+        tasks[0].status = 'completed'
+        db_session.session.commit()
+        stats = stored_stats(db_session, test_user.id)
+        assert stats['pending'] == 0
+        assert stats['completed'] == 2
+        assert stats['overdue'] == 0
+
+    def test_due_date_change(self, db_session, test_user, tasks):
+        """Test that setting a past due date makes a task overdue."""
+        tasks[1].due_date = datetime.utcnow() - timedelta(days=3)
+        db_session.session.commit()
+        assert stored_stats(db_session, test_user.id)['overdue'] == 2
+
+    def test_soft_and_hard_delete(self, db_session, test_user, tasks):
+        """Test that deleted tasks are no longer counted."""
+        tasks[0].soft_delete()
+        db_session.session.delete(tasks[1])
+        db_session.session.commit()
+        assert stored_stats(db_session, test_user.id) == {
+            'total': 1, 'pending': 0, 'in_progress': 0, 'completed': 1, 'overdue': 0
+        }
+
+    def test_get_task_stats(self, db_session, test_user, tasks):
+        """Test that reading the statistics matches the tasks."""
+        assert get_task_stats(test_user.id)['total'] == 3
+
+    def test_missing_row_is_computed(self, db_session, test_user, tasks):
+        """Test that users without statistics get them computed, without any write."""
+        db_session.session.query(TaskStats).delete()
+        db_session.session.commit()
+        assert get_task_stats(test_user.id)['pending'] == 1
+        assert db_session.session.get(TaskStats, test_user.id) is None
+        assert not db_session.session.new and not db_session.session.dirty
+
+
+class TestConsistencyCheck:
+    """Tests for the consistency check and the overdue recomputation."""
+
+    def test_check_reports_and_repairs_drift(self, db_session, test_user, test_task):
+        """Test that drift is reported and repaired."""
+        stats = db_session.session.get(TaskStats, test_user.id)
+        stats.pending = 5
+        db_session.session.commit()
+
+        drift = check_task_stats(repair=True)
+        assert drift == {test_user.id: {'pending': (5, 1)}}
+        assert check_task_stats(repair=False) == {}
+
+    def test_recompute_overdue(self, db_session, test_user, test_task):
+        """Test that tasks becoming overdue are counted by the daily job."""
+        db_session.session.execute(
+            Tache.__table__.update().values(due_date=datetime.utcnow() - timedelta(days=2))
+        )
+        db_session.session.commit()
+        assert stored_stats(db_session, test_user.id)['overdue'] == 0
+
+        assert recompute_overdue() == 1
+        assert stored_stats(db_session, test_user.id)['overdue'] == 1
+
+    def test_cli(self, app, runner, db_session, test_user, test_task):
+        """Test the check-task-stats command."""
+        result = runner.invoke(args=['check-task-stats', '--dry-run'])
+        assert 'cohérentes' in result.output
@@ -117,4 +117,114 @@ class TestTaskRoutes:
         response = client.get(f'/tasks/editer/{test_task.id}', follow_redirects=True)
         
         assert response.status_code == 200
-        assert b'Connexion' in response.data  # Redirected to login page
\ No newline at end of file
+        assert b'Connexion' in response.data  # Redirected to login page
+
+class TestBulkTaskRoutes:
+    """Tests for the bulk task operations."""
+
+    @pytest.fixture
+    def other_task(self, db_session):
+        """Create a task owned by another user."""
+        from taskmanager.models import Personne
+        other = Personne(nom='otheruser', password='x')
+        db_session.session.add(other)
+        db_session.session.commit()
+        task = Tache(titre='Other Task', personne_id=other.id)
+        db_session.session.add(task)
+        db_session.session.commit()
+        return task
+
+    def test_bulk_status_reports_outcomes(self, auth_client, db_session, test_task, other_task):
+        """Test that only owned tasks are changed and every ID gets an outcome."""
+        response = auth_client.post('/tasks/bulk', json={
+            'ids': [test_task.id, other_task.id, 999],
+            'action': 'status',
+            'value': 'completed'
+        })
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['results'] == {
+            str(test_task.id): 'updated',
+            str(other_task.id): 'forbidden',
+            '999': 'not_found'
+        }
+        assert data['updated'] == 1
+
+        db_session.session.refresh(test_task)
+        db_session.session.refresh(other_task)
+        assert test_task.status == 'completed'
+        assert other_task.status == 'pending'
+
+    def test_bulk_delete_form(self, auth_client, db_session, test_task):
+        """Test soft-deleting the tasks selected in the task list."""
+        response = auth_client.post('/tasks/bulk', data={
+            'ids': [str(test_task.id)],
+            'action': 'delete'
+        }, follow_redirects=True)
+
+        assert response.status_code == 200
+        db_session.session.refresh(test_task)
+        assert test_task.is_deleted is True
+
+        from taskmanager.utils import get_task_stats
+        assert get_task_stats(test_task.personne_id)['total'] == 0
+
+    def test_bulk_categorize(self, auth_client, db_session, test_task):
+        """Test removing the category of many tasks."""
+        response = auth_client.post('/tasks/bulk', json={
+            'ids': [test_task.id], 'action': 'categorize', 'value': None
+        })
+
+        assert response.status_code == 200
+        db_session.session.refresh(test_task)
+        assert test_task.categorie_id is None
+
+    def test_bulk_invalid_action(self, auth_client, test_task):
+        """Test that an invalid action is rejected."""
+        response = auth_client.post('/tasks/bulk', json={
+            'ids': [test_task.id], 'action': 'status', 'value': 'archived'
+        })
+
+        assert response.status_code == 400
+        assert 'Statut invalide' in response.get_json()['error']
+
+class TestAdminLookups:
+    """Tests for the admin filter dropdowns and typeaheads."""
+
+    @pytest.fixture
+    def admin_client(self, auth_client, db_session, test_user):
+        """A test client logged in as an administrator."""
+        test_user.role = 'admin'
+        db_session.session.commit()
+        return auth_client
+
+    def test_small_tables_use_dropdowns(self, admin_client, test_task):
+        """Test that the filters list every user and category."""
+        response = admin_client.get('/tasks/admin/all')
+        assert response.status_code == 200
+        html = response.data.decode()
+        assert '>testuser</option>' in html
+        assert '>Test Category</option>' in html
+        assert 'data-lookup-url="' not in html
+
+    def test_large_tables_use_typeaheads(self, app, admin_client, test_task):
+        """Test that the filters switch to typeaheads above the option limit."""
+        app.config['ADMIN_LOOKUP_MAX_OPTIONS'] = 0
+        response = admin_client.get('/tasks/admin/all')
+        assert response.status_code == 200
+        html = response.data.decode()
+        assert 'data-lookup-url="/users/admin/lookup"' in html
+        assert 'data-lookup-url="/categories/admin/lookup"' in html
+
+    def test_lookup_endpoints(self, admin_client, test_category):
+        """Test the typeahead endpoints."""
+        response = admin_client.get('/users/admin/lookup?q=test')
+        assert [user['nom'] for user in response.get_json()] == ['testuser']
+        response = admin_client.get('/categories/admin/lookup?q=Nope')
+        assert response.get_json() == []
+
+    def test_lookup_requires_admin(self, auth_client):
+        """Test that regular users cannot search users."""
+        response = auth_client.get('/users/admin/lookup?q=t')
+        assert response.status_code == 302
@@ -0,0 +1,133 @@
+"""
+Unit tests for the current user cache.
+"""
+
+import pytest
+from flask import render_template, render_template_string, session
+from sqlalchemy import event
+from taskmanager import db
+from taskmanager.user_cache import current_user_proxy, get_current_user, get_user_cache_stats
+
+
+@pytest.fixture
+def queries(app):
+    """Record the SELECT statements sent to the database."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class TestGetCurrentUser:
+    """Tests for the get_current_user function."""
+
+    def test_anonymous(self, app):
+        """Test that no user is returned without a session."""
+        with app.test_request_context():
+            assert get_current_user() is None
+
+    def test_request_memo(self, app, test_user, queries):
+        """Test that the user is loaded once per request."""
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            first = get_current_user()
+            second = get_current_user()
+            assert first is second
+            assert first.nom == 'testuser'
+            assert len(queries) == 1
+            stats = get_user_cache_stats()
+            assert stats['misses'] == 1
+            assert stats['request_hits'] == 1
+
+    def test_process_cache(self, app, test_user, queries):
+        """Test that warm requests load the user without any query."""
+        app.config['USER_CACHE_ENABLED'] = True
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            get_current_user()
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            user = get_current_user()
+            assert user.nom == 'testuser'
+            assert user in db.session
+        assert len(queries) == 1
+        with app.app_context():
+            assert get_user_cache_stats()['process_hits'] == 1
+
+    def test_invalidation_on_update(self, app, test_user):
+        """Test that updating a user drops its cached copy."""
+        app.config['USER_CACHE_ENABLED'] = True
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            user = get_current_user()
+            user.bio = 'Nouvelle bio'
+            db.session.commit()
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            assert get_current_user().bio == 'Nouvelle bio'
+            assert get_user_cache_stats()['process_hits'] == 0
+
+    def test_invalidation_by_another_worker(self, app, test_user):
+        """Test that a write committed by another process makes the cached copy stale."""
+        app.config['USER_CACHE_ENABLED'] = True
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            get_current_user()
+        with app.app_context():
+            # What the commit of the user in another worker does to the shared cache
+            app.extensions['cache'].invalidate_tags(f'personne:user:{test_user.id}')
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            get_current_user()
+            assert get_user_cache_stats()['process_hits'] == 0
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            get_current_user()
+            assert get_user_cache_stats()['process_hits'] == 1
+
+
+class TestCurrentUserProxy:
+    """Tests for the lazy current_user template proxy."""
+
+    def test_render_without_user_access(self, app, test_user, queries):
+        """Test that a template not reading current_user issues no query."""
+        user_id = test_user.id
+        queries.clear()
+        with app.test_request_context():
+            session['personne_id'] = user_id
+            assert render_template_string('{{ 1 + 1 }}') == '2'
+        assert len(queries) == 0
+
+    def test_anonymous_render(self, app, queries):
+        """Test that anonymous pages render without any query."""
+        with app.test_request_context():
+            html = render_template('errors/404.html')
+            assert 'Connexion' in html
+        assert len(queries) == 0
+
+    def test_lookup_shared_with_request_memo(self, app, test_user, queries):
+        """Test that the proxy reuses the user already loaded by the view."""
+        with app.test_request_context():
+            session['personne_id'] = test_user.id
+            get_current_user()
+            loaded = len(queries)
+            html = render_template_string(
+                '{{ current_user.is_authenticated }} {{ current_user.nom }}'
+            )
+            assert html == 'True testuser'
+            assert len(queries) == loaded
+            assert get_user_cache_stats()['misses'] == 1
+
+    def test_deleted_user(self, app, queries):
+        """Test that a session pointing to a missing user is not authenticated."""
+        with app.test_request_context():
+            session['personne_id'] = 9999
+            assert current_user_proxy.is_authenticated is False
+            assert current_user_proxy.nom is None
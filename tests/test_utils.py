@@ -9,11 +9,22 @@ from taskmanager.utils import (
     verify_task_ownership, 
     log_and_flash, 
     populate_task_from_form, 
-    save_task
+    save_task,
+    get_tasks_optimized,
+    get_admin_tasks_optimized,
+    get_page_cursors,
+    delete_category,
+    delete_user,
+    bulk_update_tasks,
+    get_user_names,
+    get_lookup_choices,
+    search_lookup
 )
-from taskmanager.exceptions import ResourceNotFoundError, AuthorizationError
-from taskmanager.models import Tache
-from datetime import datetime
+from taskmanager.exceptions import ResourceNotFoundError, AuthorizationError, ValidationError
+from taskmanager.models import Tache, Categorie, Personne, TaskStats
+from taskmanager.rows import TaskRow
+from sqlalchemy import inspect
+from datetime import datetime, timedelta
 
 class TestGetTaskById:
     """Tests for the get_task_by_id function."""
@@ -121,4 +132,276 @@ class TestSaveTask:
         
         # Verify the task was updated in the database
         db_session.session.refresh(test_task)
-        assert test_task.titre == 'Updated Task'
\ No newline at end of file
+        assert test_task.titre == 'Updated Task'
+
+
+class TestKeysetPagination:
+    """Tests for the cursor-based pagination of the task listings."""
+
+    @pytest.fixture
+    def many_tasks(self, db_session, test_user):
+        """Create tasks with duplicate sort values and NULL due dates."""
+        now = datetime.utcnow()
+        for i in range(23):
+            db_session.session.add(Tache(
+                titre=f'Task {i % 5}',
+                status=['pending', 'in_progress', 'completed'][i % 3],
+                priority=['low', 'medium', 'high'][i % 3],
+                due_date=None if i % 4 == 0 else now + timedelta(days=i % 6),
+                created_at=now - timedelta(hours=i % 7),
+                personne_id=test_user.id
+            ))
+        db_session.session.commit()
+        return test_user
+
+    @pytest.mark.parametrize('sort_by', ['due_date', 'created_at', 'priority', 'status', 'titre'])
+    @pytest.mark.parametrize('sort_dir', ['asc', 'desc'])
+    def test_cursor_pages_match_offset_pages(self, many_tasks, sort_by, sort_dir):
+        """Test that walking pages with cursors yields the same rows as offsets."""
+        user_id = many_tasks.id
+        offset_ids = []
+        for page in range(1, 6):
+            tasks, _, _ = get_tasks_optimized(user_id, page=page, per_page=5,
+                                              sort_by=sort_by, sort_dir=sort_dir)
+            offset_ids.extend(t.id for t in tasks)
+
+        cursor_ids = []
+        cursor = None
+        pages = []
+        while True:
+            tasks, total_count, _ = get_tasks_optimized(user_id, per_page=5, sort_by=sort_by,
+                                                        sort_dir=sort_dir, cursor=cursor)
+            if not tasks:
+                break
+            pages.append([t.id for t in tasks])
+            cursor_ids.extend(t.id for t in tasks)
+            _, cursor = get_page_cursors(tasks, sort_by, sort_dir)
+
+        assert total_count == 23
+        assert cursor_ids == offset_ids
+
+        # Walking backward from the last page returns the previous page
+        last_page_tasks = Tache.query.filter(Tache.id.in_(pages[-1])).all()
+        last_page_tasks.sort(key=lambda t: pages[-1].index(t.id))
+        prev_cursor, _ = get_page_cursors(last_page_tasks, sort_by, sort_dir)
+        tasks, _, _ = get_tasks_optimized(user_id, per_page=5, sort_by=sort_by,
+                                          sort_dir=sort_dir, cursor=prev_cursor)
+        assert [t.id for t in tasks] == pages[-2]
+
+    def test_admin_cursor_by_user(self, many_tasks):
+        """Test cursor pagination of the admin listing sorted by user name."""
+        first, _, _ = get_admin_tasks_optimized(per_page=10, sort_by='user')
+        _, cursor = get_page_cursors(first, 'user', 'asc', admin=True)
+        second, _, _ = get_admin_tasks_optimized(per_page=10, sort_by='user', cursor=cursor)
+        offset_second, _, _ = get_admin_tasks_optimized(page=2, per_page=10, sort_by='user')
+        assert [t.id for t in second] == [t.id for t in offset_second]
+
+    def test_cursor_for_other_sort_is_rejected(self, many_tasks):
+        """Test that a cursor cannot be reused with another sort order."""
+        tasks, _, _ = get_tasks_optimized(many_tasks.id, per_page=5, sort_by='titre')
+        _, cursor = get_page_cursors(tasks, 'titre', 'asc')
+        with pytest.raises(ValidationError):
+            get_tasks_optimized(many_tasks.id, per_page=5, sort_by='priority', cursor=cursor)
+
+    def test_malformed_cursor_is_rejected(self, many_tasks):
+        """Test that a malformed cursor raises a ValidationError."""
+        with pytest.raises(ValidationError):
+            get_tasks_optimized(many_tasks.id, cursor='not-a-cursor')
+
+
+class TestCountStrategies:
+    """Tests for the count strategies of the task listings."""
+
+    def test_exact_count(self, db_session, test_task):
+        """Test that the exact strategy counts matching tasks."""
+        tasks, total_count, total_pages = get_tasks_optimized(
+            test_task.personne_id, count_strategy='exact')
+        assert len(tasks) == 1
+        assert total_count == 1
+        assert total_pages == 1
+
+    def test_cached_count_is_invalidated_on_write(self, db_session, test_task):
+        """Test that cached counts are reused until a task of the user is written."""
+        user_id = test_task.personne_id
+        _, total_count, _ = get_tasks_optimized(user_id, count_strategy='cached')
+        assert total_count == 1
+
+        # An uncommitted write leaves the cached count in place
+        db_session.session.execute(Tache.__table__.insert().values(
+            titre='Raw Task', status='pending', priority='low', personne_id=user_id,
+            is_deleted=False))
+        _, total_count, _ = get_tasks_optimized(user_id, count_strategy='cached')
+        assert total_count == 1
+
+        # Committing tasks invalidates the cached count
+        db_session.session.add(Tache(titre='ORM Task', personne_id=user_id))
+        db_session.session.commit()
+        _, total_count, _ = get_tasks_optimized(user_id, count_strategy='cached')
+        assert total_count == 3
+
+    def test_cached_count_is_shared(self, app, db_session, test_task):
+        """Test that cached counts live in the shared cache, invalidated by bulk updates."""
+        user_id = test_task.personne_id
+        get_tasks_optimized(user_id, count_strategy='cached')
+        hits = app.extensions['cache'].get_stats()['hits']
+        get_tasks_optimized(user_id, count_strategy='cached')
+        assert app.extensions['cache'].get_stats()['hits'] == hits + 1
+
+        bulk_update_tasks([test_task.id], 'delete', user_id=user_id)
+        _, total_count, _ = get_tasks_optimized(user_id, count_strategy='cached')
+        assert total_count == 0
+
+    def test_approximate_count_falls_back_on_sqlite(self, db_session, test_task):
+        """Test that the approximate strategy still counts on SQLite."""
+        _, total_count, _ = get_admin_tasks_optimized(count_strategy='approximate')
+        assert total_count == 1
+
+    def test_probe_detects_next_page(self, db_session, test_user):
+        """Test that the probe strategy skips the count but detects a next page."""
+        for i in range(6):
+            db_session.session.add(Tache(titre=f'Task {i}', personne_id=test_user.id))
+        db_session.session.commit()
+
+        tasks, total_count, total_pages = get_tasks_optimized(
+            test_user.id, page=1, per_page=5, count_strategy='probe')
+        assert len(tasks) == 5
+        assert total_count is None
+        assert total_pages == 2
+
+        tasks, total_count, total_pages = get_tasks_optimized(
+            test_user.id, page=2, per_page=5, count_strategy='probe')
+        assert len(tasks) == 1
+        assert total_pages == 2
+
+    def test_unknown_strategy(self, db_session, test_user):
+        """Test that an unknown count strategy raises a ValueError."""
+        with pytest.raises(ValueError):
+            get_tasks_optimized(test_user.id, count_strategy='guess')
+
+
+class TestSetBasedDeletion:
+    """Tests for the set-based category and user deletion."""
+
+    def test_delete_category_detaches_tasks(self, db_session, test_category, test_task):
+        """Test that tasks of a deleted category are kept without a category."""
+        task_id, category_id = test_task.id, test_category.id
+        db_session.session.expunge_all()
+
+        assert delete_category(Categorie.query.get(category_id)) == 1
+        assert Categorie.query.count() == 0
+        assert db_session.session.get(Tache, task_id).categorie_id is None
+
+    def test_delete_user(self, db_session, test_user, test_category, test_task):
+        """Test that a user's tasks, categories and statistics are deleted."""
+        other = Personne(nom='otheruser', password='x')
+        db_session.session.add(other)
+        db_session.session.commit()
+        # A task of another user filed in one of the deleted user's categories
+        foreign_task = Tache(titre='Foreign', personne_id=other.id, categorie_id=test_category.id)
+        db_session.session.add(foreign_task)
+        db_session.session.commit()
+        foreign_id = foreign_task.id
+
+        assert delete_user(test_user) == 1
+        db_session.session.expire_all()
+        assert Tache.query.count() == 1
+        assert db_session.session.get(Tache, foreign_id).categorie_id is None
+        assert Categorie.query.count() == 0
+        assert TaskStats.query.filter_by(personne_id=other.id).count() == 1
+        assert TaskStats.query.count() == 1
+
+
+class TestAdminLookups:
+    """Tests for the (id, nom) lookups of the admin filters."""
+
+    def test_user_names(self, db_session, test_user):
+        """Test resolving the names of some users."""
+        assert get_user_names([test_user.id, None, 999]) == {test_user.id: 'testuser'}
+        assert get_user_names([]) == {}
+
+    def test_choices_are_cached_until_a_commit(self, app, db_session, test_user):
+        """Test that the options are cached and refreshed when a user is added."""
+        with app.test_request_context():
+            assert get_lookup_choices('personne') == [(test_user.id, 'testuser')]
+            db_session.session.add(Personne(nom='alice', password='x'))
+            db_session.session.commit()
+            assert [nom for _, nom in get_lookup_choices('personne')] == ['alice', 'testuser']
+
+    def test_too_many_choices(self, app, db_session, test_user):
+        """Test that large tables get no options."""
+        app.config['ADMIN_LOOKUP_MAX_OPTIONS'] = 0
+        with app.test_request_context():
+            assert get_lookup_choices('personne') is None
+
+    def test_search_is_a_prefix_match(self, db_session, test_user):
+        """Test that the typeahead matches name prefixes, LIKE wildcards included literally."""
+        db_session.session.add(Personne(nom='test_2', password='x'))
+        db_session.session.commit()
+        assert [nom for _, nom in search_lookup('personne', 'test')] == ['test_2', 'testuser']
+        assert [nom for _, nom in search_lookup('personne', 'test_')] == ['test_2']
+        assert search_lookup('personne', 'user') == []
+
+
+class TestListLoadMode:
+    """Tests for the column projection of the listing queries."""
+
+    def test_list_mode_defers_large_columns(self, db_session, test_user, test_task):
+        """Test that the list mode loads neither the description nor unused category columns."""
+        user_id = test_user.id
+        db_session.session.expunge_all()
+        taches, _, _ = get_tasks_optimized(user_id=user_id, load='list')
+
+        state = inspect(taches[0])
+        assert 'description' in state.unloaded
+        assert 'description' in inspect(taches[0].categorie).unloaded
+        assert taches[0].categorie.nom == 'Test Category'
+        # Deferred columns are still loaded when accessed
+        assert taches[0].description == 'A test task'
+
+    def test_admin_list_mode(self, db_session, test_task):
+        """Test the list mode of the admin listing, sorted by user."""
+        db_session.session.expunge_all()
+        taches, _, _ = get_admin_tasks_optimized(sort_by='user', load='list')
+        assert 'description' in inspect(taches[0]).unloaded
+
+    def test_full_mode_is_the_default(self, db_session, test_user, test_task):
+        """Test that whole rows are loaded by default, for the API serialization."""
+        user_id = test_user.id
+        db_session.session.expunge_all()
+        taches, _, _ = get_tasks_optimized(user_id=user_id)
+        assert not inspect(taches[0]).unloaded - {'personne', 'categorie'}
+
+    def test_unknown_mode(self, db_session, test_user):
+        """Test that an unknown load mode is rejected."""
+        with pytest.raises(ValueError):
+            get_tasks_optimized(user_id=test_user.id, load='everything')
+
+    def test_user_bio_is_deferred(self, db_session, test_user):
+        """Test that loading a user does not load the bio."""
+        user_id = test_user.id
+        db_session.session.expunge_all()
+        assert 'bio' in inspect(db_session.session.get(Personne, user_id)).unloaded
+
+    def test_rows_mode(self, db_session, test_user, test_task):
+        """Test that the rows mode returns immutable rows outside the session."""
+        user_id = test_user.id
+        db_session.session.expunge_all()
+        taches, total_count, _ = get_tasks_optimized(user_id=user_id, load='rows')
+
+        assert total_count == 1
+        row = taches[0]
+        assert isinstance(row, TaskRow)
+        assert row.titre == 'Test Task'
+        assert row.categorie.nom == 'Test Category'
+        assert not hasattr(row, 'description')
+        assert not db_session.session.identity_map
+        with pytest.raises(AttributeError):
+            row.titre = 'Autre'
+
+    def test_admin_rows_mode_cursors(self, db_session, test_user, test_task):
+        """Test that the cursors of rows sorted by user match those of entities."""
+        rows, _, _ = get_admin_tasks_optimized(sort_by='user', load='rows')
+        taches, _, _ = get_admin_tasks_optimized(sort_by='user')
+        assert rows[0].personne.nom == 'testuser'
+        assert get_page_cursors(rows, 'user', admin=True) == \
+            get_page_cursors(taches, 'user', admin=True)